@@ -0,0 +1,82 @@
+"""
+Compares the pydantic chunk insertion (DataChunk + bulk_write in 100 documents batches)
+with the fast path (DataChunk.build_records + concurrent unordered insert_many).
+Writes to a throwaway collection of the configured MONGODB_DATABASE and drops it at the end.
+
+run from src/:
+    python -m benchmarks.chunk_insert_benchmark --chunks 200000
+"""
+import argparse
+import asyncio
+import time
+from bson.objectid import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from helper.config import get_settings
+from models.ChunkModel import ChunkModel
+from models.db_schemes import DataChunk
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=100000)
+    parser.add_argument("--text-size", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    mongo_conn = AsyncIOMotorClient(settings.MONGODB_URL)
+    db_client = mongo_conn[settings.MONGODB_DATABASE]
+
+    chunk_model = ChunkModel(db_client=db_client)
+    chunk_model.collection = db_client["benchmark_chunks"]
+
+    project_id, asset_id = ObjectId(), ObjectId()
+    texts = [("x" * (args.text_size - 8)) + f"{i:08d}" for i in range(args.chunks)]
+    metadatas = [{"source": "benchmark", "page": i // 10} for i in range(args.chunks)]
+
+    try:
+        # pydantic path
+        started_at = time.perf_counter()
+        chunks = [
+            DataChunk(
+                chunk_text=text,
+                chunk_metadata=metadata,
+                chunk_order=idx + 1,
+                chunk_project_id=project_id,
+                chunk_asset_id=asset_id,
+            )
+            for idx, (text, metadata) in enumerate(zip(texts, metadatas))
+        ]
+        build_seconds = time.perf_counter() - started_at
+        await chunk_model.insert_many_chunks(chunks=chunks)
+        total_seconds = time.perf_counter() - started_at
+        print(f"pydantic   build {build_seconds:8.2f}s  total {total_seconds:8.2f}s  "
+              f"{args.chunks / total_seconds:12.0f} docs/s")
+
+        await chunk_model.collection.delete_many({})
+
+        # fast path
+        started_at = time.perf_counter()
+        records = DataChunk.build_records(
+            texts=texts,
+            metadatas=metadatas,
+            project_id=project_id,
+            asset_id=asset_id,
+        )
+        build_seconds = time.perf_counter() - started_at
+        insert_stats = await chunk_model.insert_many_chunk_records(
+            records=records,
+            batch_size=args.batch_size,
+            max_in_flight=args.max_in_flight,
+        )
+        total_seconds = time.perf_counter() - started_at
+        print(f"fast path  build {build_seconds:8.2f}s  total {total_seconds:8.2f}s  "
+              f"{args.chunks / total_seconds:12.0f} docs/s  (insert only {insert_stats['docs_per_second']} docs/s)")
+    finally:
+        await db_client.drop_collection("benchmark_chunks")
+        mongo_conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
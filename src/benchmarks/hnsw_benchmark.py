@@ -0,0 +1,124 @@
+"""
+Build time, memory, QPS and recall@k of the in-process HNSW backend against the Qdrant local
+mode (and the exact NumPy backend as the reference point), on the synthetic corpus of the
+quantization benchmark. Every backend runs in its own process, the memory column is the
+growth of that process' RSS while building and searching.
+
+run from src/ (needs hnswlib):
+    python -m benchmarks.hnsw_benchmark --vectors 200000 --dim 384 --ef-search 64
+"""
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from benchmarks.quantization_benchmark import make_corpus, exact_top_k
+from stores.vectordb.VectorDBEnums import DistanceMethodEnums, VectorDBEnums
+
+
+def get_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0
+
+
+def create_provider(backend: str, args):
+    db_path = tempfile.mkdtemp(prefix="hnsw_benchmark_")
+    distance_method = DistanceMethodEnums.COSINE.value
+
+    if backend == VectorDBEnums.QDRANT.value:
+        from stores.vectordb.providers import QdrantDBProvider
+        return QdrantDBProvider(db_path=db_path, distance_method=distance_method)
+
+    if backend == VectorDBEnums.NUMPY.value:
+        from stores.vectordb.providers import NumpyDBProvider
+        return NumpyDBProvider(db_path=db_path, distance_method=distance_method)
+
+    from stores.vectordb.providers.HnswDBProvider import HnswDBProvider
+    return HnswDBProvider(
+        db_path=db_path,
+        distance_method=distance_method,
+        m=args.m,
+        ef_construction=args.ef_construction,
+        ef_search=args.ef_search,
+        save_every=args.vectors,
+    )
+
+
+def run_backend(backend: str, args):
+    corpus, query_vectors = make_corpus(args.vectors, args.dim, args.queries, args.clusters, args.seed)
+    expected = exact_top_k(corpus, query_vectors, args.k)
+
+    rss_before = get_rss_mb()
+    provider = create_provider(backend, args)
+    provider.connect()
+
+    collection_name = "hnsw_benchmark"
+    started_at = time.perf_counter()
+    provider.create_collection(collection_name=collection_name, embedding_size=args.dim, do_reset=True)
+    for i in range(0, args.vectors, args.batch_size):
+        provider.insert_many(
+            collection_name=collection_name,
+            texts=None,
+            vectors=corpus[i: i + args.batch_size],
+            record_ids=list(range(i, min(i + args.batch_size, args.vectors))),
+        )
+    build_seconds = time.perf_counter() - started_at
+
+    recalls = []
+    started_at = time.perf_counter()
+    for query_vector, expected_ids in zip(query_vectors, expected):
+        results = provider.search_by_vector(
+            collection_name=collection_name,
+            vector=query_vector.tolist(),
+            limit=args.k,
+        ) or []
+        recalls.append(len({int(result.id) for result in results} & expected_ids) / args.k)
+    search_seconds = time.perf_counter() - started_at
+    rss_after = get_rss_mb()
+
+    provider.delete_collection(collection_name=collection_name)
+
+    return {
+        "backend": backend,
+        "build_seconds": build_seconds,
+        "memory_mb": rss_after - rss_before,
+        "qps": args.queries / search_seconds,
+        "recall": statistics.mean(recalls),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=200)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument("--backends", nargs="+", default=[
+        VectorDBEnums.QDRANT.value, VectorDBEnums.NUMPY.value, VectorDBEnums.HNSW.value,
+    ])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"vectors={args.vectors} dim={args.dim} queries={args.queries} k={args.k} "
+          f"M={args.m} ef_construction={args.ef_construction} ef_search={args.ef_search}")
+    print(f"{'backend':<8} {'build s':>9} {'memory MB':>10} {'QPS':>10} {'recall@k':>9}")
+
+    # a fresh process per backend, so the memory of one doesn't count for the next
+    context = multiprocessing.get_context("spawn")
+    for backend in args.backends:
+        with context.Pool(processes=1) as pool:
+            result = pool.apply(run_backend, (backend, args))
+        print(f"{result['backend']:<8} {result['build_seconds']:>9.2f} {result['memory_mb']:>10.1f} "
+              f"{result['qps']:>10.1f} {result['recall']:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Recall@k and search latency of a Qdrant collection without quantization, with scalar (int8)
+and with binary quantization, on a synthetic corpus (clustered gaussian vectors, the queries
+are noisy copies of corpus vectors). The exact top-k computed with numpy is the ground truth.
+
+The local mode (VECTOR_DB_PATH) accepts the quantization settings but always searches the
+original vectors, point --url at a qdrant server to see the real trade-off.
+
+run from src/:
+    python -m benchmarks.quantization_benchmark --vectors 100000 --dim 384
+    python -m benchmarks.quantization_benchmark --url http://localhost:6333 --oversampling 2
+"""
+import argparse
+import statistics
+import tempfile
+import time
+import numpy as np
+from qdrant_client import QdrantClient
+from stores.vectordb.providers import QdrantDBProvider
+from stores.vectordb.VectorDBEnums import DistanceMethodEnums, QuantizationEnums
+
+
+def make_corpus(vectors: int, dim: int, queries: int, clusters: int, seed: int):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    corpus = centers[rng.integers(0, clusters, size=vectors)] + rng.normal(scale=0.6, size=(vectors, dim)).astype(np.float32)
+    corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+
+    query_vectors = corpus[rng.integers(0, vectors, size=queries)] + rng.normal(scale=0.3, size=(queries, dim)).astype(np.float32)
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+
+    return corpus, query_vectors
+
+
+def exact_top_k(corpus: np.ndarray, query_vectors: np.ndarray, k: int):
+    scores = query_vectors @ corpus.T
+    top_k = np.argpartition(-scores, k, axis=1)[:, :k]
+    return [set(row.tolist()) for row in top_k]
+
+
+def run_searches(provider, collection_name: str, query_vectors: np.ndarray, k: int,
+                 oversampling: float, rescore: bool):
+    timings = []
+    found = []
+    for query_vector in query_vectors:
+        started_at = time.perf_counter()
+        results = provider.search_by_vector(
+            collection_name=collection_name,
+            vector=query_vector.tolist(),
+            limit=k,
+            oversampling=oversampling,
+            rescore=rescore,
+        ) or []
+        timings.append(time.perf_counter() - started_at)
+        found.append({int(result.id) for result in results})
+    return timings, found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    parser.add_argument("--on-disk", action="store_true")
+    parser.add_argument("--hnsw-m", type=int, default=None)
+    parser.add_argument("--hnsw-ef-construct", type=int, default=None)
+    parser.add_argument("--url", default=None, help="qdrant server, the local mode is used when missing")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus, query_vectors = make_corpus(args.vectors, args.dim, args.queries, args.clusters, args.seed)
+    expected = exact_top_k(corpus, query_vectors, args.k)
+
+    print(f"vectors={args.vectors} dim={args.dim} queries={args.queries} k={args.k} "
+          f"backend={args.url or 'local'}")
+    print(f"{'quantization':<13} {'search':<26} {'build s':>8} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8}")
+
+    for quantization in [e.value for e in QuantizationEnums]:
+        provider = QdrantDBProvider(
+            db_path=tempfile.mkdtemp(prefix="quantization_benchmark_"),
+            distance_method=DistanceMethodEnums.COSINE.value,
+            collection_config={
+                "quantization": quantization,
+                "on_disk": args.on_disk,
+                "hnsw_m": args.hnsw_m,
+                "hnsw_ef_construct": args.hnsw_ef_construct,
+            },
+        )
+        if args.url:
+            provider.client = QdrantClient(url=args.url)
+        else:
+            provider.connect()
+
+        collection_name = f"quantization_benchmark_{quantization}"
+        try:
+            started_at = time.perf_counter()
+            provider.create_collection(collection_name=collection_name, embedding_size=args.dim, do_reset=True)
+            provider.insert_many(
+                collection_name=collection_name,
+                texts=None,
+                vectors=corpus.tolist(),
+                record_ids=list(range(args.vectors)),
+                batch_size=1000,
+            )
+            build_seconds = time.perf_counter() - started_at
+
+            search_modes = [("plain", None, False)]
+            if quantization != QuantizationEnums.NONE.value:
+                search_modes = [
+                    ("no rescore", None, False),
+                    ("rescore", None, True),
+                    (f"rescore x{args.oversampling:g} oversampling", args.oversampling, True),
+                ]
+
+            for label, oversampling, rescore in search_modes:
+                timings, found = run_searches(provider, collection_name, query_vectors, args.k,
+                                              oversampling=oversampling, rescore=rescore)
+                recall = statistics.mean(
+                    len(found_ids & expected_ids) / args.k
+                    for found_ids, expected_ids in zip(found, expected)
+                )
+                timings.sort()
+                print(f"{quantization:<13} {label:<26} {build_seconds:>8.2f} {recall:>9.4f} "
+                      f"{statistics.median(timings) * 1000:>8.2f} {timings[int(len(timings) * 0.95)] * 1000:>8.2f}")
+        finally:
+            provider.delete_collection(collection_name=collection_name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Micro benchmark of the native TextSplitter against langchain's RecursiveCharacterTextSplitter.
+
+run from src/:
+    python -m benchmarks.text_splitter_benchmark --data-dir ../data --repeat 20
+"""
+import argparse
+import os
+import statistics
+import time
+from helper.text_splitter import get_text_splitter
+from models.enums.ProcessingEnum import TextSplitterEnum
+
+
+def load_texts(data_dir: str, scale: int):
+    texts = {}
+    for file_name in sorted(os.listdir(data_dir)):
+        if not file_name.endswith(".txt"):
+            continue
+        with open(os.path.join(data_dir, file_name), "r", encoding="utf-8") as f:
+            # the corpus files are small, repeat them to see how the splitters scale
+            texts[file_name] = f.read() * scale
+    return texts
+
+
+def time_splitter(splitter, text: str, repeat: int):
+    timings = []
+    chunks = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        chunks = splitter.split_text(text)
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings), chunks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data-dir", default=os.path.join("..", "data"))
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--overlap-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=1, help="how many times each file is repeated")
+    args = parser.parse_args()
+
+    texts = load_texts(args.data_dir, args.scale)
+    if not texts:
+        print(f"no .txt files in {args.data_dir}")
+        return
+
+    print(f"chunk_size={args.chunk_size} overlap_size={args.overlap_size} repeat={args.repeat} scale={args.scale}")
+    print(f"{'file':<40} {'splitter':<10} {'chars':>9} {'chunks':>7} {'avg_len':>8} {'ms':>9} {'MB/s':>8}")
+
+    for file_name, text in texts.items():
+        results = {}
+        for splitter_name in [e.value for e in TextSplitterEnum]:
+            get_text_splitter.cache_clear()
+            splitter = get_text_splitter(splitter_name, args.chunk_size, args.overlap_size)
+            seconds, chunks = time_splitter(splitter, text, args.repeat)
+            results[splitter_name] = seconds
+
+            avg_len = sum(len(c) for c in chunks) / len(chunks) if chunks else 0
+            mb_per_second = len(text.encode("utf-8")) / seconds / 1e6 if seconds else 0
+            print(f"{file_name[:40]:<40} {splitter_name:<10} {len(text):>9} {len(chunks):>7} "
+                  f"{avg_len:>8.1f} {seconds * 1000:>9.2f} {mb_per_second:>8.2f}")
+
+        native_seconds = results[TextSplitterEnum.NATIVE.value]
+        if native_seconds:
+            print(f"{'':<40} speedup x{results[TextSplitterEnum.LANGCHAIN.value] / native_seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
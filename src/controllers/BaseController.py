@@ -1,4 +1,5 @@
 from helper.config import get_settings, Settings
+from helper.metadata_normalizer import MetadataNormalizer
 import os
 import random
 import string
@@ -17,6 +18,12 @@ class BaseController:
             "assets/database"
             )
         
+    def get_metadata_normalizer(self):
+        """None when the chunk metadata is kept as the loaders produce it"""
+        if not self.app_settings.CHUNK_METADATA_NORMALIZE:
+            return None
+        return MetadataNormalizer(allowed_keys=self.app_settings.CHUNK_METADATA_ALLOWED_KEYS)
+        
     def generate_random_string(self, length: int=12):
         return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
     
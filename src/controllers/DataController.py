@@ -2,8 +2,14 @@ from .BaseController import BaseController
 from fastapi import UploadFile
 from models import ResponseSignal
 from .ProjectController import ProjectController
+from datetime import datetime, timedelta
 import re
 import os
+import hashlib
+import logging
+
+logger = logging.getLogger('uvicorn.error')
+
 class DataController(BaseController):
     
     def __init__(self):
@@ -19,6 +25,31 @@ class DataController(BaseController):
             return False, ResponseSignal.FILE_SIZE_EXCEEDED.value
 
         return True, ResponseSignal.FILE_VALIDATED_SUCESS.value
+
+    def validate_upload_session(self, content_type: str, total_size: int):
+        """same checks as validate_uploaded_file, before any byte of a resumable upload is received"""
+
+        if content_type not in self.app_settings.FILE_ALLOWED_TYPES:
+            return False, ResponseSignal.FILE_TYPE_NOT_SUPPORTED.value
+
+        if total_size < 0 or total_size > self.app_settings.FILE_MAX_SIZE * self.size_scale:
+            return False, ResponseSignal.FILE_SIZE_EXCEEDED.value
+
+        return True, ResponseSignal.FILE_VALIDATED_SUCESS.value
+
+    def parse_content_range(self, content_range: str, total_size: int):
+        """'bytes start-end/total' -> (start, end) with end exclusive, None if it's not valid"""
+        match = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+|\*)", (content_range or "").strip())
+        if not match:
+            return None
+
+        start, end = int(match.group(1)), int(match.group(2)) + 1
+        if start >= end or end > total_size:
+            return None
+        if match.group(3) != "*" and int(match.group(3)) != total_size:
+            return None
+
+        return start, end
     
     def generate_unique_filepath(self, orig_file_name: str, project_id: str):
         
@@ -42,6 +73,39 @@ class DataController(BaseController):
         return new_file_path, random_key + "_" + cleaned_file_name
     
     
+    async def remove_expired_upload_sessions(self, upload_session_model, project_model):
+        """delete the abandoned upload sessions with their preallocated files"""
+        _ = await upload_session_model.release_stale_sessions(
+            updated_before=datetime.utcnow() - timedelta(seconds=self.app_settings.UPLOAD_SESSION_FINALIZE_TIMEOUT)
+        )
+        
+        expired_sessions = await upload_session_model.delete_expired_sessions(
+            updated_before=datetime.utcnow() - timedelta(seconds=self.app_settings.UPLOAD_SESSION_EXPIRE_SECONDS)
+        )
+        
+        for upload_session in expired_sessions:
+            project = await project_model.get_project_by_id(project_id=upload_session.upload_project_id)
+            if project is None:
+                # the project directory was removed with the project
+                continue
+            
+            file_path = os.path.join(self.file_dir, project.project_id, upload_session.upload_file_name)
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Error while removing the expired upload {file_path}: {e}")
+        
+        return len(expired_sessions)
+    
+    def get_file_hash(self, file_path: str):
+        content_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                content_hash.update(chunk)
+        return content_hash.hexdigest()
+    
     def get_clean_file_name(self, orig_file_name: str):
         
         # remove any special characters, except underscore and .
@@ -0,0 +1,416 @@
+from .BaseController import BaseController
+from .ProcessController import ProcessController
+from .NLPController import NLPController
+from models.JobModel import JobModel
+from models.ChunkModel import ChunkModel
+from models.db_schemes import Job, DataChunk
+from models.enums.JobEnums import JobStatusEnum, JobTypeEnum
+from models.enums.AssetTypeEnum import AssetTypeEnum
+from bson.objectid import ObjectId
+from datetime import datetime
+from collections import deque
+import asyncio
+import logging
+import time
+import uuid
+
+logger = logging.getLogger('uvicorn.error')
+
+class JobCancelledError(Exception):
+    pass
+
+class JobController(BaseController):
+    """
+    Runs the long ingestion and indexing work in background tasks of the API process.
+    Jobs are persisted in the jobs collection with their progress, so a restarted
+    worker can resume them from the last completed step.
+    """
+
+    def __init__(self, app):
+        super().__init__()
+
+        self.app = app
+        self.worker_id = uuid.uuid4().hex
+        self.tasks = {}
+        self.semaphore = asyncio.Semaphore(self.app_settings.JOBS_MAX_CONCURRENT)
+        self.shutting_down = False
+
+    async def enqueue(self, job_type: str, project_id: ObjectId, params: dict):
+        job_model = self.app.job_model
+
+        now = datetime.utcnow()
+        job = await job_model.create_job(job=Job(
+            job_type=job_type,
+            job_project_id=project_id,
+            job_params=params,
+            job_status=JobStatusEnum.QUEUED.value,
+            job_progress={},
+            job_created_at=now,
+            job_updated_at=now,
+        ))
+
+        self.start(job_id=job.id)
+        return job
+
+    def start(self, job_id: ObjectId):
+        self.tasks[job_id] = asyncio.create_task(self._run(job_id=job_id))
+
+    async def resume_unfinished_jobs(self):
+        """pick up the jobs queued or left running by a worker that stopped"""
+        job_model = self.app.job_model
+        jobs = await job_model.get_resumable_jobs(
+            stale_after_seconds=self.app_settings.JOBS_STALE_AFTER_SECONDS
+        )
+        for job in jobs:
+            if job.id not in self.tasks:
+                logger.info(f"Resuming job {job.id} ({job.job_type})")
+                self.start(job_id=job.id)
+
+        return len(jobs)
+
+    async def cancel(self, job_id: ObjectId):
+        job_model = self.app.job_model
+        job = await job_model.request_cancel(job_id=job_id)
+        if job is None:
+            return None
+
+        # the job runs in this worker, stop it right away
+        task = self.tasks.get(job_id)
+        if task and not task.done():
+            task.cancel()
+        elif job.job_status == JobStatusEnum.QUEUED.value:
+            await job_model.update_job(
+                job_id=job_id,
+                job_status=JobStatusEnum.CANCELLED.value,
+                job_finished_at=datetime.utcnow(),
+            )
+
+        return job
+
+    async def shutdown(self):
+        """stop the running tasks, their jobs stay resumable for the next startup"""
+        self.shutting_down = True
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+    async def _heartbeat(self, job_model: JobModel, job_id: ObjectId):
+        while True:
+            await asyncio.sleep(self.app_settings.JOBS_STALE_AFTER_SECONDS / 4)
+            await job_model.update_job(job_id=job_id)
+
+    async def _run(self, job_id: ObjectId):
+        job_model = self.app.job_model
+        heartbeat = None
+
+        try:
+            async with self.semaphore:
+                job = await job_model.claim_job(
+                    job_id=job_id,
+                    worker_id=self.worker_id,
+                    stale_after_seconds=self.app_settings.JOBS_STALE_AFTER_SECONDS,
+                )
+                if job is None:
+                    # finished, cancelled or owned by another worker
+                    return
+
+                heartbeat = asyncio.create_task(self._heartbeat(job_model=job_model, job_id=job_id))
+                if not job.job_started_at:
+                    job.job_started_at = datetime.utcnow()
+                    await job_model.update_job(job_id=job_id, job_started_at=job.job_started_at)
+
+                if job.job_type == JobTypeEnum.PROCESS.value:
+                    result = await self._run_process_job(job=job, job_model=job_model)
+                elif job.job_type == JobTypeEnum.INDEX_PUSH.value:
+                    result = await self._run_index_push_job(job=job, job_model=job_model)
+                else:
+                    raise ValueError(f"Unknown job type: {job.job_type}")
+
+                await job_model.update_job(
+                    job_id=job_id,
+                    job_status=JobStatusEnum.COMPLETED.value,
+                    job_result=result,
+                    job_finished_at=datetime.utcnow(),
+                )
+
+        except (asyncio.CancelledError, JobCancelledError):
+            if self.shutting_down:
+                # let the next startup resume it
+                await job_model.update_job(job_id=job_id, job_status=JobStatusEnum.QUEUED.value)
+            else:
+                await job_model.update_job(
+                    job_id=job_id,
+                    job_status=JobStatusEnum.CANCELLED.value,
+                    job_finished_at=datetime.utcnow(),
+                )
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            await job_model.update_job(
+                job_id=job_id,
+                job_status=JobStatusEnum.FAILED.value,
+                job_error=str(e),
+                job_finished_at=datetime.utcnow(),
+            )
+        finally:
+            if heartbeat:
+                heartbeat.cancel()
+            self.tasks.pop(job_id, None)
+
+    async def _check_cancelled(self, job_model: JobModel, job_id: ObjectId):
+        # the cancel may have been requested through another worker
+        if await job_model.is_cancel_requested(job_id=job_id):
+            raise JobCancelledError()
+
+    def _get_rate_and_eta(self, job: Job, done: int, total: int):
+        elapsed_seconds = (datetime.utcnow() - job.job_started_at).total_seconds()
+        if not done or elapsed_seconds <= 0:
+            return None, None
+
+        rate = done / elapsed_seconds
+        return round(rate, 4), round((total - done) / rate, 1)
+
+    async def _run_process_job(self, job: Job, job_model: JobModel):
+        params = job.job_params
+        progress = job.job_progress
+
+        project_model = self.app.project_model
+        asset_model = self.app.asset_model
+        chunk_model = self.app.chunk_model
+
+        project = await project_model.get_project_by_id(project_id=job.job_project_id)
+
+        if params.get("file_id"):
+            asset_record = await asset_model.get_asset_by_id(ObjectId(params["file_id"]))
+            project_files = [asset_record] if asset_record else []
+        else:
+            project_files = await asset_model.get_all_projects_assets(
+                asset_project_id=project.id,
+                asset_type=AssetTypeEnum.FILE.value,
+            )
+
+        completed_asset_ids = progress.get("completed_asset_ids", [])
+        failed_asset_ids = progress.get("failed_asset_ids", [])
+        progress.setdefault("files_total", len(project_files))
+        progress.setdefault("files_done", len(completed_asset_ids))
+        progress.setdefault("files_processed", 0)
+        progress.setdefault("chunks_inserted", 0)
+
+        if params.get("do_reset") == 1 and not progress.get("reset_done"):
+            _ = await chunk_model.delete_chunks_by_projects_id(project_id=project.id)
+            progress["reset_done"] = True
+            await job_model.update_job(job_id=job.id, job_progress=progress)
+
+        # the asset being processed when the previous worker stopped has partial chunks
+        if progress.get("current_asset_id") and progress["current_asset_id"] not in completed_asset_ids:
+            _ = await chunk_model.delete_chunks_by_asset_id(
+                asset_id=ObjectId(progress["current_asset_id"])
+            )
+            progress["chunks_inserted"] -= progress.get("current_asset_chunks", 0)
+
+        process_controller = ProcessController(project_id=project.project_id)
+
+        for asset in project_files:
+            if str(asset.id) in completed_asset_ids:
+                continue
+
+            await self._check_cancelled(job_model=job_model, job_id=job.id)
+
+            progress["current_asset_id"] = str(asset.id)
+            progress["current_asset_chunks"] = 0
+            await job_model.update_job(job_id=job.id, job_progress=progress)
+
+            if await self._ingest_asset(job=job, job_model=job_model, chunk_model=chunk_model,
+                                        process_controller=process_controller,
+                                        project=project, asset=asset):
+                progress["files_processed"] += 1
+                completed_asset_ids.append(str(asset.id))
+                if str(asset.id) in failed_asset_ids:
+                    failed_asset_ids.remove(str(asset.id))
+            elif str(asset.id) not in failed_asset_ids:
+                # not completed, a resumed job tries it again
+                failed_asset_ids.append(str(asset.id))
+
+            progress["completed_asset_ids"] = completed_asset_ids
+            progress["failed_asset_ids"] = failed_asset_ids
+            progress["files_done"] = len(completed_asset_ids) + len(failed_asset_ids)
+            progress["current_asset_id"] = None
+            progress["files_per_second"], progress["eta_seconds"] = self._get_rate_and_eta(
+                job=job, done=progress["files_done"], total=progress["files_total"]
+            )
+            await job_model.update_job(job_id=job.id, job_progress=progress)
+
+        if progress["files_processed"] == 0:
+            raise RuntimeError("Failed to process any files")
+
+        return {
+            "inserted_chunks": progress["chunks_inserted"],
+            "processed_files": progress["files_processed"],
+        }
+
+    async def _ingest_asset(self, job: Job, job_model: JobModel, chunk_model: ChunkModel,
+                            process_controller: ProcessController, project, asset):
+        """stream the asset through pages -> splitter -> chunk batches -> bulk write,
+        so memory stays flat whatever the file size. Up to CHUNKS_INSERT_MAX_IN_FLIGHT batches
+        are written while the next ones are split, the progress is saved as each one lands."""
+        params = job.job_params
+        progress = job.job_progress
+        batch_size = self.app_settings.INGESTION_BATCH_SIZE
+        max_in_flight = self.app_settings.CHUNKS_INSERT_MAX_IN_FLIGHT
+
+        chunk_order = 0
+        texts, metadatas = [], []
+        in_flight = deque()
+        metadata_normalizer = self.get_metadata_normalizer()
+
+        def send_batch():
+            records = DataChunk.build_records(
+                texts=texts,
+                metadatas=metadatas,
+                project_id=project.id,
+                asset_id=asset.id,
+                start_order=chunk_order - len(texts) + 1,
+            )
+            in_flight.append(asyncio.ensure_future(
+                chunk_model.insert_many_chunk_records(records=records, max_in_flight=1)
+            ))
+
+        async def wait_batch():
+            insert_stats = await in_flight.popleft()
+            progress["chunks_inserted"] += insert_stats["inserted_count"]
+            progress["current_asset_chunks"] += insert_stats["inserted_count"]
+            progress["insert_docs_per_second"] = insert_stats["docs_per_second"]
+
+            elapsed_seconds = (datetime.utcnow() - job.job_started_at).total_seconds()
+            progress["chunks_per_second"] = round(progress["chunks_inserted"] / elapsed_seconds, 2) if elapsed_seconds > 0 else None
+
+            await job_model.update_job(job_id=job.id, job_progress=progress)
+            await self._check_cancelled(job_model=job_model, job_id=job.id)
+
+        try:
+            async for chunk in process_controller.aiter_file_chunks(
+                file_id=asset.asset_name,
+                chunk_size=params["chunk_size"],
+                overlap_size=params["overlap_size"],
+                pdf_extractor=self.app.pdf_extractor,
+                splitter=params.get("splitter"),
+                asset_id=asset.id,
+            ):
+                chunk_order += 1
+                texts.append(chunk.page_content)
+                metadatas.append(
+                    metadata_normalizer.normalize(chunk.metadata, asset_id=asset.id)
+                    if metadata_normalizer else chunk.metadata
+                )
+
+                if len(texts) >= batch_size:
+                    send_batch()
+                    texts, metadatas = [], []
+                    if len(in_flight) >= max_in_flight:
+                        await wait_batch()
+
+            if texts:
+                send_batch()
+            while in_flight:
+                await wait_batch()
+
+            # the document level metadata is stored once on the asset instead of on every chunk
+            if metadata_normalizer and metadata_normalizer.document_metadata is not None:
+                await self.app.asset_model.set_asset_document_metadata(
+                    asset_id=asset.id,
+                    document_metadata=metadata_normalizer.document_metadata,
+                )
+                progress["metadata_bytes_saved"] = progress.get("metadata_bytes_saved", 0) + \
+                    metadata_normalizer.get_stats()["metadata_bytes_saved"]
+
+        except JobCancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error while processing file: {asset.asset_name}: {str(e)}")
+
+            # don't leave a partial document in the chunks, a resumed job retries the asset
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            in_flight.clear()
+            _ = await chunk_model.delete_chunks_by_asset_id(asset_id=asset.id)
+            progress["chunks_inserted"] -= progress["current_asset_chunks"]
+            progress["current_asset_chunks"] = 0
+            return False
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+        if chunk_order == 0:
+            logger.error(f"No chunks generated for file: {asset.asset_name}")
+            return False
+
+        return True
+
+    async def _run_index_push_job(self, job: Job, job_model: JobModel):
+        params = job.job_params
+        progress = job.job_progress
+
+        project_model = self.app.project_model
+        chunk_model = self.app.chunk_model
+
+        project = await project_model.get_project_by_id(project_id=job.job_project_id)
+
+        nlp_controller = NLPController(
+            vectordb_client=self.app.vectordb_client,
+            generation_client=self.app.generation_client,
+            embedding_client=self.app.embedding_client,
+            template_parser=self.app.template_parser,
+            embedding_cache=self.app.embedding_cache,
+        )
+
+        progress.setdefault("chunks_total", await chunk_model.count_project_chunks(project_id=project.id))
+        last_update = 0
+
+        async def on_batch_written(stats: dict):
+            nonlocal last_update
+            progress["chunks_pushed"] = progress.get("chunks_pushed_before_resume", 0) + stats["write"]["items"]
+            progress["chunks_per_second"], progress["eta_seconds"] = self._get_rate_and_eta(
+                job=job, done=progress["chunks_pushed"], total=progress["chunks_total"]
+            )
+
+            # don't write the progress for every single batch
+            if time.monotonic() - last_update >= 1:
+                last_update = time.monotonic()
+                await job_model.update_job(job_id=job.id, job_progress=progress)
+                await self._check_cancelled(job_model=job_model, job_id=job.id)
+
+        # the point ids and the indexed markers make a sync idempotent,
+        # so a resumed push only continues with the chunks not pushed yet
+        is_resumed = progress.get("started", False)
+        progress["started"] = True
+        progress["chunks_pushed_before_resume"] = 0
+        if is_resumed:
+            progress["chunks_pushed_before_resume"] = progress["chunks_total"] - await chunk_model.count_project_chunks(
+                project_id=project.id, only_not_indexed=True
+            )
+        await job_model.update_job(job_id=job.id, job_progress=progress)
+
+        if params.get("do_sync") or is_resumed:
+            push_stats = await nlp_controller.sync_vector_db(
+                project=project,
+                chunk_model=chunk_model,
+                on_batch_written=on_batch_written,
+            )
+        else:
+            push_stats = await nlp_controller.push_into_vector_db(
+                project=project,
+                chunks_batches=chunk_model.iter_project_chunks(
+                    project_id=project.id,
+                    projection={"chunk_text": 1, "chunk_metadata": 1, "chunk_asset_id": 1},
+                ),
+                do_reset=params.get("do_reset"),
+                chunk_model=chunk_model,
+                on_batch_written=on_batch_written,
+            )
+
+        if not push_stats:
+            raise RuntimeError("Error while inserting into the vector db")
+
+        progress["chunks_pushed"] = progress["chunks_pushed_before_resume"] + push_stats["inserted_items_count"]
+        progress["eta_seconds"] = 0
+        await job_model.update_job(job_id=job.id, job_progress=progress)
+
+        return push_stats
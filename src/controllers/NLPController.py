@@ -1,96 +1,431 @@
 from .BaseController import BaseController
 from models.db_schemes import Project, DataChunk
 from stores.llm.LLMEnums import DocumentTypeEnum
-from typing import List
+from stores.vectordb.VectorDBEnums import PayloadModeEnums
+from typing import List, AsyncIterator, Optional, Callable, Awaitable
+from bson.objectid import ObjectId
+import asyncio
+import uuid
+import logging
+import time
 import json
 import re
 
+logger = logging.getLogger('uvicorn.error')
+
 class NLPController(BaseController):
 
     def __init__(self, vectordb_client, generation_client, 
-                embedding_client, template_parser):
+                embedding_client, template_parser, embedding_cache=None,
+                chunk_model=None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.embedding_cache = embedding_cache
+        # reads back the chunk texts the vector db doesn't store in slim payload mode
+        self.chunk_model = chunk_model
 
     def create_collection_name(self, project_id: str):
         return f"collection_{project_id}".strip()
+
+    def get_point_id(self, chunk_id: ObjectId) -> str:
+        """derive a stable vector db id from the chunk id, the 12 bytes ObjectId is left
+        padded to a 16 bytes UUID so the mapping can be reversed with get_chunk_id"""
+        return str(uuid.UUID(bytes=b"\x00" * 4 + chunk_id.binary))
+
+    def get_chunk_id(self, point_id) -> Optional[ObjectId]:
+        try:
+            point_uuid = uuid.UUID(str(point_id))
+        except ValueError:
+            # ids pushed before the stable ids were introduced
+            return None
+
+        if point_uuid.bytes[:4] != b"\x00" * 4:
+            return None
+
+        return ObjectId(point_uuid.bytes[4:])
     
-    def reset_vector_db_collection(self, project: Project):
+    async def reset_vector_db_collection(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.project_id)
-        return self.vectordb_client.delete_collection(collection_name=collection_name)
+        return await self.vectordb_client.adelete_collection(collection_name=collection_name)
     
-    def get_vector_db_collection_info(self, project: Project):
+    async def get_vector_db_collection_info(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.project_id)
-        collection_info = self.vectordb_client.get_collection_info(collection_name=collection_name)
+        collection_info = await self.vectordb_client.aget_collection_info(collection_name=collection_name)
 
         # Turn any objects into JSON safe type
         return json.loads(
             json.dumps(collection_info, default=lambda x: x.__dict__)
         )
 
-    def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
-                               chunks_ids: List[int], 
-                               do_reset: bool = False):
-        # step1: get collection name
-        collection_name = self.create_collection_name(project_id=project.project_id)
+    def is_slim_payload(self):
+        return self.app_settings.VECTOR_DB_PAYLOAD_MODE == PayloadModeEnums.SLIM.value
 
-        # step2: manage items
-        texts = [c.chunk_text for c in chunks]
-        metadata = [c.chunk_metadata for c in chunks]
-        
-        # Use batch embedding instead of individual embeddings
-        vectors = self.embedding_client.embed_texts(
-            texts=texts,
-            document_type=DocumentTypeEnum.DOCUMENT.value
+    def get_slim_metadata(self, metadata: dict):
+        """the point id already is the chunk _id, keep only the fields used to filter"""
+        metadata = metadata or {}
+        return {
+            key: metadata[key]
+            for key in self.app_settings.VECTOR_DB_SLIM_PAYLOAD_KEYS
+            if key in metadata
+        }
+
+    async def hydrate_documents(self, documents: list):
+        """fill the text of the documents returned without one (slim payloads) with a single
+        $in query on the chunks. Documents whose chunk is gone are dropped"""
+        missing = [doc for doc in documents if doc.text is None]
+        if not missing:
+            return documents
+
+        if self.chunk_model is None:
+            logger.error("Search results have no text and no chunk model was given to read them")
+            return [doc for doc in documents if doc.text is not None]
+
+        chunk_ids = [self.get_chunk_id(doc.id) for doc in missing]
+        records = await self.chunk_model.get_chunks_by_ids(
+            chunk_ids=[chunk_id for chunk_id in chunk_ids if chunk_id],
+            projection={"chunk_text": 1},
         )
 
-        # step3: create collection if not exists
-        _ = self.vectordb_client.create_collection(
+        for doc, chunk_id in zip(missing, chunk_ids):
+            record = records.get(chunk_id)
+            if record:
+                doc.text = record["chunk_text"]
+
+        return [doc for doc in documents if doc.text is not None]
+
+    async def embed_documents(self, texts: List[str]):
+        """embed chunk texts, serving the ones already in the embedding cache
+        and only sending the misses to the provider"""
+        document_type = DocumentTypeEnum.DOCUMENT.value
+
+        if not self.embedding_cache:
+            return await self.embedding_client.aembed_texts(
+                texts=texts,
+                document_type=document_type
+            )
+
+        keys = [
+            self.embedding_cache.make_key(
+                provider=self.app_settings.EMBEDDING_BACKEND,
+                model_id=self.embedding_client.embedding_model_id,
+                document_type=document_type,
+                text=self.embedding_client.process_text(text),
+            )
+            for text in texts
+        ]
+        vectors = await self.embedding_cache.aget_many(keys)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            missing_vectors = await self.embedding_client.aembed_texts(
+                texts=[texts[i] for i in missing],
+                document_type=document_type
+            )
+            for i, vector in zip(missing, missing_vectors):
+                vectors[i] = vector
+
+            await self.embedding_cache.aset_many(
+                [keys[i] for i in missing], missing_vectors
+            )
+
+        return vectors
+
+    async def get_embedding_cache_stats(self):
+        if not self.embedding_cache:
+            return None
+        return await self.embedding_cache.aget_stats()
+
+    async def push_into_vector_db(self, project: Project,
+                                  chunks_batches: AsyncIterator[List[DataChunk]],
+                                  do_reset: bool = False,
+                                  chunk_model=None,
+                                  on_batch_written: Callable[[dict], Awaitable] = None,
+                                  embedding_workers: int = None,
+                                  queue_size: int = None):
+        """push all the given chunk batches through a bounded producer/consumer pipeline:
+        one reader stage pulling batches from Mongo, N embedding workers and one writer
+        inserting into the vector db. The stages are connected with bounded queues so the
+        embedding calls overlap with the reads and the upserts.
+        The point ids are derived from the chunk ids, and when a chunk_model is given the
+        pushed chunks are marked as indexed so later syncs can skip them.
+        on_batch_written is awaited with the running stats after every written batch.
+
+        Returns the per stage stats, or False if the vector db insert failed."""
+        embedding_workers = embedding_workers or self.app_settings.INDEX_PUSH_EMBEDDING_WORKERS
+        queue_size = queue_size or self.app_settings.INDEX_PUSH_QUEUE_SIZE
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # create the collection once instead of once per batch
+        _ = await self.vectordb_client.acreate_collection(
             collection_name=collection_name,
             embedding_size=self.embedding_client.embedding_size,
             do_reset=do_reset,
         )
 
-        # step4: insert into vector db
-        _ = self.vectordb_client.insert_many(
-            collection_name=collection_name,
-            texts=texts,
-            metadata=metadata,
-            vectors=vectors,
-            record_ids=chunks_ids,
+        if do_reset and chunk_model:
+            _ = await chunk_model.reset_project_chunks_index(project_id=project.id)
+
+        embed_queue = asyncio.Queue(maxsize=queue_size)
+        write_queue = asyncio.Queue(maxsize=queue_size)
+
+        # busy_seconds is summed over all the workers of a stage
+        stats = {
+            stage: {"batches": 0, "items": 0, "busy_seconds": 0.0}
+            for stage in ("read", "embed", "write")
+        }
+        failed_items_count = 0
+        insert_failed = False
+        # chunks ingested before the normalizer still carry the full loader metadata
+        metadata_normalizer = self.get_metadata_normalizer()
+        slim_payload = self.is_slim_payload()
+        started_at = time.perf_counter()
+
+        async def reader():
+            batches = chunks_batches.__aiter__()
+            while True:
+                tic = time.perf_counter()
+                try:
+                    chunks = await batches.__anext__()
+                except StopAsyncIteration:
+                    break
+                stats["read"]["busy_seconds"] += time.perf_counter() - tic
+                stats["read"]["batches"] += 1
+                stats["read"]["items"] += len(chunks)
+
+                points_ids = [self.get_point_id(chunk.id) for chunk in chunks]
+                await embed_queue.put((chunks, points_ids))
+
+            for _ in range(embedding_workers):
+                await embed_queue.put(None)
+
+        async def embedder():
+            nonlocal failed_items_count
+            while True:
+                item = await embed_queue.get()
+                if item is None:
+                    await write_queue.put(None)
+                    return
+                chunks, points_ids = item
+
+                tic = time.perf_counter()
+                vectors = await self.embed_documents(texts=[c.chunk_text for c in chunks])
+                stats["embed"]["busy_seconds"] += time.perf_counter() - tic
+                stats["embed"]["batches"] += 1
+
+                # drop the chunks the provider failed to embed instead of sending None vectors
+                embedded = [
+                    (chunk, point_id, vector)
+                    for chunk, point_id, vector in zip(chunks, points_ids, vectors)
+                    if vector
+                ]
+                failed_items_count += len(chunks) - len(embedded)
+                stats["embed"]["items"] += len(embedded)
+
+                if embedded:
+                    await write_queue.put(embedded)
+
+        async def writer():
+            nonlocal insert_failed
+            finished_workers = 0
+            while finished_workers < embedding_workers:
+                embedded = await write_queue.get()
+                if embedded is None:
+                    finished_workers += 1
+                    continue
+
+                tic = time.perf_counter()
+                metadata = [
+                    metadata_normalizer.normalize(chunk.chunk_metadata, asset_id=chunk.chunk_asset_id)
+                    if metadata_normalizer else chunk.chunk_metadata
+                    for chunk, _, _ in embedded
+                ]
+                is_inserted = await self.vectordb_client.ainsert_many(
+                    collection_name=collection_name,
+                    texts=None if slim_payload else [chunk.chunk_text for chunk, _, _ in embedded],
+                    metadata=[self.get_slim_metadata(m) for m in metadata] if slim_payload else metadata,
+                    vectors=[vector for _, _, vector in embedded],
+                    record_ids=[point_id for _, point_id, _ in embedded],
+                )
+
+                if not is_inserted:
+                    insert_failed = True
+                    raise RuntimeError(f"Error while inserting into collection: {collection_name}")
+
+                if chunk_model:
+                    _ = await chunk_model.mark_chunks_indexed(
+                        chunk_ids=[chunk.id for chunk, _, _ in embedded]
+                    )
+                stats["write"]["busy_seconds"] += time.perf_counter() - tic
+
+                stats["write"]["batches"] += 1
+                stats["write"]["items"] += len(embedded)
+
+                if on_batch_written:
+                    await on_batch_written(stats)
+
+        tasks = [asyncio.create_task(reader()), asyncio.create_task(writer())]
+        tasks += [asyncio.create_task(embedder()) for _ in range(embedding_workers)]
+
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            logger.error(f"Index push pipeline failed: {str(e)}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if insert_failed:
+                return False
+            raise
+
+        elapsed_seconds = time.perf_counter() - started_at
+        for stage_stats in stats.values():
+            busy_seconds = stage_stats["busy_seconds"]
+            stage_stats["items_per_second"] = round(stage_stats["items"] / busy_seconds, 2) if busy_seconds else None
+            stage_stats["busy_seconds"] = round(busy_seconds, 3)
+
+        return {
+            "inserted_items_count": stats["write"]["items"],
+            "failed_items_count": failed_items_count,
+            "elapsed_seconds": round(elapsed_seconds, 3),
+            "items_per_second": round(stats["write"]["items"] / elapsed_seconds, 2) if elapsed_seconds else None,
+            "embedding_workers": embedding_workers,
+            "stages": stats,
+            "embedding_cache": await self.get_embedding_cache_stats(),
+            "payload_metadata": metadata_normalizer.get_stats() if metadata_normalizer else None,
+        }
+
+    async def sync_vector_db(self, project: Project, chunk_model,
+                             on_batch_written: Callable[[dict], Awaitable] = None):
+        """incremental push: only the chunks that were not indexed yet are embedded and
+        upserted, then the points whose chunks no longer exist are deleted"""
+        push_stats = await self.push_into_vector_db(
+            project=project,
+            chunks_batches=chunk_model.iter_project_chunks(
+                project_id=project.id,
+                projection={"chunk_text": 1, "chunk_metadata": 1, "chunk_asset_id": 1},
+                only_not_indexed=True,
+            ),
+            chunk_model=chunk_model,
+            on_batch_written=on_batch_written,
         )
 
-        return True
-    
-    def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+        if not push_stats:
+            return False
+
+        tic = time.perf_counter()
+        deleted_items_count = await self.delete_stale_vectors(project=project, chunk_model=chunk_model)
+        if deleted_items_count is False:
+            return False
+
+        push_stats["deleted_items_count"] = deleted_items_count
+        push_stats["delete_seconds"] = round(time.perf_counter() - tic, 3)
+        return push_stats
+
+    async def delete_stale_vectors(self, project: Project, chunk_model):
+        """delete the points whose chunk was removed from Mongo"""
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        stale_points_ids = []
+        async for points_ids in self.vectordb_client.alist_record_ids(collection_name=collection_name):
+            chunks_ids = {point_id: self.get_chunk_id(point_id) for point_id in points_ids}
+            existing_chunks_ids = await chunk_model.get_existing_chunk_ids(
+                chunk_ids=[chunk_id for chunk_id in chunks_ids.values() if chunk_id]
+            )
+            stale_points_ids.extend(
+                point_id
+                for point_id, chunk_id in chunks_ids.items()
+                if chunk_id is None or chunk_id not in existing_chunks_ids
+            )
+
+        # delete after the scan so the scroll offsets stay valid
+        for i in range(0, len(stale_points_ids), 1000):
+            is_deleted = await self.vectordb_client.adelete_many(
+                collection_name=collection_name,
+                record_ids=stale_points_ids[i:i+1000],
+            )
+            if not is_deleted:
+                return False
+
+        return len(stale_points_ids)
+
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10,
+                                          oversampling: float = None, rescore: bool = None):
 
         # step1: get collection name
         collection_name = self.create_collection_name(project_id=project.project_id)
 
         # step2: get text embedding vector
-        vector = self.embedding_client.embed_text(text=text, 
+        vector = await self.embedding_client.aembed_text(text=text, 
                                                 document_type=DocumentTypeEnum.QUERY.value)
 
         if not vector or len(vector) == 0:
             return False
 
         # step3: do semantic search
-        results = self.vectordb_client.search_by_vector(
+        results = await self.vectordb_client.asearch_by_vector(
             collection_name=collection_name,
             vector=vector,
-            limit=limit
+            limit=limit,
+            oversampling=oversampling,
+            rescore=rescore,
         )
 
+        if not results:
+            return False
+
+        # step4: read the texts back from mongo for the slim records
+        results = await self.hydrate_documents(documents=results)
+
         if not results:
             return False
 
         return results
     
-    def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+    async def search_vector_db_collection_batch(self, project: Project, texts: List[str], limit: int = 10,
+                                                oversampling: float = None, rescore: bool = None):
+        """many queries with one embedding call, one vector db round trip and one
+        hydration query. Returns a list of results per query, False on failure"""
+
+        # step1: get collection name
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # step2: embed all the queries at once
+        vectors = await self.embedding_client.aembed_texts(texts=texts,
+                                                document_type=DocumentTypeEnum.QUERY.value)
+
+        if not vectors or any(not vector for vector in vectors):
+            return False
+
+        # step3: search them together
+        batch_results = await self.vectordb_client.asearch_by_vectors(
+            collection_name=collection_name,
+            vectors=vectors,
+            limit=limit,
+            oversampling=oversampling,
+            rescore=rescore,
+        )
+
+        if batch_results is None:
+            return False
+
+        # step4: read the texts of the slim records of all the queries back at once
+        _ = await self.hydrate_documents(documents=[
+            document
+            for results in batch_results
+            for document in results
+        ])
+
+        return [
+            [document for document in results if document.text is not None]
+            for results in batch_results
+        ]
+    
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
         # Define common questions with exact answers
         common_questions = {
             "من أنت": "أنا مساعد طلاب ومتدربين المعهد السعودي العالي المتخصص للتدريب، هنا لمساعدتك ومعلوماتك عن برامج المعهد.",
@@ -107,7 +442,7 @@ class NLPController(BaseController):
         answer, full_prompt, chat_history = None, None, None
         
         # Get related documents
-        retrieved_documents = self.search_vector_db_collection(
+        retrieved_documents = await self.search_vector_db_collection(
             project=project,
             text=query,
             limit=limit,
@@ -142,7 +477,7 @@ class NLPController(BaseController):
         full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
 
         # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
+        answer = await self.generation_client.agenerate_text(
             prompt=full_prompt,
             chat_history=chat_history
         )
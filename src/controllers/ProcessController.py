@@ -4,10 +4,12 @@ from .BaseController import BaseController
 from .ProjectController import ProjectController
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from models import ProcessingEnum
+from helper.text_splitter import TextSplitter, get_text_splitter
+from helper.text_cache import ExtractedTextCache
 from langchain_community.document_loaders import JSONLoader
 import json
+import asyncio
 import logging
 import traceback
 from langchain.schema import Document
@@ -65,13 +67,14 @@ class ProcessController(BaseController):
                             # Fallback to manual PDF text extraction
                             try:
                                 import fitz  # PyMuPDF
-                                text = ""
                                 metadata = {"source": self.file_path}
                                 
                                 doc = fitz.open(self.file_path)
-                                for page_num, page in enumerate(doc):
-                                    text += page.get_text()
-                                    text += "\n\n"
+                                # join once instead of growing a string page by page
+                                text = "".join([
+                                    page.get_text() + "\n\n"
+                                    for page in doc
+                                ])
                                 
                                 # Return at least something if we found text
                                 if text.strip():
@@ -90,27 +93,238 @@ class ProcessController(BaseController):
         
         return None
     
-    def get_file_content(self, file_id: str):
+    def get_text_cache(self, file_id: str, asset_id=None):
+        """the extracted text cache of the file, None when it's disabled or not worth it
+        (text files are read as fast as the cache itself)"""
+        file_path = os.path.join(self.project_path, file_id)
+
+        if not self.app_settings.EXTRACTED_TEXT_CACHE_ENABLED \
+                or self.get_file_extension(file_id=file_id) == ProcessingEnum.TXT.value \
+                or not os.path.exists(file_path):
+            return None
+
+        return ExtractedTextCache(file_path=file_path, asset_id=asset_id)
+
+    def is_cacheable_content(self, file_content: list):
+        # the PDF fallback returns an error document, don't keep that around
+        return bool(file_content) and not any(
+            "error" in page.metadata
+            for page in file_content
+        )
+
+    def get_file_content(self, file_id: str, asset_id=None):
+
+        text_cache = self.get_text_cache(file_id=file_id, asset_id=asset_id)
+        if text_cache:
+            file_content = text_cache.load()
+            if file_content is not None:
+                return file_content
+    
+        file_content = self.get_file_loader_content(file_id=file_id)
+        if text_cache and self.is_cacheable_content(file_content):
+            text_cache.save(file_content)
+
+        return file_content
     
+    async def aget_file_content(self, file_id: str, pdf_extractor=None, asset_id=None):
+        """awaitable get_file_content, PDFs are parsed on the extractor process pool
+        and everything else in a thread so the event loop is never blocked"""
+        file_path = os.path.join(self.project_path, file_id)
+
+        if pdf_extractor and self.get_file_extension(file_id=file_id) == ProcessingEnum.PDF.value \
+                and os.path.exists(file_path):
+            text_cache = self.get_text_cache(file_id=file_id, asset_id=asset_id)
+            if text_cache:
+                file_content = await asyncio.to_thread(text_cache.load)
+                if file_content is not None:
+                    return file_content
+
+            try:
+                file_content = await pdf_extractor.aextract(file_path)
+                if text_cache and self.is_cacheable_content(file_content):
+                    await asyncio.to_thread(text_cache.save, file_content)
+                return file_content
+            except Exception as e:
+                logger.error(f"Parallel PDF extraction failed for {file_id}, using the loader: {str(e)}")
+
+        return await asyncio.to_thread(self.get_file_content, file_id, asset_id)
+    
+    def iter_text_file_segments(self, file_path: str, segment_size: int):
+        """read a text file incrementally, yielding segments of about segment_size
+        characters cut at a paragraph (or line) boundary so they split like the whole file"""
+        remainder = ""
+        with open(file_path, "r", encoding="utf-8") as f:
+            while True:
+                block = f.read(segment_size)
+                if not block:
+                    break
+
+                text = remainder + block
+                cut = text.rfind("\n\n")
+                if cut <= 0:
+                    cut = text.rfind("\n")
+
+                if cut <= 0:
+                    # no boundary at all, don't let the remainder grow forever
+                    remainder = ""
+                    yield text
+                else:
+                    remainder = text[cut:]
+                    yield text[:cut]
+
+        if remainder.strip():
+            yield remainder
+
+    async def aiter_file_pages(self, file_id: str, pdf_extractor=None, asset_id=None):
+        """yield the file content page by page (or segment by segment for text files)
+        without loading the whole document in memory"""
+        file_ext = self.get_file_extension(file_id=file_id)
+        file_path = os.path.join(self.project_path, file_id)
+
+        if not os.path.exists(file_path):
+            logger.error(f"File not found: {file_path}")
+            return
+
+        if file_ext == ProcessingEnum.TXT.value:
+            segments = self.iter_text_file_segments(
+                file_path=file_path,
+                segment_size=self.app_settings.INGESTION_TEXT_SEGMENT_SIZE,
+            )
+            segment_start = 0
+            while True:
+                segment = await asyncio.to_thread(next, segments, None)
+                if segment is None:
+                    break
+                yield Document(page_content=segment, metadata={"source": file_path, "start_index": segment_start})
+                segment_start += len(segment)
+            return
+
+        text_cache = self.get_text_cache(file_id=file_id, asset_id=asset_id)
+        if text_cache:
+            if await asyncio.to_thread(text_cache.exists):
+                pages = text_cache.iter_pages()
+                while True:
+                    page = await asyncio.to_thread(next, pages, None)
+                    if page is None:
+                        break
+                    yield page
+                return
+
+            # fill the cache while the pages stream through
+            pages = self.aiter_cached_file_pages(file_id=file_id, text_cache=text_cache,
+                                                 pdf_extractor=pdf_extractor)
+            try:
+                async for page in pages:
+                    yield page
+            finally:
+                await pages.aclose()
+            return
+
+        if file_ext == ProcessingEnum.PDF.value and pdf_extractor:
+            async for page in pdf_extractor.aiter_pages(file_path):
+                yield page
+            return
+
+        # anything else goes through the loaders
+        file_content = await asyncio.to_thread(self.get_file_content, file_id)
+        for page in file_content or []:
+            yield page
+
+    async def aiter_cached_file_pages(self, file_id: str, text_cache: ExtractedTextCache, pdf_extractor=None):
+        file_path = os.path.join(self.project_path, file_id)
+
+        if self.get_file_extension(file_id=file_id) == ProcessingEnum.PDF.value and pdf_extractor:
+            source_pages = pdf_extractor.aiter_pages(file_path)
+        else:
+            source_pages = self.aiter_loaded_pages(file_id=file_id)
+
+        await asyncio.to_thread(text_cache.begin)
+        caching = True
+        try:
+            async for page in source_pages:
+                if caching and "error" in page.metadata:
+                    caching = False
+                    await asyncio.to_thread(text_cache.abort)
+                if caching:
+                    await asyncio.to_thread(text_cache.write_page, page)
+                yield page
+
+            if caching:
+                await asyncio.to_thread(text_cache.commit)
+                caching = False
+        finally:
+            await source_pages.aclose()
+            # interrupted half way, the partial pages are dropped
+            if caching:
+                text_cache.abort()
+
+    async def aiter_loaded_pages(self, file_id: str):
+        file_content = await asyncio.to_thread(self.get_file_loader_content, file_id)
+        for page in file_content or []:
+            yield page
+
+    def get_file_loader_content(self, file_id: str):
         loader = self.get_file_loader(file_id=file_id)
         # check for data in loader
         if loader:
             return loader.load()
 
         return None
+
+    async def aiter_file_chunks(self, file_id: str, chunk_size: int=1000, overlap_size: int=200,
+                                pdf_extractor=None, splitter: str=None, asset_id=None):
+        """stream the chunks of a file, splitting every page as soon as it's read"""
+        text_splitter = self.get_text_splitter(
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            splitter=splitter,
+        )
+
+        async for page in self.aiter_file_pages(file_id=file_id, pdf_extractor=pdf_extractor,
+                                                asset_id=asset_id):
+            if not page.page_content or not page.page_content.strip():
+                continue
+
+            # text file segments carry their position in the file, chunk offsets are shifted by it
+            metadata = dict(page.metadata)
+            start_index = metadata.pop("start_index", 0)
+
+            if isinstance(text_splitter, TextSplitter):
+                chunks = await asyncio.to_thread(
+                    text_splitter.create_documents,
+                    [page.page_content],
+                    [metadata],
+                    [start_index],
+                )
+            else:
+                chunks = await asyncio.to_thread(
+                    text_splitter.create_documents,
+                    [page.page_content],
+                    [metadata],
+                )
+            for chunk in chunks:
+                yield chunk
+
+    def get_text_splitter(self, chunk_size: int, overlap_size: int, splitter: str=None):
+        splitter = splitter or self.app_settings.TEXT_SPLITTER
+        text_splitter = get_text_splitter(splitter, chunk_size, overlap_size)
+        if text_splitter is None:
+            raise ValueError(f"Unsupported text splitter: {splitter}")
+
+        return text_splitter
     
     def process_file_content(self, file_content: list, file_id: str, 
-                            chunk_size: int=1000, overlap_size: int=200):
+                            chunk_size: int=1000, overlap_size: int=200, splitter: str=None):
         # If file_content is empty or None, return empty list instead of None
         if not file_content or len(file_content) == 0:
             logger.error(f"No content found in file: {file_id}")
             return []
         
         try:
-            text_splitter = RecursiveCharacterTextSplitter(
+            text_splitter = self.get_text_splitter(
                 chunk_size=chunk_size,
-                chunk_overlap=overlap_size,
-                length_function=len,
+                overlap_size=overlap_size,
+                splitter=splitter,
             )
             
             file_content_texts = [
@@ -11,6 +11,18 @@ class Settings(BaseSettings):
     FILE_ALLOWED_TYPES: list
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int 
+    FILE_BATCH_UPLOAD_CONCURRENCY: int = 8 # files written at once by /upload/{project_id}/batch
+    UPLOAD_SESSION_EXPIRE_SECONDS: int = 86400 # active upload sessions without a new range for this long are removed
+    UPLOAD_SESSION_FINALIZE_TIMEOUT: int = 300 # a finalize not done after this long (worker stopped) can be retried
+
+    PDF_EXTRACTION_WORKERS: Optional[int] = None # defaults to the number of cores
+    PDF_EXTRACTION_PAGES_PER_TASK: int = 32
+    INGESTION_TEXT_SEGMENT_SIZE: int = 1000000 # characters read at once from text files
+    INGESTION_BATCH_SIZE: int = 500 # chunks written to mongo at once
+    TEXT_SPLITTER: str = "langchain" # langchain or native
+    EXTRACTED_TEXT_CACHE_ENABLED: bool = True
+    CHUNK_METADATA_NORMALIZE: bool = True
+    CHUNK_METADATA_ALLOWED_KEYS: list = ["page", "asset_id", "start_index", "end_index"]
     
     MONGODB_URL: str
     MONGODB_DATABASE: str
@@ -31,9 +43,45 @@ class Settings(BaseSettings):
     GENERATION_DEFAULT_MAX_TOKENS: int = None
     GENERATION_DEFAULT_TEMPERATURE: float = None
     
+    PROJECT_CACHE_SIZE: int = 1024
+    PROJECT_CACHE_TTL: int = 10 # seconds, each worker has its own cache, another worker sees a deleted project until it expires
+
+    CHUNKS_BATCH_SIZE: int = 50
+    CHUNKS_INSERT_BATCH_SIZE: int = 1000 # documents per insert_many
+    CHUNKS_INSERT_MAX_IN_FLIGHT: int = 4 # insert_many batches sent at once
+    INDEX_PUSH_EMBEDDING_WORKERS: int = 4
+    INDEX_PUSH_QUEUE_SIZE: int = 8
+
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = "embedding_cache"
+    EMBEDDING_CACHE_MAX_SIZE: int = 1024 # MB
+
+    JOBS_MAX_CONCURRENT: int = 2
+    JOBS_STALE_AFTER_SECONDS: int = 120
+
     VECTOR_DB_BACKEND : str
+    VECTOR_DB_ACCESS_MODE: str = "direct" # direct, or socket to run several API workers on one vector db server
+    VECTOR_DB_SOCKET_PATH: str = "vectordb.sock" # relative to assets/database
     VECTOR_DB_PATH : str
+    VECTOR_DB_URL: Optional[str] = None # qdrant server, used instead of the local VECTOR_DB_PATH when set
+    VECTOR_DB_UPLOAD_PARALLELISM: int = 4 # batches uploaded at once to a qdrant server
     VECTOR_DB_DISTANCE_METHOD : str = None
+    VECTOR_DB_COLLECTION_INFO_TTL: float = 5 # seconds the collection stats are served from memory
+    # collection storage, the overrides are per collection name
+    # e.g. {"collection_1": {"quantization": "binary", "on_disk": true}}
+    VECTOR_DB_QUANTIZATION: str = "none" # none, scalar or binary
+    VECTOR_DB_ON_DISK: bool = False # keep the original vectors on disk, only the quantized ones in RAM
+    VECTOR_DB_HNSW_M: Optional[int] = None # qdrant default 16
+    VECTOR_DB_HNSW_EF_CONSTRUCT: Optional[int] = None # qdrant default 100
+    VECTOR_DB_COLLECTION_OVERRIDES: dict = {}
+    VECTOR_DB_SEARCH_OVERSAMPLING: Optional[float] = None
+    VECTOR_DB_SEARCH_RESCORE: bool = True
+    VECTOR_DB_NUMPY_DTYPE: str = "float32" # float32, float16 or int8, NUMPY backend only
+    VECTOR_DB_HNSW_EF_SEARCH: int = 64 # HNSW backend only, higher is slower with a better recall
+    VECTOR_DB_HNSW_SAVE_EVERY: int = 10000 # vectors added before the index file is rewritten
+    VECTOR_DB_HNSW_COMPACT_RATIO: float = 0.2 # deleted share of a collection that triggers a rebuild
+    VECTOR_DB_PAYLOAD_MODE: str = "full" # full or slim
+    VECTOR_DB_SLIM_PAYLOAD_KEYS: list = ["asset_id", "page"] # metadata still stored in slim mode, for filtering
     
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
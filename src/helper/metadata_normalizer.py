@@ -0,0 +1,50 @@
+import json
+
+class MetadataNormalizer:
+    """
+    Keeps only the allowlisted metadata keys (page, source asset id, offsets) on every chunk.
+    Everything else the loaders add (file path, producer, creator, dates ...) is the same for
+    the whole document, it's kept once as document_metadata to be stored on the asset.
+    Counts the bytes the chunks no longer carry.
+    """
+
+    def __init__(self, allowed_keys: list):
+        self.allowed_keys = list(allowed_keys)
+        self.document_metadata = None
+
+        self.bytes_before = 0
+        self.bytes_after = 0
+
+    def get_size(self, metadata: dict):
+        return len(json.dumps(metadata, default=str, ensure_ascii=False).encode("utf-8"))
+
+    def normalize(self, metadata: dict, asset_id=None):
+        metadata = metadata or {}
+
+        compact_metadata = {
+            key: metadata[key]
+            for key in self.allowed_keys
+            if key in metadata
+        }
+        if asset_id is not None and "asset_id" in self.allowed_keys:
+            compact_metadata["asset_id"] = str(asset_id)
+
+        if self.document_metadata is None:
+            self.document_metadata = {
+                key: value
+                for key, value in metadata.items()
+                if key not in self.allowed_keys
+            }
+
+        self.bytes_before += self.get_size(metadata)
+        self.bytes_after += self.get_size(compact_metadata)
+
+        return compact_metadata
+
+    def get_stats(self):
+        return {
+            "metadata_bytes_before": self.bytes_before,
+            "metadata_bytes_after": self.bytes_after,
+            "metadata_bytes_saved": self.bytes_before - self.bytes_after,
+            "metadata_saved_ratio": round(1 - self.bytes_after / self.bytes_before, 4) if self.bytes_before else None,
+        }
@@ -0,0 +1,103 @@
+import os
+import asyncio
+from collections import deque
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+from langchain.schema import Document
+
+logger = logging.getLogger('uvicorn.error')
+
+def get_pdf_page_count(file_path: str):
+    import fitz  # PyMuPDF
+
+    with fitz.open(file_path) as doc:
+        return doc.page_count
+
+def extract_pdf_pages(file_path: str, start_page: int, end_page: int):
+    """extract the text of the pages [start_page, end_page) of a PDF.
+    Runs inside the pool processes, so it returns plain (text, metadata) tuples
+    with the same metadata PyMuPDFLoader produces."""
+    import fitz  # PyMuPDF
+
+    pages = []
+    with fitz.open(file_path) as doc:
+        doc_metadata = {
+            key: value
+            for key, value in doc.metadata.items()
+            if type(value) in [str, int]
+        }
+        for page_num in range(start_page, min(end_page, doc.page_count)):
+            page = doc.load_page(page_num)
+            pages.append((
+                page.get_text(),
+                dict({
+                    "source": file_path,
+                    "file_path": file_path,
+                    "page": page_num,
+                    "total_pages": doc.page_count,
+                }, **doc_metadata),
+            ))
+
+    return pages
+
+class PDFExtractor:
+    """
+    Extracts PDF text on a process pool. Large documents are split in page ranges
+    parsed on different cores, then reassembled as one Document per page in page order.
+    """
+
+    def __init__(self, max_workers: int=None, pages_per_task: int=32):
+        self.max_workers = max_workers or os.cpu_count()
+        self.pages_per_task = pages_per_task
+        self.executor = None
+
+    def connect(self):
+        # spawn instead of fork, forking a process that runs an event loop and the mongo client threads is unsafe
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def disconnect(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+
+    def get_page_ranges(self, page_count: int):
+        # don't make ranges smaller than needed to keep all the workers busy
+        pages_per_task = max(1, min(self.pages_per_task, -(-page_count // self.max_workers)))
+        return [
+            (start_page, min(start_page + pages_per_task, page_count))
+            for start_page in range(0, page_count, pages_per_task)
+        ]
+
+    async def aiter_pages(self, file_path: str):
+        """yield the pages in order while the next ranges are parsed, keeping at most
+        max_workers ranges in flight so memory doesn't grow with the document size"""
+        loop = asyncio.get_running_loop()
+
+        page_count = await loop.run_in_executor(self.executor, get_pdf_page_count, file_path)
+
+        pending = deque()
+        try:
+            for start_page, end_page in self.get_page_ranges(page_count):
+                pending.append(
+                    loop.run_in_executor(self.executor, extract_pdf_pages, file_path, start_page, end_page)
+                )
+                if len(pending) < self.max_workers:
+                    continue
+
+                for text, metadata in await pending.popleft():
+                    yield Document(page_content=text, metadata=metadata)
+
+            while pending:
+                for text, metadata in await pending.popleft():
+                    yield Document(page_content=text, metadata=metadata)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def aextract(self, file_path: str) -> List[Document]:
+        return [page async for page in self.aiter_pages(file_path)]
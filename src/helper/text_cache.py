@@ -0,0 +1,100 @@
+import os
+import glob
+import gzip
+import json
+import hashlib
+import logging
+from langchain.schema import Document
+
+logger = logging.getLogger('uvicorn.error')
+
+class ExtractedTextCache:
+    """
+    Extracted page texts of one asset, stored gzipped next to the file as
+    .<file_name>.<asset_id>.<content_hash>.pages.jsonl.gz (one json line per page).
+    The content hash is part of the name, so a changed file never reads stale text.
+    """
+
+    def __init__(self, file_path: str, asset_id: str=None):
+        self.file_path = file_path
+        self.asset_id = str(asset_id) if asset_id else "none"
+        self.content_hash = None
+        self.tmp_file = None
+        self.tmp_path = None
+
+    def get_content_hash(self):
+        if self.content_hash is None:
+            sha = hashlib.sha256()
+            with open(self.file_path, "rb") as f:
+                for block in iter(lambda: f.read(1048576), b""):
+                    sha.update(block)
+            self.content_hash = sha.hexdigest()[:32]
+
+        return self.content_hash
+
+    def get_cache_prefix(self):
+        directory, file_name = os.path.split(self.file_path)
+        return os.path.join(directory, f".{file_name}.{self.asset_id}.")
+
+    def get_cache_path(self):
+        return self.get_cache_prefix() + f"{self.get_content_hash()}.pages.jsonl.gz"
+
+    def exists(self):
+        return os.path.exists(self.get_cache_path())
+
+    def iter_pages(self):
+        with gzip.open(self.get_cache_path(), "rt", encoding="utf-8") as f:
+            for line in f:
+                page = json.loads(line)
+                yield Document(page_content=page["text"], metadata=page["metadata"])
+
+    def load(self):
+        """all the cached pages, or None on a miss"""
+        try:
+            if not self.exists():
+                return None
+            return list(self.iter_pages())
+        except Exception as e:
+            logger.error(f"Error reading the extracted text cache of {self.file_path}: {str(e)}")
+            return None
+
+    def begin(self):
+        self.tmp_path = self.get_cache_path() + f".{os.getpid()}.tmp"
+        self.tmp_file = gzip.open(self.tmp_path, "wt", encoding="utf-8", compresslevel=6)
+
+    def write_page(self, page: Document):
+        self.tmp_file.write(json.dumps({
+            "text": page.page_content,
+            "metadata": page.metadata,
+        }, ensure_ascii=False) + "\n")
+
+    def commit(self):
+        """publish the written pages atomically and drop the entries of older file versions"""
+        self.tmp_file.close()
+        self.tmp_file = None
+
+        cache_path = self.get_cache_path()
+        os.replace(self.tmp_path, cache_path)
+        self.tmp_path = None
+
+        for old_path in glob.glob(glob.escape(self.get_cache_prefix()) + "*.pages.jsonl.gz"):
+            if old_path != cache_path:
+                os.remove(old_path)
+
+    def abort(self):
+        if self.tmp_file:
+            self.tmp_file.close()
+            self.tmp_file = None
+        if self.tmp_path and os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        self.tmp_path = None
+
+    def save(self, pages: list):
+        try:
+            self.begin()
+            for page in pages:
+                self.write_page(page)
+            self.commit()
+        except Exception as e:
+            logger.error(f"Error writing the extracted text cache of {self.file_path}: {str(e)}")
+            self.abort()
@@ -0,0 +1,145 @@
+import re
+from functools import lru_cache
+from langchain.schema import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from models.enums.ProcessingEnum import TextSplitterEnum
+
+# separators from the strongest to the weakest. sentence ends cover the latin and arabic
+# marks (؟ ، ؛ ۔) and stop *before* the whitespace, so the newline after a full stop
+# still counts as a line / paragraph boundary.
+PARAGRAPH_PATTERN = re.compile(r"\n[ \t\r]*\n")
+SENTENCE_PATTERN = re.compile(r"[.!?؟۔…]+[\"'»”’)\]]*(?=\s)")
+CLAUSE_PATTERN = re.compile(r"[,،;؛:](?=\s)")
+ANY_BOUNDARY_PATTERN = re.compile(r"\s+|[.!?؟۔…,،;؛:]+(?=\s)")
+
+
+def last_match_end(pattern, text: str, pos: int, endpos: int):
+    end = -1
+    for match in pattern.finditer(text, pos, endpos):
+        end = match.end()
+    return end
+
+
+class TextSplitter:
+    """
+    Offset based splitter, walks the text once from left to right.
+    Every chunk is cut at the strongest boundary (paragraph, line, sentence, clause, word) found
+    in its own window that keeps it at least min_fill of chunk_size long. The windows are searched
+    with str.rfind and the precompiled patterns, nothing is split and re-joined, chunks are only
+    sliced out of the original text and their offsets go in the metadata.
+    """
+
+    def __init__(self, chunk_size: int=1000, chunk_overlap: int=200, min_fill: float=0.5):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = max(chunk_overlap, 0)
+        self.min_fill = min_fill
+
+    def find_chunk_end(self, text: str, start: int, limit: int):
+        min_end = start + int(self.chunk_size * self.min_fill)
+
+        # the strongest boundary in [min_end, limit], the latest one of that kind
+        end = last_match_end(PARAGRAPH_PATTERN, text, min_end, limit)
+        if end < 0:
+            end = text.rfind("\n", min_end, limit)
+            end = end + 1 if end >= 0 else -1
+        if end < 0:
+            end = last_match_end(SENTENCE_PATTERN, text, min_end, limit)
+        if end < 0:
+            end = last_match_end(CLAUSE_PATTERN, text, min_end, limit)
+        if end < 0:
+            end = max(text.rfind(" ", min_end, limit), text.rfind("\t", min_end, limit))
+            end = end + 1 if end >= 0 else -1
+        if end > start:
+            return end
+
+        # a short chunk is better than cutting inside a word
+        end = max(text.rfind(" ", start + 1, limit), text.rfind("\n", start + 1, limit))
+        if end > start:
+            return end + 1
+
+        return limit
+
+    def find_next_start(self, text: str, start: int, end: int):
+        if not self.chunk_overlap:
+            return end
+
+        # begin the overlap right after the first boundary inside it, never go backwards
+        match = ANY_BOUNDARY_PATTERN.search(text, max(end - self.chunk_overlap, start + 1), end)
+        if match and match.end() < end:
+            return match.end()
+
+        return end
+
+    def split_offsets(self, text: str):
+        """(start, end) of every chunk, with the surrounding whitespace trimmed"""
+        text_length = len(text)
+
+        offsets = []
+        start = 0
+        while start < text_length:
+            limit = start + self.chunk_size
+            end = text_length if limit >= text_length else self.find_chunk_end(text, start, limit)
+
+            chunk_start, chunk_end = start, end
+            while chunk_start < chunk_end and text[chunk_start].isspace():
+                chunk_start += 1
+            while chunk_end > chunk_start and text[chunk_end - 1].isspace():
+                chunk_end -= 1
+            if chunk_end > chunk_start:
+                offsets.append((chunk_start, chunk_end))
+
+            if end >= text_length:
+                break
+            start = self.find_next_start(text, start, end)
+
+        return offsets
+
+    def split_text(self, text: str):
+        return [
+            text[start:end]
+            for start, end in self.split_offsets(text)
+        ]
+
+    def create_documents(self, texts: list, metadatas: list=None, start_indexes: list=None):
+        """same contract as the langchain splitters, start_index / end_index are added to the metadata
+        (shifted by start_indexes when the texts are segments of a bigger file)"""
+        metadatas = metadatas or [{}] * len(texts)
+        start_indexes = start_indexes or [0] * len(texts)
+
+        documents = []
+        for text, metadata, base_index in zip(texts, metadatas, start_indexes):
+            for start, end in self.split_offsets(text):
+                documents.append(Document(
+                    page_content=text[start:end],
+                    metadata={
+                        **metadata,
+                        "start_index": base_index + start,
+                        "end_index": base_index + end,
+                    }
+                ))
+
+        return documents
+
+
+@lru_cache(maxsize=32)
+def get_text_splitter(splitter: str, chunk_size: int, overlap_size: int):
+    """splitters hold no per-call state, so one instance per settings combination is reused"""
+    if splitter == TextSplitterEnum.NATIVE.value:
+        return TextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=overlap_size,
+        )
+
+    if splitter == TextSplitterEnum.LANGCHAIN.value:
+        return RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=overlap_size,
+            length_function=len,
+        )
+
+    return None
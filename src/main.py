@@ -3,11 +3,20 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
-from routes import base, data, nlp
+from routes import base, data, nlp, jobs
 from helper.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.VectorDBEnums import VectorDBAccessModeEnums
 from stores.llm.templatess.template_parser import TemplateParser
+from stores.llm.EmbeddingCache import EmbeddingCache
+from helper.pdf_extractor import PDFExtractor
+from controllers import BaseController, DataController, JobController
+from models.ProjectModel import ProjectModel
+from models.AssetModel import AssetModel
+from models.ChunkModel import ChunkModel
+from models.JobModel import JobModel
+from models.UploadSessionModel import UploadSessionModel
 
 app = FastAPI()
 
@@ -27,6 +36,23 @@ async def startup_span():
     app.mongo_conn = AsyncIOMotorClient(settings.MONGODB_URL)
     app.db_client = app.mongo_conn[settings.MONGODB_DATABASE]
 
+    # the models are shared by all the requests, collections and indexes are set up
+    # once here instead of checking list_collection_names on every request
+    app.project_model = ProjectModel(db_client=app.db_client)
+    app.asset_model = AssetModel(db_client=app.db_client)
+    app.chunk_model = ChunkModel(db_client=app.db_client)
+    app.job_model = JobModel(db_client=app.db_client)
+    app.upload_session_model = UploadSessionModel(db_client=app.db_client)
+    for model in [app.project_model, app.asset_model, app.chunk_model,
+                  app.job_model, app.upload_session_model]:
+        await model.init_collection()
+
+    # upload sessions abandoned while the app was down
+    await DataController().remove_expired_upload_sessions(
+        upload_session_model=app.upload_session_model,
+        project_model=app.project_model,
+    )
+
     # create instance of factory
     llm_provider_factory = LLMProviderFactory(settings)
     vectordb_provider_factory = VectorDBProviderFactory(settings)
@@ -39,11 +65,23 @@ async def startup_span():
     app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
     app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
                                             embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    # embedding cache, so re-pushing unchanged chunks doesn't hit the provider again
+    app.embedding_cache = None
+    if settings.EMBEDDING_CACHE_ENABLED:
+        app.embedding_cache = EmbeddingCache(
+            db_path=BaseController().get_database_path(db_name=settings.EMBEDDING_CACHE_PATH),
+            max_size_mb=settings.EMBEDDING_CACHE_MAX_SIZE,
+        )
+        app.embedding_cache.connect()
     
-    # vector db client
-    app.vectordb_client = vectordb_provider_factory.create(
-        provider=settings.VECTOR_DB_BACKEND
-    )
+    # vector db client, in socket mode every worker talks to the one owner process
+    if settings.VECTOR_DB_ACCESS_MODE == VectorDBAccessModeEnums.SOCKET.value:
+        app.vectordb_client = vectordb_provider_factory.create_socket_client()
+    else:
+        app.vectordb_client = vectordb_provider_factory.create(
+            provider=settings.VECTOR_DB_BACKEND
+        )
     app.vectordb_client.connect()
 
     app.template_parser = TemplateParser(
@@ -51,9 +89,24 @@ async def startup_span():
         default_language=settings.DEFAULT_LANG,
     )
 
+    # process pool for parsing PDFs on all the cores
+    app.pdf_extractor = PDFExtractor(
+        max_workers=settings.PDF_EXTRACTION_WORKERS,
+        pages_per_task=settings.PDF_EXTRACTION_PAGES_PER_TASK,
+    )
+    app.pdf_extractor.connect()
+
+    # background jobs, resume the ones a previous worker left unfinished
+    app.job_controller = JobController(app=app)
+    await app.job_controller.resume_unfinished_jobs()
+
 async def shutdown_span():
+    await app.job_controller.shutdown()
+    app.pdf_extractor.disconnect()
     app.mongo_conn.close()
     app.vectordb_client.disconnect()
+    if app.embedding_cache:
+        app.embedding_cache.disconnect()
 
 # app.router.lifespan.on_startup.append(startup_span)
 # app.router.lifespan.on_shutdown.append(shutdown_span)
@@ -65,3 +118,4 @@ app.on_event("shutdown")(shutdown_span)
 app.include_router(base.base_router)
 app.include_router(data.data_router)
 app.include_router(nlp.nlp_router)
+app.include_router(jobs.jobs_router)
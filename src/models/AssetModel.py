@@ -2,6 +2,7 @@ from .BaseDataModel import BaseDataModel
 from .db_schemes import Asset
 from .enums.DataBaseEnum import DataBaseEnum
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 class AssetModel(BaseDataModel):
     
@@ -10,29 +11,17 @@ class AssetModel(BaseDataModel):
         # initalise the model and points to the collection
         self.collection = self.db_client[DataBaseEnum.COLLECTION_ASSET_NAME.value]
         
-    @classmethod
-    async def create_instance(cls, db_client: object):
-        """do the __init__ function and the init_collection function.
-        As we need to call the init__collection inside the __init__ but the first function is async
-        and the second can't be anysc
-        """
-        instance = cls(db_client)
-        await instance.init_collection()
-        return instance
-        
     async def init_collection(self):
-        """check if the collection exist, if not create it and create indecies
-            so basically the implementaion of the indecies"""
-        all_collections = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_ASSET_NAME.value not in all_collections:
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_ASSET_NAME.value]
-            indexes = Asset.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"]
-                )
+        """create the indecies of the collection (mongo creates the collection with the first one).
+            create_index does nothing for an index that already exists, so this is safe to run
+            at every startup and existing databases get the indexes added later"""
+        indexes = Asset.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"]
+            )
                 
     async def create_asset(self, asset: Asset):
         
@@ -41,6 +30,37 @@ class AssetModel(BaseDataModel):
         
         return asset
     
+    async def get_or_create_asset_by_content_hash(self, asset: Asset):
+        """insert the asset unless its project already has the same content, as one atomic
+        upsert so concurrent uploads of the same file don't both create an asset.
+        returns (asset, created)"""
+        asset_id = ObjectId()
+        record = await self.collection.find_one_and_update(
+            {
+                "asset_project_id": asset.asset_project_id,
+                "asset_content_hash": asset.asset_content_hash,
+            },
+            {"$setOnInsert": {**asset.model_dump(by_alias=True, exclude_unset=True), "_id": asset_id}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        
+        return Asset(**record), record["_id"] == asset_id
+    
+    async def create_assets(self, assets: list):
+        """insert many assets in one round trip"""
+        if not assets:
+            return []
+        
+        result = await self.collection.insert_many([
+            asset.model_dump(by_alias=True, exclude_unset=True)
+            for asset in assets
+        ])
+        for asset, inserted_id in zip(assets, result.inserted_ids):
+            asset.id = inserted_id
+        
+        return assets
+    
     async def get_all_projects_assets(self, asset_project_id: str, asset_type: str):
         
         records =  await self.collection.find({
@@ -65,6 +85,46 @@ class AssetModel(BaseDataModel):
         
         return None 
     
+    async def get_asset_by_content_hash(self, asset_project_id: str, content_hash: str):
+        
+        record = await self.collection.find_one({
+            "asset_project_id": ObjectId(asset_project_id) if isinstance(asset_project_id, str) else asset_project_id,
+            "asset_content_hash": content_hash,
+        })
+        
+        if record:
+            return Asset(**record)
+        
+        return None
+    
+    async def get_assets_by_content_hashes(self, asset_project_id: str, content_hashes: list):
+        """{content_hash: asset} of the given hashes that already exist in the project"""
+        if not content_hashes:
+            return {}
+        
+        records = await self.collection.find({
+            "asset_project_id": ObjectId(asset_project_id) if isinstance(asset_project_id, str) else asset_project_id,
+            "asset_content_hash": {"$in": list(set(content_hashes))},
+        }).to_list(length=None)
+        
+        return {
+            record["asset_content_hash"]: Asset(**record)
+            for record in records
+        }
+    
+    async def set_asset_document_metadata(self, asset_id: ObjectId, document_metadata: dict):
+        await self.collection.update_one(
+            {"_id": asset_id},
+            {"$set": {"asset_document_metadata": document_metadata}}
+        )
+    
+    async def delete_assets_by_project_id(self, asset_project_id: ObjectId):
+        result = await self.collection.delete_many({
+            "asset_project_id": asset_project_id
+        })
+        
+        return result.deleted_count
+    
     async def get_asset_by_id(self, asset_id: ObjectId):
         record = await self.collection.find_one({
             "_id": asset_id
@@ -3,6 +3,10 @@ from .db_schemes import DataChunk
 from .enums.DataBaseEnum import DataBaseEnum
 from bson.objectid import ObjectId
 from pymongo import InsertOne # type of operation
+from pymongo.errors import OperationFailure
+from datetime import datetime
+import asyncio
+import time
 
 class ChunkModel(BaseDataModel):
     
@@ -10,29 +14,24 @@ class ChunkModel(BaseDataModel):
         super().__init__(db_client)
         self.collection = self.db_client[DataBaseEnum.COLLECTION_CHUNK_NAME.value]
         
-    @classmethod
-    async def create_instance(cls, db_client: object):
-        """do the __init__ function and the init_collection function.
-        As we need to call the init__collection inside the __init__ but the first function is async
-        and the second can't be anysc
-        """
-        instance = cls(db_client)
-        await instance.init_collection()
-        return instance
-        
     async def init_collection(self):
-        """check if the collection exist, if not create it and create indecies
-            so basically the implementaion of the indecies"""
-        all_collections = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_CHUNK_NAME.value not in all_collections:
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_CHUNK_NAME.value]
-            indexes = DataChunk.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"], 
-                    name=index["name"],
-                    unique=index["unique"]
-                )
+        """create the indecies of the collection (mongo creates the collection with the first one).
+            create_index does nothing for an index that already exists, so this is safe to run
+            at every startup and existing databases get the indexes added later"""
+        indexes = DataChunk.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"]
+            )
+
+        for index_name in DataChunk.get_dropped_indexes():
+            try:
+                await self.collection.drop_index(index_name)
+            except OperationFailure:
+                # already dropped, or never created
+                pass
                 
     async def create_chunk(self, chunk: DataChunk):
         result = await self.collection.insert_one(chunk.model_dump(by_alias=True, exclude_unset=True))
@@ -62,6 +61,31 @@ class ChunkModel(BaseDataModel):
             
         return len(chunks)
     
+    async def insert_many_chunk_records(self, records: list, batch_size: int=None, max_in_flight: int=None):
+        """fast path for the raw documents of DataChunk.build_records. Unordered insert_many
+        batches, up to max_in_flight of them sent at once. Returns the count and the docs/sec"""
+        batch_size = batch_size or self.app_settings.CHUNKS_INSERT_BATCH_SIZE
+        semaphore = asyncio.Semaphore(max_in_flight or self.app_settings.CHUNKS_INSERT_MAX_IN_FLIGHT)
+        
+        async def insert_batch(batch: list):
+            async with semaphore:
+                result = await self.collection.insert_many(batch, ordered=False)
+                return len(result.inserted_ids)
+        
+        started_at = time.perf_counter()
+        inserted_counts = await asyncio.gather(*[
+            insert_batch(records[i:i+batch_size])
+            for i in range(0, len(records), batch_size)
+        ])
+        elapsed_seconds = time.perf_counter() - started_at
+        
+        inserted_count = sum(inserted_counts)
+        return {
+            "inserted_count": inserted_count,
+            "elapsed_seconds": round(elapsed_seconds, 4),
+            "docs_per_second": round(inserted_count / elapsed_seconds, 2) if elapsed_seconds > 0 else None,
+        }
+    
     # async def insert_many_chunks(self, chunks: list, batch_size: int=100):
     #     if not chunks:
     #         print("Warning: No chunks to insert")
@@ -85,6 +109,21 @@ class ChunkModel(BaseDataModel):
     #     return len(chunks)
                 
             
+    async def get_chunks_by_ids(self, chunk_ids: list, projection: dict=None):
+        """{chunk_id: record} of the given chunks in one $in query, missing ones are left out"""
+        if not chunk_ids:
+            return {}
+        
+        records = await self.collection.find(
+            {"_id": {"$in": chunk_ids}},
+            projection
+        ).to_list(length=None)
+        
+        return {
+            record["_id"]: record
+            for record in records
+        }
+    
     async def delete_chunks_by_projects_id(self, project_id: ObjectId):
         result = await self.collection .delete_many({
             "chunk_project_id":project_id
@@ -92,6 +131,19 @@ class ChunkModel(BaseDataModel):
         
         return  result.deleted_count 
     
+    async def delete_chunks_by_asset_id(self, asset_id: ObjectId):
+        result = await self.collection.delete_many({
+            "chunk_asset_id": asset_id
+        })
+        
+        return result.deleted_count
+
+    async def count_project_chunks(self, project_id: ObjectId, only_not_indexed: bool=False):
+        query = {"chunk_project_id": project_id}
+        if only_not_indexed:
+            query["chunk_indexed_at"] = None
+        return await self.collection.count_documents(query)
+    
     async def get_project_chunks(self, project_id: ObjectId, page_no: int=1, page_size: int=50):
         records = await self.collection.find({
                     "chunk_project_id": project_id
@@ -102,4 +154,60 @@ class ChunkModel(BaseDataModel):
         return [
             DataChunk(**record)
             for record in records
-        ]
\ No newline at end of file
+        ]
+
+    async def iter_project_chunks(self, project_id: ObjectId, batch_size: int=None,
+                                  projection: dict=None, only_not_indexed: bool=False):
+        """yield the project chunks batch by batch using keyset pagination (_id > last_id)
+        instead of skip, so walking the whole project stays linear in the number of chunks.
+        It relies on the (chunk_project_id, _id) index."""
+        if batch_size is None:
+            batch_size = self.app_settings.CHUNKS_BATCH_SIZE
+
+        last_id = None
+        while True:
+            query = {"chunk_project_id": project_id}
+            if only_not_indexed:
+                # matches both the null and the missing field
+                query["chunk_indexed_at"] = None
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            records = await self.collection.find(
+                query, projection
+            ).sort("_id", 1).limit(batch_size).to_list(length=None)
+
+            if not records:
+                break
+
+            last_id = records[-1]["_id"]
+
+            if projection:
+                # partial documents can't pass the DataChunk validation
+                yield [DataChunk.model_construct(**record) for record in records]
+            else:
+                yield [DataChunk(**record) for record in records]
+
+            if len(records) < batch_size:
+                break
+
+    async def mark_chunks_indexed(self, chunk_ids: list, indexed_at: datetime=None):
+        result = await self.collection.update_many(
+            {"_id": {"$in": chunk_ids}},
+            {"$set": {"chunk_indexed_at": indexed_at or datetime.utcnow()}}
+        )
+        return result.modified_count
+
+    async def reset_project_chunks_index(self, project_id: ObjectId):
+        """forget which chunks were pushed, used when the vector db collection is reset"""
+        result = await self.collection.update_many(
+            {"chunk_project_id": project_id, "chunk_indexed_at": {"$ne": None}},
+            {"$set": {"chunk_indexed_at": None}}
+        )
+        return result.modified_count
+
+    async def get_existing_chunk_ids(self, chunk_ids: list):
+        records = await self.collection.find(
+            {"_id": {"$in": chunk_ids}}, {"_id": 1}
+        ).to_list(length=None)
+        return {record["_id"] for record in records}
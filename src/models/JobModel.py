@@ -0,0 +1,118 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import Job
+from .enums.DataBaseEnum import DataBaseEnum
+from .enums.JobEnums import JobStatusEnum
+from bson import ObjectId
+from pymongo import ReturnDocument
+from datetime import datetime, timedelta
+
+class JobModel(BaseDataModel):
+    
+    def __init__(self, db_client: object):
+        super().__init__(db_client)
+        # initalise the model and points to the collection
+        self.collection = self.db_client[DataBaseEnum.COLLECTION_JOB_NAME.value]
+        
+    async def init_collection(self):
+        """create the indecies of the collection (mongo creates the collection with the first one).
+            create_index does nothing for an index that already exists, so this is safe to run
+            at every startup and existing databases get the indexes added later"""
+        indexes = Job.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"]
+            )
+                
+    async def create_job(self, job: Job):
+        
+        result = await self.collection.insert_one(job.model_dump(by_alias=True, exclude_unset=True))
+        job.id = result.inserted_id
+        
+        return job
+    
+    async def get_job_by_id(self, job_id: ObjectId):
+        record = await self.collection.find_one({
+            "_id": job_id
+        })
+        
+        if record:
+            return Job(**record)
+        
+        return None
+
+    async def update_job(self, job_id: ObjectId, **fields):
+        """set the given job fields and refresh the heartbeat"""
+        fields["job_updated_at"] = datetime.utcnow()
+        await self.collection.update_one(
+            {"_id": job_id},
+            {"$set": fields}
+        )
+
+    async def claim_job(self, job_id: ObjectId, worker_id: str, stale_after_seconds: int):
+        """atomically take ownership of a queued job, or of a running job whose worker
+        stopped sending heartbeats. Returns None if another worker owns it."""
+        now = datetime.utcnow()
+        record = await self.collection.find_one_and_update(
+            {
+                "_id": job_id,
+                "job_cancel_requested": {"$ne": True},
+                "$or": [
+                    {"job_status": JobStatusEnum.QUEUED.value},
+                    {
+                        "job_status": JobStatusEnum.RUNNING.value,
+                        "job_updated_at": {"$lt": now - timedelta(seconds=stale_after_seconds)},
+                    },
+                ],
+            },
+            {"$set": {
+                "job_status": JobStatusEnum.RUNNING.value,
+                "job_worker_id": worker_id,
+                "job_updated_at": now,
+            }},
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if record:
+            return Job(**record)
+
+        return None
+
+    async def get_resumable_jobs(self, stale_after_seconds: int):
+        """the queued jobs and the running jobs left behind by a stopped worker"""
+        records = await self.collection.find({
+            "$or": [
+                {"job_status": JobStatusEnum.QUEUED.value},
+                {
+                    "job_status": JobStatusEnum.RUNNING.value,
+                    "job_updated_at": {"$lt": datetime.utcnow() - timedelta(seconds=stale_after_seconds)},
+                },
+            ]
+        }).sort("job_created_at", 1).to_list(length=None)
+
+        return [
+            Job(**record)
+            for record in records
+        ]
+
+    async def request_cancel(self, job_id: ObjectId):
+        record = await self.collection.find_one_and_update(
+            {
+                "_id": job_id,
+                "job_status": {"$in": [JobStatusEnum.QUEUED.value, JobStatusEnum.RUNNING.value]},
+            },
+            {"$set": {"job_cancel_requested": True, "job_updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if record:
+            return Job(**record)
+
+        return None
+
+    async def is_cancel_requested(self, job_id: ObjectId):
+        record = await self.collection.find_one(
+            {"_id": job_id}, {"job_cancel_requested": 1}
+        )
+        return bool(record and record.get("job_cancel_requested"))
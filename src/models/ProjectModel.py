@@ -2,6 +2,9 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemes import Project
 from .enums.DataBaseEnum import DataBaseEnum
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+from helper.ttl_cache import TTLCache
 
 class ProjectModel(BaseDataModel):
     
@@ -9,30 +12,23 @@ class ProjectModel(BaseDataModel):
         super().__init__(db_client)
         # initalise the model and points to the collection
         self.collection = self.db_client[DataBaseEnum.COLLECTION_PROJECT_NAME.value]
+        # every route resolves its project first, keep the recent ones in memory
+        self.project_cache = TTLCache(
+            max_size=self.app_settings.PROJECT_CACHE_SIZE,
+            ttl_seconds=self.app_settings.PROJECT_CACHE_TTL,
+        )
 
-    @classmethod
-    async def create_instance(cls, db_client: object):
-        """do the __init__ function and the init_collection function.
-        As we need to call the init__collection inside the __init__ but the first function is async
-        and the second can't be anysc
-        """
-        instance = cls(db_client)
-        await instance.init_collection()
-        return instance
-        
     async def init_collection(self):
-        """check if the collection exist, if not create it and create indecies
-            so basically the implementaion of the indecies"""
-        all_collections = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_PROJECT_NAME.value not in all_collections:
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_PROJECT_NAME.value]
-            indexes = Project.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"]
-                )
+        """create the indecies of the collection (mongo creates the collection with the first one).
+            create_index does nothing for an index that already exists, so this is safe to run
+            at every startup and existing databases get the indexes added later"""
+        indexes = Project.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"]
+            )
             
     async def creat_project(self, project: Project):
         
@@ -42,18 +38,62 @@ class ProjectModel(BaseDataModel):
         return project
     
     async def get_project_or_create_one(self, project_id: str):
+        project = self.project_cache.get(project_id)
+        if project is not None:
+            return project
+
+        # validate the id before it gets in the database
+        project = Project(project_id=project_id)
+
+        # one atomic upsert instead of find_one + insert_one, concurrent first
+        # requests for a new project all get the same record instead of a duplicate key error
+        record = await self.collection.find_one_and_update(
+            {"project_id": project_id},
+            {"$setOnInsert": project.model_dump(by_alias=True, exclude_unset=True)},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+
+        project = Project(**record) # turns the dict 
+        self.project_cache.set(project_id, project)
+
+        return project
+
+    async def get_project(self, project_id: str):
+        """like get_project_or_create_one without creating it"""
+        project = self.project_cache.get(project_id)
+        if project is not None:
+            return project
+
         record = await self.collection.find_one({
-            "project_id":project_id
+            "project_id": project_id
             })
 
         if record is None:
-            # create new project
-            project= Project(project_id=project_id)
-            project = await self.creat_project(project=project)
-        
-            return project
+            return None
+
+        project = Project(**record)
+        self.project_cache.set(project_id, project)
+
+        return project
+
+    async def delete_project(self, project_id: str):
+        result = await self.collection.delete_one({
+            "project_id": project_id
+            })
+        self.project_cache.invalidate(project_id)
+
+        return result.deleted_count
+    
+    async def get_project_by_id(self, project_id: ObjectId):
+        record = await self.collection.find_one({
+            "_id": project_id
+            })
+
+        if record is None:
+            return None
 
-        return Project(**record) # turns the dict 
+        return Project(**record)
     
     async def get_all_projects(self, page: int=1, page_size: int=10): 
         
@@ -0,0 +1,145 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import UploadSession
+from .enums.DataBaseEnum import DataBaseEnum
+from .enums.UploadEnums import UploadSessionStatusEnum
+from bson import ObjectId
+from pymongo import ReturnDocument
+from datetime import datetime
+
+class UploadSessionModel(BaseDataModel):
+    
+    def __init__(self, db_client: object):
+        super().__init__(db_client)
+        # initalise the model and points to the collection
+        self.collection = self.db_client[DataBaseEnum.COLLECTION_UPLOAD_SESSION_NAME.value]
+        
+    async def init_collection(self):
+        """create the indecies of the collection (mongo creates the collection with the first one).
+            create_index does nothing for an index that already exists, so this is safe to run
+            at every startup and existing databases get the indexes added later"""
+        indexes = UploadSession.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"]
+            )
+                
+    async def create_session(self, upload_session: UploadSession):
+        
+        result = await self.collection.insert_one(upload_session.model_dump(by_alias=True, exclude_unset=True))
+        upload_session.id = result.inserted_id
+        
+        return upload_session
+    
+    async def get_session_by_id(self, session_id: ObjectId):
+        record = await self.collection.find_one({
+            "_id": session_id
+        })
+        
+        if record:
+            return UploadSession(**record)
+        
+        return None
+
+    async def advance_offset(self, session_id: ObjectId, from_offset: int, to_offset: int):
+        """move the offset forward only if it's still at from_offset, a client resuming
+        from an outdated offset gets None and has to query the session again"""
+        record = await self.collection.find_one_and_update(
+            {
+                "_id": session_id,
+                "upload_status": UploadSessionStatusEnum.ACTIVE.value,
+                "upload_offset": from_offset,
+            },
+            {"$set": {
+                "upload_offset": to_offset,
+                "upload_updated_at": datetime.utcnow(),
+            }},
+            return_document=ReturnDocument.AFTER,
+        )
+        
+        if record:
+            return UploadSession(**record)
+        
+        return None
+
+    async def claim_session_for_finalize(self, session_id: ObjectId, stale_before: datetime):
+        """move an active session to finalizing, only one of concurrent finalize
+        requests gets the session, the others get None. A session left finalizing
+        since before stale_before (its worker stopped) can be claimed again"""
+        record = await self.collection.find_one_and_update(
+            {
+                "_id": session_id,
+                "$or": [
+                    {"upload_status": UploadSessionStatusEnum.ACTIVE.value},
+                    {
+                        "upload_status": UploadSessionStatusEnum.FINALIZING.value,
+                        "upload_updated_at": {"$lt": stale_before},
+                    },
+                ],
+            },
+            {"$set": {
+                "upload_status": UploadSessionStatusEnum.FINALIZING.value,
+                "upload_updated_at": datetime.utcnow(),
+            }},
+            return_document=ReturnDocument.AFTER,
+        )
+        
+        if record:
+            return UploadSession(**record)
+        
+        return None
+
+    async def release_session(self, session_id: ObjectId):
+        """back to active after a failed finalize, so it can be retried"""
+        await self.collection.update_one(
+            {
+                "_id": session_id,
+                "upload_status": UploadSessionStatusEnum.FINALIZING.value,
+            },
+            {"$set": {
+                "upload_status": UploadSessionStatusEnum.ACTIVE.value,
+                "upload_updated_at": datetime.utcnow(),
+            }}
+        )
+
+    async def release_stale_sessions(self, updated_before: datetime):
+        """back to active for the sessions left finalizing by a worker that stopped,
+        they are then finalized by a retry or expire like the other active sessions"""
+        result = await self.collection.update_many(
+            {
+                "upload_status": UploadSessionStatusEnum.FINALIZING.value,
+                "upload_updated_at": {"$lt": updated_before},
+            },
+            {"$set": {
+                "upload_status": UploadSessionStatusEnum.ACTIVE.value,
+            }}
+        )
+        
+        return result.modified_count
+
+    async def delete_expired_sessions(self, updated_before: datetime):
+        """remove the active sessions that got no range since updated_before and return them.
+        Each one is taken with find_one_and_delete, concurrent cleanups never get the same session
+        and a range still being written fails its advance_offset"""
+        expired_sessions = []
+        while True:
+            record = await self.collection.find_one_and_delete({
+                "upload_status": UploadSessionStatusEnum.ACTIVE.value,
+                "upload_updated_at": {"$lt": updated_before},
+            })
+            if record is None:
+                break
+            expired_sessions.append(UploadSession(**record))
+        
+        return expired_sessions
+
+    async def finalize_session(self, session_id: ObjectId, asset_id: ObjectId):
+        await self.collection.update_one(
+            {"_id": session_id},
+            {"$set": {
+                "upload_status": UploadSessionStatusEnum.FINALIZED.value,
+                "upload_asset_id": asset_id,
+                "upload_updated_at": datetime.utcnow(),
+            }}
+        )
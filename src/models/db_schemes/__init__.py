@@ -1,3 +1,5 @@
 from .project import Project
 from .data_chunk import DataChunk, RetrievedDocument
 from .asset import Asset
+from .job import Job
+from .upload_session import UploadSession
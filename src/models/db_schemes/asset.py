@@ -9,7 +9,9 @@ class Asset(BaseModel):
     asset_type: str = Field(..., min_length=1)
     asset_name: str = Field(..., min_length=1)
     asset_size: int = Field(ge=0, default=None)
+    asset_content_hash: Optional[str] = None # sha256 of the file, used to skip duplicate uploads
     asset_config: dict = Field(default=None)
+    asset_document_metadata: dict = Field(default=None) # loader metadata shared by all the chunks of the file
     asset_pushed_at: datetime = Field(default=datetime.utcnow())
     
     class Config:
@@ -33,6 +35,14 @@ class Asset(BaseModel):
                 ],
                 "name": "asset_project_id_name_index_1",
                 "unique": True # it always unique because its combination of file name an file id
+            },
+            {
+                "key": [
+                    ("asset_project_id", 1),
+                    ("asset_content_hash", 1)
+                ],
+                "name": "asset_project_id_content_hash_index_1",
+                "unique": False # forced re-uploads are allowed to share a hash
             }
             
         ] 
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional
 from bson.objectid import ObjectId
+from datetime import datetime
 
 class DataChunk(BaseModel):
     id: Optional[ObjectId] = Field(None, alias="_id")
@@ -9,22 +10,74 @@ class DataChunk(BaseModel):
     chunk_order: int = Field(..., gt=0)
     chunk_project_id: ObjectId
     chunk_asset_id: ObjectId
+    chunk_indexed_at: Optional[datetime] = None # set once the chunk is pushed to the vector db
 
     class Config:
         arbitrary_types_allowed = True
 
+    @classmethod
+    def build_records(cls, texts: list, metadatas: list, project_id: ObjectId, asset_id: ObjectId,
+                      start_order: int=1):
+        """raw mongo documents for ChunkModel.insert_many_chunk_records, without building a
+        model per chunk. The fields shared by the batch are validated once, the texts and
+        metadatas in one pass, with the same rules as the fields above"""
+        if not isinstance(project_id, ObjectId) or not isinstance(asset_id, ObjectId):
+            raise ValueError("chunk_project_id and chunk_asset_id must be ObjectIds")
+        if start_order <= 0:
+            raise ValueError("chunk_order must be greater than 0")
+        if len(texts) != len(metadatas):
+            raise ValueError("texts and metadatas must have the same length")
+        if not all(isinstance(text, str) and text for text in texts):
+            raise ValueError("chunk_text must be a non empty string")
+        if not all(isinstance(metadata, dict) for metadata in metadatas):
+            raise ValueError("chunk_metadata must be a dict")
+
+        return [
+            {
+                "chunk_text": text,
+                "chunk_metadata": metadata,
+                "chunk_order": start_order + idx,
+                "chunk_project_id": project_id,
+                "chunk_asset_id": asset_id,
+            }
+            for idx, (text, metadata) in enumerate(zip(texts, metadatas))
+        ]
+
     @classmethod  # static method 
     def get_indexes(cls):
         # definig the shape of the indecies
+        # the compound indexes starting with chunk_project_id also serve the queries on it alone
         return [
             {
                 "key": [
-                    ("chunk_project_id", 1) # 1 for ascending 
+                    ("chunk_project_id", 1),
+                    ("_id", 1) # used by the keyset pagination in ChunkModel.iter_project_chunks
+                ],
+                "name": "chunk_project_id_id_index_1",
+                "unique": False
+            },
+            {
+                "key": [
+                    ("chunk_project_id", 1),
+                    ("chunk_indexed_at", 1),
+                    ("_id", 1) # used to find the chunks not pushed yet during an incremental sync
+                ],
+                "name": "chunk_project_id_indexed_at_id_index_1",
+                "unique": False
+            },
+            {
+                "key": [
+                    ("chunk_asset_id", 1)
                 ],
-                "name": "chunk_project_id_index_1",
-                "unique": False # because of multiple chunks with the same project_id
+                "name": "chunk_asset_id_index_1",
+                "unique": False
             }
         ] 
+
+    @classmethod
+    def get_dropped_indexes(cls):
+        # names of the indexes older databases still have
+        return ["chunk_project_id_index_1"]
     
 # class RetrievedDocument(BaseModel):
 #     id: str = None
@@ -40,5 +93,6 @@ class DataChunk(BaseModel):
 #             "metadata": self.metadata
 #         }
 class RetrievedDocument(BaseModel):
-    text: str
+    text: Optional[str] = None # None until hydrated when the vector db keeps slim payloads
     score: float
+    id: Optional[str] = None # the vector db record id
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from bson.objectid import ObjectId
+from datetime import datetime
+
+class Job(BaseModel):
+    id: Optional[ObjectId] = Field(None, alias="_id")
+    job_type: str = Field(..., min_length=1)
+    job_project_id: ObjectId
+    job_params: dict = Field(default_factory=dict)
+    job_status: str = Field(..., min_length=1)
+    job_progress: dict = Field(default_factory=dict)
+    job_result: dict = Field(default=None)
+    job_error: str = Field(default=None)
+    job_cancel_requested: bool = False
+    job_worker_id: str = Field(default=None) # the worker process currently running the job
+    job_created_at: datetime = Field(default_factory=datetime.utcnow)
+    job_started_at: datetime = Field(default=None)
+    job_finished_at: datetime = Field(default=None)
+    job_updated_at: datetime = Field(default_factory=datetime.utcnow) # doubles as the heartbeat
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod  # static method 
+    def get_indexes(cls):
+        # definig the shape of the indecies
+        return [
+            {
+                "key": [
+                    ("job_status", 1),
+                    ("job_updated_at", 1) # used to find the jobs to resume at startup
+                ],
+                "name": "job_status_updated_at_index_1",
+                "unique": False
+            },
+            {
+                "key": [
+                    ("job_project_id", 1)
+                ],
+                "name": "job_project_id_index_1",
+                "unique": False
+            }
+        ]
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from bson.objectid import ObjectId
+from datetime import datetime
+
+class UploadSession(BaseModel):
+    id: Optional[ObjectId] = Field(None, alias="_id")
+    upload_project_id: ObjectId
+    upload_file_name: str = Field(..., min_length=1) # the name the file is stored under
+    upload_content_type: str = Field(..., min_length=1)
+    upload_total_size: int = Field(ge=0)
+    upload_offset: int = Field(ge=0, default=0) # bytes received so far, always contiguous
+    upload_status: str = Field(..., min_length=1)
+    upload_asset_id: ObjectId = Field(default=None) # set once finalized
+    upload_created_at: datetime = Field(default_factory=datetime.utcnow)
+    upload_updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod  # static method 
+    def get_indexes(cls):
+        # definig the shape of the indecies
+        return [
+            {
+                "key": [
+                    ("upload_project_id", 1)
+                ],
+                "name": "upload_project_id_index_1",
+                "unique": False
+            },
+            {
+                "key": [
+                    ("upload_status", 1),
+                    ("upload_updated_at", 1) # to find the abandoned sessions
+                ],
+                "name": "upload_status_updated_at_index_1",
+                "unique": False
+            }
+        ]
@@ -3,4 +3,9 @@ from enum import Enum
 class ProcessingEnum(Enum):
     
     TXT = ".txt"
-    PDF = ".pdf"
\ No newline at end of file
+    PDF = ".pdf"
+
+class TextSplitterEnum(Enum):
+    
+    LANGCHAIN = "langchain"
+    NATIVE = "native"
@@ -7,11 +7,23 @@ class ResponseSignal(Enum):
     FILE_SIZE_EXCEEDED = "file_size_exceeded"
     FILE_UPLOAD_SUCESS = "file_upload_success"
     FILE_UPLOAD_FAILED  = "file_upload_failed"
+    FILE_ALREADY_EXISTS = "file_already_exists"
+    FILE_BATCH_UPLOAD_DONE = "file_batch_upload_done"
+    UPLOAD_SESSION_CREATED = "upload_session_created"
+    UPLOAD_SESSION_NOT_FOUND = "upload_session_not_found"
+    UPLOAD_SESSION_RETRIEVED = "upload_session_retrieved"
+    UPLOAD_SESSION_FINALIZED = "upload_session_finalized"
+    UPLOAD_RANGE_ACCEPTED = "upload_range_accepted"
+    UPLOAD_RANGE_INVALID = "upload_range_invalid"
+    UPLOAD_OFFSET_MISMATCH = "upload_offset_mismatch"
+    UPLOAD_INCOMPLETE = "upload_incomplete"
+    UPLOAD_SESSION_FINALIZING = "upload_session_finalizing"
     PROCESSING_SUCCESS = "processing_success"
     PROCESSING_FAILED = "processing_failed"
     NO_FILE_ERROR = "no_files_found"
     FILE_ID_ERROR = "no_file_found_with_this_id"
     PROJECT_NOT_FOUND_ERROR = "project_not_found"
+    PROJECT_DELETED = "project_deleted"
     INSERT_INTO_VECTORDB_ERROR = "insert_into_vectordb_error"
     INSERT_INTO_VECTORDB_SUCCESS = "insert_into_vectordb_success"
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved"
@@ -19,4 +31,10 @@ class ResponseSignal(Enum):
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success"
     RAG_ANSWER_ERROR = "rag_answer_error"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
+    JOB_QUEUED = "job_queued"
+    JOB_NOT_FOUND = "job_not_found"
+    JOB_RETRIEVED = "job_retrieved"
+    JOB_CANCEL_REQUESTED = "job_cancel_requested"
+    JOB_ALREADY_FINISHED = "job_already_finished"
+    TEXT_SPLITTER_NOT_SUPPORTED = "text_splitter_not_supported"
     
\ No newline at end of file
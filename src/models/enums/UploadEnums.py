@@ -0,0 +1,7 @@
+from enum import Enum
+
+class UploadSessionStatusEnum(Enum):
+    
+    ACTIVE = "active"
+    FINALIZING = "finalizing"
+    FINALIZED = "finalized"
@@ -1,7 +1,15 @@
-from fastapi import FastAPI, APIRouter, Depends, Request
+from fastapi import FastAPI, APIRouter, Depends, Request, status
+from fastapi.responses import JSONResponse
 import os
+import shutil
+import asyncio
+import logging
 from helper.config import get_settings, Settings
-from models.ProjectModel import ProjectModel
+from controllers import NLPController, ProjectController
+from models import ResponseSignal
+
+logger = logging.getLogger('uvicorn.error')
+
 base_router = APIRouter(
     prefix="/api/v1", #prefix before all routes
     tags=["api_v1"],
@@ -20,9 +28,7 @@ async def welcome(app_settings: Settings = Depends(get_settings)): # use async f
 
 @base_router.get("/projects")
 async def list_projects(request: Request):
-    project_model = await ProjectModel().create_instance(
-        db_client=request.app.db_client
-    )
+    project_model = request.app.project_model
     
     projects, _ = await project_model.get_all_projects(page=1, page_size=100)
     
@@ -31,4 +37,46 @@ async def list_projects(request: Request):
             {"project_id": project.project_id}
             for project in projects
         ]
-    }
\ No newline at end of file
+    }
+
+@base_router.delete("/projects/{project_id}")
+async def delete_project(request: Request, project_id: str):
+    """remove the project with its chunks, assets, files and vector collection"""
+    project_model = request.app.project_model
+
+    project = await project_model.get_project(project_id=project_id)
+    if project is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value,
+            }
+        )
+
+    deleted_chunks = await request.app.chunk_model.delete_chunks_by_projects_id(project_id=project.id)
+    deleted_assets = await request.app.asset_model.delete_assets_by_project_id(asset_project_id=project.id)
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+    try:
+        await nlp_controller.reset_vector_db_collection(project=project)
+    except Exception as e:
+        logger.error(f"Error while deleting the vector collection of {project_id}: {e}")
+
+    project_dir = ProjectController().get_project_path(project_id=project_id)
+    await asyncio.to_thread(shutil.rmtree, project_dir, True)
+
+    # drops the cached project too, the next request for it starts from scratch
+    await project_model.delete_project(project_id=project_id)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.PROJECT_DELETED.value,
+            "deleted_chunks": deleted_chunks,
+            "deleted_assets": deleted_assets,
+        }
+    )
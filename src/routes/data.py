@@ -1,18 +1,26 @@
 # pylint: disable=missing-module-docstring
 from fastapi import FastAPI, APIRouter, Depends, UploadFile, status, Request
 from fastapi.responses import JSONResponse
+from starlette.requests import ClientDisconnect
+from bson.objectid import ObjectId
 import os
+import asyncio
+from datetime import datetime, timedelta
+import hashlib
+from typing import List
 from helper.config import get_settings, Settings
-from controllers import DataController, ProjectController, ProcessController
+from controllers import DataController, ProjectController
 import aiofiles 
 from models import ResponseSignal
 import logging
-from .schemes.data import ProcessRequest
-from models.ProjectModel import ProjectModel
-from models.ChunkModel import ChunkModel
+from .schemes.data import ProcessRequest, UploadSessionRequest
 from models.AssetModel import AssetModel
-from models.db_schemes import DataChunk, Asset
+from models.UploadSessionModel import UploadSessionModel
+from models.db_schemes import Asset, UploadSession
 from models.enums.AssetTypeEnum import AssetTypeEnum
+from models.enums.JobEnums import JobTypeEnum
+from models.enums.ProcessingEnum import TextSplitterEnum
+from models.enums.UploadEnums import UploadSessionStatusEnum
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -21,13 +29,42 @@ data_router = APIRouter(
     tags=["api_v1", "data"]
 ) 
 
+async def store_file_asset(asset_model: AssetModel, project, file_path: str, file_id: str,
+                           content_hash: str, force: int=0, keep_file_on_error: bool=False):
+    """create the asset of an uploaded file. If the project already has the same content
+    the new copy is removed and the existing asset is returned, unless force is set.
+    The file is removed too when the asset can't be stored, unless keep_file_on_error is set"""
+    asset_resource = Asset(
+        asset_project_id=project.id,
+        asset_type=AssetTypeEnum.FILE.value,
+        asset_name=file_id,
+        asset_size=os.path.getsize(file_path),
+        asset_content_hash=content_hash,
+    )    
+    
+    try:
+        if force:
+            asset_record = await asset_model.create_asset(asset=asset_resource)
+            return asset_record, False
+        
+        # the lookup and the insert are one upsert, concurrent identical uploads get one asset
+        asset_record, created = await asset_model.get_or_create_asset_by_content_hash(asset=asset_resource)
+    except Exception:
+        if not keep_file_on_error and os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    
+    if not created:
+        os.remove(file_path)
+    
+    return asset_record, not created
+
 @data_router.post("/upload/{project_id}")
 async def upload_data(request: Request, project_id: str, file: UploadFile,
+                    force: int = 0, # acts as bool, upload even if the same content exists
                     app_settings: Settings = Depends(get_settings)):
     
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client 
-    )
+    project_model = request.app.project_model
     
     project = await project_model.get_project_or_create_one(
         project_id=project_id
@@ -52,10 +89,13 @@ async def upload_data(request: Request, project_id: str, file: UploadFile,
         orig_file_name=file.filename,
         project_id=project_id)
     
+    # hash while writing, the file is read only once
     try: 
-        async with aiofiles.open(file_path, "wb") as f: # wb -> writing for binary aka writing
-            while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
-                await f.write(chunk)
+        content_hash = await save_upload_file(
+            file=file,
+            file_path=file_path,
+            chunk_size=app_settings.FILE_DEFAULT_CHUNK_SIZE,
+        )
     except Exception as e:
         # for safety save the error to a log 
         logger.error(f"Error while uploading file {e}")
@@ -68,18 +108,35 @@ async def upload_data(request: Request, project_id: str, file: UploadFile,
         )
         
     # store assets in the database
-    asset_model = await AssetModel.create_instance(
-        db_client=request.app.db_client
+    asset_model = request.app.asset_model
+    
+    try:
+        asset_record, is_duplicate = await store_file_asset(
+            asset_model=asset_model,
+            project=project,
+            file_path=file_path,
+            file_id=file_id,
+            content_hash=content_hash,
+            force=force,
         )
+    except Exception as e:
+        logger.error(f"Error while storing the asset of {file.filename}: {e}")
         
-    asset_resource = Asset(
-        asset_project_id=project.id,
-        asset_type=AssetTypeEnum.FILE.value,
-        asset_name=file_id,
-        asset_size=os.path.getsize(file_path),
-    )    
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal":ResponseSignal.FILE_UPLOAD_FAILED.value, 
+            }
+        )
     
-    asset_record = await asset_model.create_asset(asset=asset_resource)
+    # same content already uploaded, don't create duplicate chunks and vectors
+    if is_duplicate:
+        return JSONResponse(
+            content={
+                "signal": ResponseSignal.FILE_ALREADY_EXISTS.value,
+                "file_id": str(asset_record.id),
+            }
+        )
         
     return JSONResponse(
             content={
@@ -94,24 +151,484 @@ async def upload_data(request: Request, project_id: str, file: UploadFile,
     #     "asset_id": str(asset_record.id)  # Still include ObjectID if needed
     # })
 
+async def save_upload_file(file: UploadFile, file_path: str, chunk_size: int):
+    """write the upload to file_path and return its sha256, computed while writing"""
+    content_hash = hashlib.sha256()
+    async with aiofiles.open(file_path, "wb") as f: # wb -> writing for binary aka writing
+        while chunk := await file.read(chunk_size):
+            content_hash.update(chunk)
+            await f.write(chunk)
+    
+    return content_hash.hexdigest()
+
+@data_router.post("/upload/{project_id}/batch")
+async def upload_data_batch(request: Request, project_id: str, files: List[UploadFile],
+                    force: int = 0, # acts as bool, upload even if the same content exists
+                    app_settings: Settings = Depends(get_settings)):
+    """upload many files in one request, they are written concurrently and their assets
+    inserted at once. Every file gets its own result, one bad file doesn't fail the others"""
+    
+    project_model = request.app.project_model
+    
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+    
+    data_controller = DataController()
+    results = [
+        {"file_name": file.filename}
+        for file in files
+    ]
+    
+    # validate and reserve a path for every file before writing any of them
+    pending = []
+    reserved_file_ids = set()
+    for idx, file in enumerate(files):
+        is_valid, result_signal = data_controller.validate_uploaded_file(file=file)
+        if not is_valid:
+            results[idx]["signal"] = result_signal
+            continue
+        
+        file_path, file_id = data_controller.generate_unique_filepath(
+            orig_file_name=file.filename,
+            project_id=project_id)
+        while file_id in reserved_file_ids:
+            file_path, file_id = data_controller.generate_unique_filepath(
+                orig_file_name=file.filename,
+                project_id=project_id)
+        reserved_file_ids.add(file_id)
+        
+        pending.append((idx, file, file_path, file_id))
+    
+    semaphore = asyncio.Semaphore(app_settings.FILE_BATCH_UPLOAD_CONCURRENCY)
+    
+    async def write_file(file: UploadFile, file_path: str):
+        async with semaphore:
+            return await save_upload_file(
+                file=file,
+                file_path=file_path,
+                chunk_size=app_settings.FILE_DEFAULT_CHUNK_SIZE,
+            )
+    
+    content_hashes = await asyncio.gather(*[
+        write_file(file=file, file_path=file_path)
+        for _, file, file_path, _ in pending
+    ], return_exceptions=True)
+    
+    asset_model = request.app.asset_model
+    
+    # one query for the duplicates already in the project
+    existing_assets = {}
+    if not force:
+        existing_assets = await asset_model.get_assets_by_content_hashes(
+            asset_project_id=project.id,
+            content_hashes=[
+                content_hash
+                for content_hash in content_hashes
+                if isinstance(content_hash, str)
+            ],
+        )
+    
+    new_assets = []
+    new_assets_idx = []
+    batch_assets = {}
+    for (idx, file, file_path, file_id), content_hash in zip(pending, content_hashes):
+        if isinstance(content_hash, Exception):
+            logger.error(f"Error while uploading file {file.filename}: {content_hash}")
+            results[idx]["signal"] = ResponseSignal.FILE_UPLOAD_FAILED.value
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            continue
+        
+        # same content in the project, or twice in this batch
+        duplicate_of = existing_assets.get(content_hash) or (None if force else batch_assets.get(content_hash))
+        if duplicate_of is not None:
+            os.remove(file_path)
+            results[idx]["signal"] = ResponseSignal.FILE_ALREADY_EXISTS.value
+            results[idx]["duplicate_of"] = duplicate_of
+            continue
+        
+        asset_resource = Asset(
+            asset_project_id=project.id,
+            asset_type=AssetTypeEnum.FILE.value,
+            asset_name=file_id,
+            asset_size=os.path.getsize(file_path),
+            asset_content_hash=content_hash,
+        )
+        batch_assets[content_hash] = asset_resource
+        new_assets.append(asset_resource)
+        new_assets_idx.append(idx)
+    
+    new_assets = await asset_model.create_assets(assets=new_assets)
+    for idx, asset_record in zip(new_assets_idx, new_assets):
+        results[idx]["signal"] = ResponseSignal.FILE_UPLOAD_SUCESS.value
+        results[idx]["file_id"] = str(asset_record.id)
+    
+    # the duplicates inside the batch only got their asset id now
+    for result in results:
+        if "duplicate_of" in result:
+            result["file_id"] = str(result.pop("duplicate_of").id)
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.FILE_BATCH_UPLOAD_DONE.value,
+            "uploaded_count": len(new_assets),
+            "results": results,
+        }
+    )
+
+async def get_upload_session_by_id(upload_session_model: UploadSessionModel, session_id: str):
+    if not ObjectId.is_valid(session_id):
+        return None
+    return await upload_session_model.get_session_by_id(session_id=ObjectId(session_id))
+
+def serialize_upload_session(upload_session: UploadSession):
+    return {
+        "session_id": str(upload_session.id),
+        "status": upload_session.upload_status,
+        "offset": upload_session.upload_offset,
+        "total_size": upload_session.upload_total_size,
+        "file_id": str(upload_session.upload_asset_id) if upload_session.upload_asset_id else None,
+    }
+
+@data_router.post("/upload/{project_id}/sessions")
+async def create_upload_session(request: Request, project_id: str, session_request: UploadSessionRequest):
+    """start a resumable upload, the bytes are then sent with PUT /upload/sessions/{session_id}"""
+    
+    project_model = request.app.project_model
+    
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+    
+    upload_session_model = request.app.upload_session_model
+    
+    # the declared size is checked before any byte is received
+    data_controller = DataController()
+    is_valid, result_signal = data_controller.validate_upload_session(
+        content_type=session_request.content_type,
+        total_size=session_request.total_size,
+    )
+    
+    if not is_valid:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": result_signal,
+            }
+        )
+    
+    file_path, file_id = data_controller.generate_unique_filepath(
+        orig_file_name=session_request.file_name,
+        project_id=project_id)
+    
+    # the ranges are written in place, so the final file exists from the start
+    try:
+        async with aiofiles.open(file_path, "wb") as f:
+            await f.truncate(session_request.total_size)
+    except Exception as e:
+        logger.error(f"Error while creating the upload file {e}")
+        
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.FILE_UPLOAD_FAILED.value,
+            }
+        )
+    
+    # the abandoned sessions are swept as new ones start, so their files don't pile up
+    _ = await data_controller.remove_expired_upload_sessions(
+        upload_session_model=upload_session_model,
+        project_model=project_model,
+    )
+    
+    now = datetime.utcnow()
+    upload_session = await upload_session_model.create_session(
+        upload_session=UploadSession(
+            upload_project_id=project.id,
+            upload_file_name=file_id,
+            upload_content_type=session_request.content_type,
+            upload_total_size=session_request.total_size,
+            upload_offset=0,
+            upload_status=UploadSessionStatusEnum.ACTIVE.value,
+            upload_created_at=now,
+            upload_updated_at=now,
+        )
+    )
+    
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={
+            "signal": ResponseSignal.UPLOAD_SESSION_CREATED.value,
+            "chunk_size": get_settings().FILE_DEFAULT_CHUNK_SIZE,
+            **serialize_upload_session(upload_session),
+        }
+    )
+
+@data_router.get("/upload/sessions/{session_id}")
+async def get_upload_session(request: Request, session_id: str):
+    """the offset to resume from after a dropped connection"""
+    
+    upload_session_model = request.app.upload_session_model
+    
+    upload_session = await get_upload_session_by_id(upload_session_model, session_id)
+    if upload_session is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.UPLOAD_SESSION_NOT_FOUND.value,
+            }
+        )
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.UPLOAD_SESSION_RETRIEVED.value,
+            **serialize_upload_session(upload_session),
+        }
+    )
+
+@data_router.put("/upload/sessions/{session_id}")
+async def upload_session_range(request: Request, session_id: str):
+    """write the body at the position given by the 'Content-Range: bytes start-end/total' header.
+    The range has to start at the session offset and can't go past the declared size"""
+    
+    upload_session_model = request.app.upload_session_model
+    
+    upload_session = await get_upload_session_by_id(upload_session_model, session_id)
+    if upload_session is None or upload_session.upload_status != UploadSessionStatusEnum.ACTIVE.value:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.UPLOAD_SESSION_NOT_FOUND.value,
+            }
+        )
+    
+    data_controller = DataController()
+    byte_range = data_controller.parse_content_range(
+        content_range=request.headers.get("content-range"),
+        total_size=upload_session.upload_total_size,
+    )
+    
+    if byte_range is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.UPLOAD_RANGE_INVALID.value,
+                **serialize_upload_session(upload_session),
+            }
+        )
+    
+    start, end = byte_range
+    if start != upload_session.upload_offset:
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={
+                "signal": ResponseSignal.UPLOAD_OFFSET_MISMATCH.value,
+                **serialize_upload_session(upload_session),
+            }
+        )
+    
+    project_model = request.app.project_model
+    project = await project_model.get_project_by_id(project_id=upload_session.upload_project_id)
+    if project is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value,
+            }
+        )
+    
+    file_path = os.path.join(
+        ProjectController().get_project_path(project_id=project.project_id),
+        upload_session.upload_file_name
+    )
+    
+    # stream the body straight into its place in the final file. The size is enforced
+    # here, a body longer than its range is cut and the rest is never read
+    written = 0
+    range_exceeded = False
+    try:
+        async with aiofiles.open(file_path, "r+b") as f:
+            await f.seek(start)
+            async for chunk in request.stream():
+                if start + written + len(chunk) > end:
+                    chunk = chunk[:end - start - written]
+                    range_exceeded = True
+                
+                await f.write(chunk)
+                written += len(chunk)
+                
+                if range_exceeded:
+                    break
+    except ClientDisconnect:
+        # keep what arrived, the client resumes from the new offset
+        logger.warning(f"Upload session {session_id} disconnected after {written} bytes")
+    except Exception as e:
+        logger.error(f"Error while writing the upload range {e}")
+    
+    if written:
+        updated_session = await upload_session_model.advance_offset(
+            session_id=upload_session.id,
+            from_offset=start,
+            to_offset=start + written,
+        )
+        
+        if updated_session is None:
+            return JSONResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                content={
+                    "signal": ResponseSignal.UPLOAD_OFFSET_MISMATCH.value,
+                    **serialize_upload_session(
+                        await upload_session_model.get_session_by_id(session_id=upload_session.id)
+                    ),
+                }
+            )
+        upload_session = updated_session
+    
+    if range_exceeded:
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={
+                "signal": ResponseSignal.FILE_SIZE_EXCEEDED.value,
+                **serialize_upload_session(upload_session),
+            }
+        )
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.UPLOAD_RANGE_ACCEPTED.value,
+            **serialize_upload_session(upload_session),
+        }
+    )
+
+@data_router.post("/upload/sessions/{session_id}/finalize")
+async def finalize_upload_session(request: Request, session_id: str, force: int = 0):
+    """turn a complete upload into an asset, same deduplication as /upload/{project_id}"""
+    
+    upload_session_model = request.app.upload_session_model
+    
+    upload_session = await get_upload_session_by_id(upload_session_model, session_id)
+    if upload_session is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.UPLOAD_SESSION_NOT_FOUND.value,
+            }
+        )
+    
+    # finalizing twice returns the same asset
+    if upload_session.upload_status == UploadSessionStatusEnum.FINALIZED.value:
+        return JSONResponse(
+            content={
+                "signal": ResponseSignal.UPLOAD_SESSION_FINALIZED.value,
+                **serialize_upload_session(upload_session),
+            }
+        )
+    
+    if upload_session.upload_offset != upload_session.upload_total_size:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.UPLOAD_INCOMPLETE.value,
+                **serialize_upload_session(upload_session),
+            }
+        )
+    
+    project_model = request.app.project_model
+    project = await project_model.get_project_by_id(project_id=upload_session.upload_project_id)
+    if project is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value,
+            }
+        )
+    
+    # only one of concurrent finalize requests creates the asset, the dedup of a second
+    # one would remove the file the first asset points to
+    upload_session = await upload_session_model.claim_session_for_finalize(
+        session_id=upload_session.id,
+        stale_before=datetime.utcnow() - timedelta(seconds=get_settings().UPLOAD_SESSION_FINALIZE_TIMEOUT),
+    )
+    if upload_session is None:
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={
+                "signal": ResponseSignal.UPLOAD_SESSION_FINALIZING.value,
+            }
+        )
+    
+    file_path = os.path.join(
+        ProjectController().get_project_path(project_id=project.project_id),
+        upload_session.upload_file_name
+    )
+    
+    # any exit that didn't finalize (error, cancelled request) makes the session active again
+    finalized = False
+    try:
+        # the ranges came in separate requests, hash the assembled file once
+        content_hash = await asyncio.to_thread(DataController().get_file_hash, file_path)
+        
+        asset_model = request.app.asset_model
+        
+        asset_record, is_duplicate = await store_file_asset(
+            asset_model=asset_model,
+            project=project,
+            file_path=file_path,
+            file_id=upload_session.upload_file_name,
+            content_hash=content_hash,
+            force=force,
+            keep_file_on_error=True, # the session is released and can be finalized again
+        )
+        
+        await upload_session_model.finalize_session(
+            session_id=upload_session.id,
+            asset_id=asset_record.id,
+        )
+        finalized = True
+    except Exception as e:
+        logger.error(f"Error while finalizing the upload session {session_id}: {e}")
+        
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.FILE_UPLOAD_FAILED.value,
+            }
+        )
+    finally:
+        if not finalized:
+            await asyncio.shield(upload_session_model.release_session(session_id=upload_session.id))
+    
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.FILE_ALREADY_EXISTS.value if is_duplicate else ResponseSignal.FILE_UPLOAD_SUCESS.value,
+            "file_id": str(asset_record.id),
+        }
+    )
+
 @data_router.post("/process/{project_id}")
 async def process_endpoint(request: Request, project_id: str, process_request: ProcessRequest):
     
     chunk_size = process_request.chunk_size
     overlap_size = process_request.overlap_size
     do_reset = process_request.do_reset
+    splitter = process_request.splitter or get_settings().TEXT_SPLITTER
+
+    if splitter not in [e.value for e in TextSplitterEnum]:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.TEXT_SPLITTER_NOT_SUPPORTED.value,
+            }
+        )
     
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
-    )
+    project_model = request.app.project_model
     
     project = await project_model.get_project_or_create_one(
         project_id=project_id
     )
     
-    asset_model = await AssetModel.create_instance(
-        db_client=request.app.db_client
-    )
+    asset_model = request.app.asset_model
         
     # in case we have one file or more
     project_files_ids = {}
@@ -156,67 +673,24 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
             }
         ) 
     
-    process_controller = ProcessController(project_id=project_id)
-    
-    no_records = 0
-    no_files = 0
-    
-    chunk_model = await ChunkModel.create_instance(
-            db_client=request.app.db_client
-        )
-        
-    if do_reset == 1:
-            _ = await chunk_model.delete_chunks_by_projects_id(
-                project_id=project.id
-            )
-
-    for asset_id, file_id in project_files_ids.items():
-        
-        file_content = process_controller.get_file_content(file_id=file_id)
-        
-        if file_content is None:
-            logger.error(f"Error while processing file: {file_id}")
-            continue  # Skip this file but continue with others
-        
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
-            file_id=file_id,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size
-            )
-        
-        if file_chunks is None or len(file_chunks) == 0:
-            logger.error(f"No chunks generated for file: {file_id}")
-            continue  # Skip this file but continue with others instead of returning error
-        
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i+1,
-                chunk_project_id=project.id,
-                chunk_asset_id=asset_id
-            )
-            for i, chunk in enumerate(file_chunks)
-        ]
-        
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
-        no_files += 1
-
-    # At the end, check if we processed anything
-    if no_files == 0:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={
-                "signal":ResponseSignal.PROCESSING_FAILED.value,
-                "message": "Failed to process any files"
-            }
-        )
+    # parsing and chunking run in a background job, poll GET /api/v1/jobs/{job_id}
+    job = await request.app.job_controller.enqueue(
+        job_type=JobTypeEnum.PROCESS.value,
+        project_id=project.id,
+        params={
+            "file_id": process_request.file_id,
+            "chunk_size": chunk_size,
+            "overlap_size": overlap_size,
+            "do_reset": do_reset,
+            "splitter": splitter,
+        },
+    )
 
     return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
         content={
-            "signal": ResponseSignal.PROCESSING_SUCCESS.value,
-            "inserted_chunks": no_records,
-            "processed_files": no_files
+            "signal": ResponseSignal.JOB_QUEUED.value,
+            "job_id": str(job.id),
+            "files_count": len(project_files_ids),
         }
-    )
\ No newline at end of file
+    )
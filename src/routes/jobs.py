@@ -0,0 +1,89 @@
+from fastapi import APIRouter, status, Request
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from bson.objectid import ObjectId
+from models.enums.ResponseEnums import ResponseSignal
+import logging
+
+logger = logging.getLogger('uvicorn.error')
+
+jobs_router = APIRouter(
+    prefix="/api/v1/jobs",
+    tags=["api_v1", "jobs"],
+)
+
+def serialize_job(job):
+    return jsonable_encoder({
+        "job_id": str(job.id),
+        "job_type": job.job_type,
+        "project_id": str(job.job_project_id),
+        "status": job.job_status,
+        "params": job.job_params,
+        # the completed assets list is only needed to resume the job
+        "progress": {
+            key: value
+            for key, value in job.job_progress.items()
+            if key != "completed_asset_ids"
+        },
+        "result": job.job_result,
+        "error": job.job_error,
+        "cancel_requested": job.job_cancel_requested,
+        "created_at": job.job_created_at,
+        "started_at": job.job_started_at,
+        "finished_at": job.job_finished_at,
+        "updated_at": job.job_updated_at,
+    })
+
+@jobs_router.get("/{job_id}")
+async def get_job(request: Request, job_id: str):
+
+    job_model = request.app.job_model
+
+    job = None
+    if ObjectId.is_valid(job_id):
+        job = await job_model.get_job_by_id(job_id=ObjectId(job_id))
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_RETRIEVED.value,
+            "job": serialize_job(job),
+        }
+    )
+
+@jobs_router.post("/{job_id}/cancel")
+async def cancel_job(request: Request, job_id: str):
+
+    job_model = request.app.job_model
+
+    if not ObjectId.is_valid(job_id) or await job_model.get_job_by_id(job_id=ObjectId(job_id)) is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND.value
+            }
+        )
+
+    job = await request.app.job_controller.cancel(job_id=ObjectId(job_id))
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.JOB_ALREADY_FINISHED.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_CANCEL_REQUESTED.value,
+            "job_id": job_id,
+        }
+    )
@@ -1,10 +1,9 @@
 from fastapi import FastAPI, APIRouter, status, Request
 from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
-from models.ProjectModel import ProjectModel
-from models.ChunkModel import ChunkModel
+from routes.schemes.nlp import PushRequest, SearchRequest, SearchBatchRequest
 from controllers import NLPController
 from models.enums.ResponseEnums import ResponseSignal
+from models.enums.JobEnums import JobTypeEnum
 import logging
 
 logger = logging.getLogger('uvicorn.error')
@@ -17,14 +16,8 @@ nlp_router = APIRouter(
 @nlp_router.post("/index/push/{project_id}")
 async def index_project(request: Request, project_id: str, push_request: PushRequest):
 
-    project_model = await ProjectModel.create_instance(
-        db_client = request.app.db_client
-    )
+    project_model = request.app.project_model
 
-    chunk_model = await ChunkModel.create_instance(
-        db_client = request.app.db_client
-    )
-    
     project = await project_model.get_project_or_create_one(
         project_id=project_id
     )
@@ -37,52 +30,21 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
             }
         )
 
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
+    # the push runs in a background job, poll GET /api/v1/jobs/{job_id}
+    job = await request.app.job_controller.enqueue(
+        job_type=JobTypeEnum.INDEX_PUSH.value,
+        project_id=project.id,
+        params={
+            "do_reset": push_request.do_reset,
+            "do_sync": push_request.do_sync,
+        },
     )
 
-    has_records = True
-    page_no =1
-    inserted_items_count=0
-    idx = 0
-    while has_records:
-        page_chunks = await chunk_model.get_project_chunks(project_id=project.id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
-        else:
-            has_records = False
-            break
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
-        
-        chunks_ids =  list(range(idx, idx + len(page_chunks)))
-        idx += len(page_chunks)
-        
-        is_inserted = nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            do_reset=push_request.do_reset,
-            chunks_ids=chunks_ids
-            )
-        
-        if not is_inserted:
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={
-                        "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                    }
-                )
-        
-        inserted_items_count += len(page_chunks)
-    
     return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
         content={
-            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count
+            "signal": ResponseSignal.JOB_QUEUED.value,
+            "job_id": str(job.id),
         }
     )
     # chunks = chunk_model.get_project_chunks(project_id=project.id)
@@ -91,9 +53,7 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
 @nlp_router.post("/index/info/{project_id}")
 async def get_project_index_info(request: Request, project_id: str):
     
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
-    )
+    project_model = request.app.project_model
 
     project = await project_model.get_project_or_create_one(
         project_id=project_id
@@ -103,24 +63,24 @@ async def get_project_index_info(request: Request, project_id: str):
         vectordb_client=request.app.vectordb_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
+        template_parser=request.app.template_parser,
+        embedding_cache=request.app.embedding_cache,
     )
 
-    collection_info = nlp_controller.get_vector_db_collection_info(project=project)
+    collection_info = await nlp_controller.get_vector_db_collection_info(project=project)
 
     return JSONResponse(
         content={
             "signal": ResponseSignal.VECTORDB_COLLECTION_RETRIEVED.value,
-            "collection_info": collection_info
+            "collection_info": collection_info,
+            "embedding_cache": await nlp_controller.get_embedding_cache_stats(),
         }
     )
     
 @nlp_router.post("/index/search/{project_id}")
 async def search_index(request: Request, project_id: str, search_request: SearchRequest):
     
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
-    )
+    project_model = request.app.project_model
 
     project = await project_model.get_project_or_create_one(
         project_id=project_id
@@ -130,11 +90,13 @@ async def search_index(request: Request, project_id: str, search_request: Search
         vectordb_client=request.app.vectordb_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
+        template_parser=request.app.template_parser,
+        chunk_model=request.app.chunk_model,
     )
 
-    results = nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+    results = await nlp_controller.search_vector_db_collection(
+        project=project, text=search_request.text, limit=search_request.limit,
+        oversampling=search_request.oversampling, rescore=search_request.rescore,
     )
 
     if not results:
@@ -152,12 +114,55 @@ async def search_index(request: Request, project_id: str, search_request: Search
         }
     )
     
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(request: Request, project_id: str, search_request: SearchBatchRequest):
+
+    project_model = request.app.project_model
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        chunk_model=request.app.chunk_model,
+    )
+
+    batch_results = None
+    if search_request.texts:
+        batch_results = await nlp_controller.search_vector_db_collection_batch(
+            project=project, texts=search_request.texts, limit=search_request.limit,
+            oversampling=search_request.oversampling, rescore=search_request.rescore,
+        )
+
+    if not batch_results:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+                }
+            )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                {
+                    "text": text,
+                    "results": [ result.dict() for result in results ],
+                }
+                for text, results in zip(search_request.texts, batch_results)
+            ]
+        }
+    )
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: str, search_request: SearchRequest):
     
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
-    )
+    project_model = request.app.project_model
 
     project = await project_model.get_project_or_create_one(
         project_id=project_id
@@ -170,9 +175,10 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        chunk_model=request.app.chunk_model,
     )
 
-    answer, full_prompt, chat_history = nlp_controller.answer_rag_question(
+    answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
         limit=search_request.limit,
@@ -1,8 +1,14 @@
 from pydantic import BaseModel
 from typing import Optional
 
+class UploadSessionRequest(BaseModel):
+    file_name: str
+    content_type: str
+    total_size: int # bytes
+
 class ProcessRequest(BaseModel):
     file_id : str =None 
     chunk_size: Optional[int] = 100
     overlap_size : Optional[int] = 20
     do_reset: Optional[int] = 0 # acts as bool true or false
+    splitter: Optional[str] = None # langchain or native, defaults to TEXT_SPLITTER
@@ -1,9 +1,19 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    do_sync: Optional[int] = 0 # only push the new chunks and drop the deleted ones
 
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    # quantized collections only, None uses the VECTOR_DB_SEARCH_* settings
+    oversampling: Optional[float] = None
+    rescore: Optional[bool] = None
+
+class SearchBatchRequest(BaseModel):
+    texts: List[str] = Field(..., max_length=256) # embedded in one call, keep it well under the provider limits
+    limit: Optional[int] = 5
+    oversampling: Optional[float] = None
+    rescore: Optional[bool] = None
@@ -0,0 +1,212 @@
+import os
+import time
+import sqlite3
+import hashlib
+import asyncio
+import logging
+import threading
+from array import array
+from typing import List, Optional
+
+class EmbeddingCache:
+    """
+    A persistent content-addressed cache for embedding vectors backed by SQLite.
+    Vectors are stored as packed float32 blobs keyed by the hash of
+    (provider, model id, document type, processed text), and the least recently
+    used entries are evicted once the cache grows over its maximum size.
+    Several worker processes can share the file, the total size is kept in the
+    embeddings_meta row and updated in the same transaction as the entries.
+    """
+
+    def __init__(self, db_path: str, max_size_mb: int=1024, file_name: str="embeddings.sqlite"):
+
+        self.db_file = os.path.join(db_path, file_name)
+        self.max_size_bytes = max_size_mb * 1048576
+        # evict down to this size so we don't evict on every insert once full
+        self.low_watermark_bytes = int(self.max_size_bytes * 0.9)
+
+        self.connection = None
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        self.connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        # covers the size too, the LRU scan never reads the rows with the vectors
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_access_size_index ON embeddings (last_access, size)"
+        )
+        self.connection.execute("DROP INDEX IF EXISTS embeddings_last_access_index")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_meta ("
+            "id INTEGER PRIMARY KEY CHECK (id = 1), total_size INTEGER NOT NULL)"
+        )
+        self.connection.commit()
+
+        # only summed once, for a cache file created before the meta table
+        self.connection.execute("BEGIN IMMEDIATE")
+        self.connection.execute(
+            "INSERT OR IGNORE INTO embeddings_meta (id, total_size) "
+            "SELECT 1, COALESCE(SUM(size), 0) FROM embeddings"
+        )
+        self.connection.commit()
+
+    def disconnect(self):
+        if self.connection:
+            self.connection.close()
+        self.connection = None
+
+    def make_key(self, provider: str, model_id: str, document_type: str, text: str):
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return hashlib.sha256(
+            "\x1f".join([str(provider), str(model_id), str(document_type), text_hash]).encode("utf-8")
+        ).hexdigest()
+
+    def get_many(self, keys: List[str]) -> List[Optional[list]]:
+        """return the cached vector of every key, None for the missing ones"""
+        if not keys:
+            return []
+
+        with self.lock:
+            found = dict(self._select_in("SELECT key, vector FROM embeddings", keys))
+
+            if found:
+                now = time.time()
+                self.connection.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self.connection.commit()
+
+        results = []
+        for key in keys:
+            blob = found.get(key)
+            if blob is None:
+                self.misses += 1
+                results.append(None)
+                continue
+
+            self.hits += 1
+            vector = array("f")
+            vector.frombytes(blob)
+            results.append(vector.tolist())
+
+        return results
+
+    def set_many(self, keys: List[str], vectors: List[list]):
+        # a dict also drops the duplicated texts of the same batch
+        items = list({
+            key: array("f", vector).tobytes()
+            for key, vector in zip(keys, vectors)
+            if vector
+        }.items())
+        if not items:
+            return 0
+
+        now = time.time()
+        with self.lock:
+            # the write lock of the file is held from the insert to the end of the eviction,
+            # the other workers can't change the size in between
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                # entries being overwritten must not be counted twice
+                replaced_size = sum(
+                    size for _, size in self._select_in("SELECT key, size FROM embeddings", [key for key, _ in items])
+                )
+
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, size, last_access) VALUES (?, ?, ?, ?)",
+                    [(key, blob, len(key) + len(blob), now) for key, blob in items]
+                )
+
+                total_size = self._add_total_size(
+                    sum(len(key) + len(blob) for key, blob in items) - replaced_size
+                )
+                if total_size > self.max_size_bytes:
+                    self._evict(total_size=total_size)
+
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+
+        return len(items)
+
+    def _get_total_size(self):
+        row = self.connection.execute("SELECT total_size FROM embeddings_meta WHERE id = 1").fetchone()
+        return row[0] if row else 0
+
+    def _add_total_size(self, delta: int):
+        self.connection.execute("UPDATE embeddings_meta SET total_size = total_size + ? WHERE id = 1", (delta,))
+        return self._get_total_size()
+
+    def _select_in(self, query: str, keys: List[str]):
+        rows = []
+        # stay under the SQLite limit of bound variables
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i+500]
+            placeholders = ",".join("?" * len(batch))
+            rows.extend(self.connection.execute(
+                f"{query} WHERE key IN ({placeholders})", batch
+            ).fetchall())
+        return rows
+
+    def _evict(self, total_size: int):
+        """delete the least recently used entries until the cache is under the low watermark,
+        runs in the transaction of set_many"""
+        while total_size > self.low_watermark_bytes:
+            rows = self.connection.execute(
+                "SELECT key, size FROM embeddings ORDER BY last_access ASC LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                # the total drifted from the entries, start again from 0
+                self.connection.execute("UPDATE embeddings_meta SET total_size = 0 WHERE id = 1")
+                total_size = 0
+                break
+
+            to_delete = []
+            deleted_size = 0
+            for key, size in rows:
+                to_delete.append((key,))
+                deleted_size += size
+                if total_size - deleted_size <= self.low_watermark_bytes:
+                    break
+
+            self.connection.executemany("DELETE FROM embeddings WHERE key = ?", to_delete)
+            total_size = self._add_total_size(-deleted_size)
+            self.evictions += len(to_delete)
+
+        self.logger.info(f"Embedding cache evicted down to {total_size} bytes")
+
+    async def aget_many(self, keys: List[str]) -> List[Optional[list]]:
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def aset_many(self, keys: List[str], vectors: List[list]):
+        return await asyncio.to_thread(self.set_many, keys, vectors)
+
+    async def aget_stats(self):
+        return await asyncio.to_thread(self.get_stats)
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        with self.lock:
+            total_size = self._get_total_size()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "size_bytes": total_size,
+            "max_size_bytes": self.max_size_bytes,
+        }
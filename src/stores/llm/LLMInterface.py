@@ -64,4 +64,45 @@ class LLMInterface(ABC):
             prompt (str): The input text for the prompt.
             role (str): The role or context for the prompt construction.
         """
+
+    @abstractmethod # to force using the method
+    async def agenerate_text(self, prompt: str, chat_history: list=None, max_output_tokens: int=None,
+                            temperature: float = None):
+        """
+        Asynchronous version of `generate_text` that does not block the event loop.
+
+        Args:
+            prompt (str): The input text to generate a response for.
+            chat_history (list, optional): The previous messages of the conversation.
+            max_output_tokens (int): The maximum number of tokens in the output.
+            temperature (float, optional): The sampling temperature for text generation.
+
+        Returns:
+            str: The generated text.
+        """
+        
+    
+    @abstractmethod # to force using the method
+    async def aembed_text(self, text: str, document_type: str=None):
+        """
+        Asynchronous version of `embed_text`.
+
+        Args:
+            text (str): The text to be embedded.
+            document_type (str): The type of document the text belongs to.
+        """
+        
+    
+    @abstractmethod # to force using the method
+    async def aembed_texts(self, texts: list, document_type: str=None):
+        """
+        Embed a list of texts asynchronously in as few provider calls as possible.
+
+        Args:
+            texts (list): The texts to be embedded.
+            document_type (str): The type of document the texts belong to.
+
+        Returns:
+            list: One vector per text (None for the texts that failed).
+        """
         
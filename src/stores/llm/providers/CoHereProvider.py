@@ -1,5 +1,6 @@
 import time
 import random
+import asyncio
 import logging
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import CoHereEnums, DocumentTypeEnum
@@ -24,6 +25,8 @@ class CoHereProvider(LLMInterface):
         self.embedding_size = None
         
         self.client = cohere.Client(api_key=self.api_key)
+        # native async client used by the async routes so they don't block the event loop
+        self.async_client = cohere.AsyncClient(api_key=self.api_key)
 
         self.enums = CoHereEnums
 
@@ -70,6 +73,20 @@ class CoHereProvider(LLMInterface):
         # Use a token
         self.request_tokens -= 1
 
+    async def _await_token(self):
+        """Same as _wait_for_token but yields to the event loop while waiting"""
+        self._refresh_tokens()
+        
+        if self.request_tokens < 1:
+            time_to_wait = (1 - self.request_tokens) / self.token_refresh_rate
+            time_to_wait = max(0.1, time_to_wait)  # at least 100ms
+            self.logger.warning(f"Rate limit reached. Waiting {time_to_wait:.2f} seconds for quota refresh...")
+            await asyncio.sleep(time_to_wait)
+            self._refresh_tokens()
+        
+        # Use a token
+        self.request_tokens -= 1
+
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
                             temperature: float = None):
         if not self.client:
@@ -201,6 +218,133 @@ class CoHereProvider(LLMInterface):
                 
         return results
     
+    async def agenerate_text(self, prompt: str, chat_history: list=None, max_output_tokens: int=None,
+                            temperature: float = None):
+        if not self.async_client:
+            self.logger.error("Cohere client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Cohere was not set")
+            return None
+
+        if chat_history is None:
+            chat_history = []
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperaure
+
+        # Wait for rate limit token
+        await self._await_token()
+        
+        max_retries = 5
+        retry_count = 0
+        
+        while retry_count < max_retries:
+            try:
+                response = await self.async_client.chat(
+                    model = self.generation_model_id,
+                    chat_history = chat_history,
+                    message = self.process_text(prompt),
+                    temperature=temperature,
+                    max_tokens = max_output_tokens
+                )
+
+                if not response or not response.text:
+                    self.logger.error("Error while generating text with CoHere")
+                    return None
+
+                return response.text
+                
+            except Exception as e:
+                if "429" in str(e) or "too many requests" in str(e).lower():
+                    self.request_tokens = 0  # Force a longer wait
+                    retry_count += 1
+                    wait_time = (4 ** retry_count) + random.uniform(0, 2)
+                    self.logger.warning(f"Rate limited. Retrying in {wait_time:.2f} seconds... (Attempt {retry_count}/{max_retries})")
+                    await asyncio.sleep(wait_time)
+                else:
+                    self.logger.error(f"Error while generating text with Cohere: {str(e)}")
+                    return None
+        
+        self.logger.error(f"Max retries exceeded when generating text with Cohere")
+        return None
+
+    async def aembed_text(self, text: str, document_type: str=None):
+        """Async version of embed_text"""
+        if not text:
+            return None
+        return (await self.aembed_texts([text], document_type))[0]
+
+    async def aembed_texts(self, texts: list, document_type: str=None):
+        """Async version of embed_texts, batching and backoff use asyncio.sleep"""
+        if not self.async_client:
+            self.logger.error("Cohere client was not set")
+            return [None] * len(texts)
+            
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for Cohere was not set")
+            return [None] * len(texts)
+        
+        if not texts:
+            return []
+            
+        processed_texts = [self.process_text(text) for text in texts]
+        
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
+        
+        results = []
+        for i in range(0, len(processed_texts), self.batch_size):
+            batch = processed_texts[i:i+self.batch_size]
+            
+            # Wait for rate limit token
+            await self._await_token()
+            
+            max_retries = 5
+            retry_count = 0
+            success = False
+            
+            while retry_count < max_retries and not success:
+                try:
+                    self.logger.info(f"Embedding batch of {len(batch)} texts")
+                    response = await self.async_client.embed(
+                        model = self.embedding_model_id,
+                        texts = batch,
+                        input_type = input_type,
+                        embedding_types=['float']
+                    )
+                    
+                    if response and hasattr(response, 'embeddings') and response.embeddings.float:
+                        results.extend(response.embeddings.float)
+                    else:
+                        self.logger.error("No embeddings found in response")
+                        results.extend([None] * len(batch))
+                    success = True
+                        
+                except Exception as e:
+                    if "429" in str(e) or "too many requests" in str(e).lower():
+                        self.request_tokens = 0  # Force a longer wait
+                        retry_count += 1
+                        wait_time = (4 ** retry_count) + random.uniform(0, 2)
+                        self.logger.warning(f"Rate limited. Retrying in {wait_time:.2f} seconds... (Attempt {retry_count}/{max_retries})")
+                        await asyncio.sleep(wait_time)
+                    else:
+                        self.logger.error(f"Error while embedding text with Cohere: {str(e)}")
+                        results.extend([None] * len(batch))
+                        success = True  # Mark as success to move on
+            
+            if not success:
+                self.logger.error(f"Max retries exceeded when embedding batch")
+                results.extend([None] * len(batch))
+            
+            # Keep the same pacing between batches as the sync path
+            if i + self.batch_size < len(processed_texts):
+                await asyncio.sleep(1)
+                
+        return results
+    
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
@@ -1,5 +1,6 @@
 import time
 import random
+import asyncio
 import logging
 from google import genai
 from google.genai import types
@@ -69,6 +70,20 @@ class GoogleProvider(LLMInterface):
         
         # Use a token
         self.request_tokens -= 1
+
+    async def _await_token(self):
+        """Same as _wait_for_token but yields to the event loop while waiting"""
+        self._refresh_tokens()
+        
+        if self.request_tokens < 1:
+            time_to_wait = (1 - self.request_tokens) / self.token_refresh_rate
+            time_to_wait = max(0.1, time_to_wait)  # at least 100ms
+            self.logger.warning(f"Rate limit reached. Waiting {time_to_wait:.2f} seconds for quota refresh...")
+            await asyncio.sleep(time_to_wait)
+            self._refresh_tokens()
+        
+        # Use a token
+        self.request_tokens -= 1
     
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
                             temperature: float = None):
@@ -204,6 +219,135 @@ class GoogleProvider(LLMInterface):
                 
         return results
 
+    async def agenerate_text(self, prompt: str, chat_history: list=None, max_output_tokens: int=None,
+                            temperature: float = None):
+        if not self.client:
+            self.logger.error("Google client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Google was not set")
+            return None
+        
+        if chat_history is None:
+            chat_history = []
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperaure
+
+        if prompt:
+            chat_history.append(self.construct_prompt(prompt=prompt, role=GoogleEnums.USER.value))
+        
+        # Wait for rate limit token
+        await self._await_token()
+        
+        try:
+            # client.aio exposes the native async version of the same API
+            response = await self.client.aio.models.generate_content(
+                model = self.generation_model_id,
+                contents = chat_history,
+                config = types.GenerateContentConfig(
+                    max_output_tokens = max_output_tokens,
+                    temperature = temperature
+                )
+            )
+            
+            if not response or not hasattr(response, 'text'):
+                self.logger.error("Error while generating text with Google")
+                return None
+        
+            return response.text
+        except Exception as e:
+            self.logger.error(f"Error while generating text with Google: {str(e)}")
+            return None
+
+    async def aembed_text(self, text: str, document_type: str=None):
+        """Async version of embed_text"""
+        return (await self.aembed_texts([text], document_type))[0] if text else None
+
+    async def aembed_texts(self, texts: list, document_type: str=None):
+        """Async version of embed_texts, batching and backoff use asyncio.sleep"""
+        if not self.client:
+            self.logger.error("Google client was not set")
+            return [None] * len(texts)
+            
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for Google was not set")
+            return [None] * len(texts)
+        
+        if not texts:
+            return []
+            
+        processed_texts = [self.process_text(text) for text in texts]
+        
+        task_type_mapping = {
+            "document": "RETRIEVAL_DOCUMENT",
+            "query": "RETRIEVAL_QUERY"
+        }
+        
+        google_task_type = None
+        if document_type:
+            google_task_type = task_type_mapping.get(document_type.lower(), "RETRIEVAL_DOCUMENT")
+        
+        embed_config = None
+        if google_task_type:
+            embed_config = types.EmbedContentConfig(
+                task_type=google_task_type
+            )
+        
+        results = []
+        for i in range(0, len(processed_texts), self.batch_size):
+            batch = processed_texts[i:i+self.batch_size]
+            
+            # Wait for rate limit token
+            await self._await_token()
+            
+            max_retries = 5
+            retry_count = 0
+            success = False
+            
+            while retry_count < max_retries and not success:
+                try:
+                    self.logger.info(f"Embedding batch of {len(batch)} texts")
+                    embedding_result = await self.client.aio.models.embed_content(
+                        model=self.embedding_model_id,
+                        contents=batch,
+                        config=embed_config
+                    )
+                    
+                    if embedding_result and hasattr(embedding_result, 'embeddings') and len(embedding_result.embeddings) > 0:
+                        results.extend([emb.values for emb in embedding_result.embeddings])
+                    else:
+                        self.logger.error("No embeddings found in response")
+                        results.extend([None] * len(batch))
+                    success = True
+                        
+                except Exception as e:
+                    if "RESOURCE_EXHAUSTED" in str(e) or "429" in str(e):
+                        self.request_tokens = 0  # Force a longer wait
+                        retry_count += 1
+                        wait_time = (4 ** retry_count) + random.uniform(0, 2)
+                        self.logger.warning(f"Rate limited. Retrying in {wait_time:.2f} seconds... (Attempt {retry_count}/{max_retries})")
+                        await asyncio.sleep(wait_time)
+                    elif "INVALID_ARGUMENT" in str(e) and "task_type" in str(e):
+                        self.logger.warning("Invalid task_type. Retrying without task type specification.")
+                        embed_config = None
+                        retry_count += 1
+                    else:
+                        self.logger.error(f"Error while embedding text with Google: {str(e)}")
+                        results.extend([None] * len(batch))
+                        success = True  # Mark as success to move on
+            
+            if not success:
+                self.logger.error(f"Max retries exceeded when embedding batch")
+                results.extend([None] * len(batch))
+            
+            # Keep the same pacing between batches as the sync path
+            if i + self.batch_size < len(processed_texts):
+                await asyncio.sleep(1)
+                
+        return results
+
     def construct_prompt(self, prompt: str, role: str):
         # According to Google Generative AI documentation
         return {
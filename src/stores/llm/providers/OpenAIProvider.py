@@ -1,6 +1,8 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError
+import asyncio
+import random
 import logging 
 
 
@@ -27,6 +29,13 @@ class OpenAIProvider(LLMInterface):
             api_key = self.api_key,
             base_url = self.api_url if self.api_url and len(self.api_url) else None
         )
+        # native async client used by the async routes so they don't block the event loop
+        self.async_client = AsyncOpenAI(
+            api_key = self.api_key,
+            base_url = self.api_url if self.api_url and len(self.api_url) else None
+        )
+        self.max_retries = 5
+        self.batch_size = 256  # texts per embeddings request, under the input and token limits of a request
         self.enums = OpenAIEnums
         self.logger = logging.getLogger(__name__)
 
@@ -94,6 +103,103 @@ class OpenAIProvider(LLMInterface):
         
         return response.data[0].embedding
     
+    async def _acall_with_backoff(self, request):
+        """Await the given request factory, backing off with asyncio.sleep on rate limits"""
+        retry_count = 0
+        while True:
+            try:
+                return await request()
+            except RateLimitError:
+                retry_count += 1
+                if retry_count >= self.max_retries:
+                    raise
+                wait_time = (2 ** retry_count) + random.uniform(0, 1)
+                self.logger.warning(f"Rate limited. Retrying in {wait_time:.2f} seconds... (Attempt {retry_count}/{self.max_retries})")
+                await asyncio.sleep(wait_time)
+
+    async def agenerate_text(self, prompt: str, chat_history: list=None, max_output_tokens: int=None,
+                            temperature: float = None):
+        if not self.async_client:
+            self.logger.error("OpenAI client was not set")
+            return None
+        
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+        
+        if chat_history is None:
+            chat_history = []
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperaure
+        
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+        
+        try:
+            response = await self._acall_with_backoff(
+                lambda: self.async_client.chat.completions.create(
+                    model = self.generation_model_id,
+                    messages = chat_history,
+                    max_tokens = max_output_tokens,
+                    temperature = temperature
+                )
+            )
+        except Exception as e:
+            self.logger.error(f"Error while generating text with OpenAI: {str(e)}")
+            return None
+
+        if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
+            self.logger.error("Error while generating text with OpenAI")
+            return None
+
+        return response.choices[0].message.content
+
+    async def aembed_text(self, text: str, document_type: str=None):
+        if not text:
+            return None
+        return (await self.aembed_texts([text], document_type))[0]
+
+    async def aembed_texts(self, texts: list, document_type: str=None):
+        if not self.async_client:
+            self.logger.error("OpenAI client was not set")
+            return [None] * len(texts)
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return [None] * len(texts)
+
+        if not texts:
+            return []
+
+        processed_texts = [self.process_text(text) for text in texts]
+
+        results = []
+        for i in range(0, len(processed_texts), self.batch_size):
+            batch = processed_texts[i:i+self.batch_size]
+
+            try:
+                response = await self._acall_with_backoff(
+                    lambda: self.async_client.embeddings.create(
+                        model = self.embedding_model_id,
+                        input = batch,
+                    )
+                )
+            except Exception as e:
+                self.logger.error(f"Error while embedding text with OpenAI: {str(e)}")
+                results.extend([None] * len(batch))
+                continue
+
+            if not response or not response.data or len(response.data) != len(batch):
+                self.logger.error("Error while embedding text with OpenAI")
+                results.extend([None] * len(batch))
+                continue
+
+            results.extend(record.embedding for record in response.data)
+
+        return results
+    
     def construct_prompt(self, prompt: str, role: str):
         # according to OpenAI docs
         return {
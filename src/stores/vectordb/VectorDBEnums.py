@@ -2,6 +2,42 @@ from enum import Enum
 
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
+    NUMPY = "NUMPY" # in-process exact search, for small projects
+    HNSW = "HNSW" # in-process approximate search (hnswlib), for the big ones
+
+class VectorDBAccessModeEnums(Enum):
+    DIRECT = "direct" # every process opens the vector db itself
+    SOCKET = "socket" # one owner process (stores.vectordb.VectorDBServer) serves all the API workers
+
+class VectorDBOpEnums(Enum):
+    # response status
+    OK = 0
+    ERROR = 1
+    # requests, one per VectorDBInterface method
+    IS_COLLECTION_EXISTED = 10
+    LIST_ALL_COLLECTION = 11
+    GET_COLLECTION_INFO = 12
+    DELETE_COLLECTION = 13
+    CREATE_COLLECTION = 14
+    INSERT_MANY = 15
+    LIST_RECORD_IDS = 16
+    DELETE_MANY = 17
+    SEARCH_BY_VECTOR = 18
+    SEARCH_BY_VECTORS = 19
+
+class QuantizationEnums(Enum):
+    NONE = "none"
+    SCALAR = "scalar" # int8, 4x less memory
+    BINARY = "binary" # 1 bit per dimension, 32x less memory, needs rescoring
+
+class FlatVectorDTypeEnums(Enum):
+    FLOAT32 = "float32"
+    FLOAT16 = "float16" # half the memory, scores within ~1e-3
+    INT8 = "int8" # a quarter of the memory, cosine only
+
+class PayloadModeEnums(Enum):
+    FULL = "full" # text and metadata in every record
+    SLIM = "slim" # only the filterable metadata, the text is read back from mongo
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List
 from models.db_schemes import RetrievedDocument
+import asyncio
 
 class VectorDBInterface(ABC):
     
@@ -44,8 +47,81 @@ class VectorDBInterface(ABC):
     def insert_many(self, collection_name: str, texts: list, 
                                 vectors: list, metadata: list = None,
                                 record_ids: list = None, batch_size: int = 50):
+        """texts can be None to store the metadata only"""
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int) -> List[RetrievedDocument]:
-        pass
\ No newline at end of file
+    def list_record_ids(self, collection_name: str, batch_size: int = 1000):
+        """yield the ids of the stored records batch by batch"""
+        pass
+
+    @abstractmethod
+    def delete_many(self, collection_name: str, record_ids: list):
+        pass
+
+    @abstractmethod
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                                oversampling: float = None, rescore: bool = None) -> List[RetrievedDocument]:
+        """oversampling / rescore only apply to quantized collections"""
+        pass
+
+    @abstractmethod
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int,
+                                oversampling: float = None, rescore: bool = None) -> List[List[RetrievedDocument]]:
+        """one round trip for many queries, a (possibly empty) list of results per query"""
+        pass
+
+    # async versions for the routes and jobs. By default they run the sync methods on a
+    # thread of the provider, one call at a time, so the event loop is never blocked and
+    # the providers that aren't thread safe never see two calls at once.
+    # Providers with a native async client override them.
+
+    async def run_in_executor(self, method, **kwargs):
+        if getattr(self, "executor", None) is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vectordb")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(method, **kwargs))
+
+    async def aget_collection_info(self, collection_name: str) -> dict:
+        return await self.run_in_executor(self.get_collection_info, collection_name=collection_name)
+
+    async def adelete_collection(self, collection_name: str):
+        return await self.run_in_executor(self.delete_collection, collection_name=collection_name)
+
+    async def acreate_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False):
+        return await self.run_in_executor(self.create_collection, collection_name=collection_name,
+                                          embedding_size=embedding_size, do_reset=do_reset)
+
+    async def ainsert_many(self, collection_name: str, texts: list,
+                                vectors: list, metadata: list = None,
+                                record_ids: list = None, batch_size: int = 50):
+        return await self.run_in_executor(self.insert_many, collection_name=collection_name, texts=texts,
+                                          vectors=vectors, metadata=metadata,
+                                          record_ids=record_ids, batch_size=batch_size)
+
+    async def alist_record_ids(self, collection_name: str, batch_size: int = 1000):
+        batches = self.list_record_ids(collection_name=collection_name, batch_size=batch_size)
+        while True:
+            # every page of a scroll is a blocking call too
+            batch = await self.run_in_executor(partial(next, batches, None))
+            if batch is None:
+                break
+            yield batch
+
+    async def adelete_many(self, collection_name: str, record_ids: list):
+        return await self.run_in_executor(self.delete_many, collection_name=collection_name,
+                                          record_ids=record_ids)
+
+    async def asearch_by_vectors(self, collection_name: str, vectors: list, limit: int,
+                                oversampling: float = None, rescore: bool = None) -> List[List[RetrievedDocument]]:
+        return await self.run_in_executor(self.search_by_vectors, collection_name=collection_name,
+                                          vectors=vectors, limit=limit,
+                                          oversampling=oversampling, rescore=rescore)
+
+    async def asearch_by_vector(self, collection_name: str, vector: list, limit: int,
+                                oversampling: float = None, rescore: bool = None) -> List[RetrievedDocument]:
+        return await self.run_in_executor(self.search_by_vector, collection_name=collection_name,
+                                          vector=vector, limit=limit,
+                                          oversampling=oversampling, rescore=rescore)
\ No newline at end of file
@@ -0,0 +1,63 @@
+import json
+import struct
+import numpy as np
+
+# every message is a header (opcode, json length, vectors length) followed by the json encoded
+# arguments / results and the vectors as raw float32 bytes, their shape is in the json
+HEADER = struct.Struct("!BII")
+
+
+def encode_message(opcode: int, fields: dict = None, vectors=None) -> bytes:
+    fields = dict(fields or {})
+
+    vectors_bytes = b""
+    if vectors is not None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        fields["vectors_shape"] = vectors.shape
+        vectors_bytes = vectors.tobytes()
+
+    fields_bytes = json.dumps(
+        fields,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        # qdrant models and enums in the results
+        default=lambda x: getattr(x, "__dict__", str(x)),
+    ).encode("utf-8")
+
+    return HEADER.pack(opcode, len(fields_bytes), len(vectors_bytes)) + fields_bytes + vectors_bytes
+
+
+def decode_body(fields_bytes: bytes, vectors_bytes: bytes):
+    fields = json.loads(fields_bytes) if fields_bytes else {}
+
+    vectors = None
+    if "vectors_shape" in fields:
+        vectors = np.frombuffer(vectors_bytes, dtype=np.float32).reshape(fields.pop("vectors_shape"))
+
+    return fields, vectors
+
+
+def recv_exactly(sock, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        block = sock.recv(min(size - len(data), 1048576))
+        if not block:
+            raise ConnectionError("vector db socket closed")
+        data += block
+    return bytes(data)
+
+
+def read_message(sock):
+    """(opcode, fields, vectors) of the next message on a blocking socket"""
+    opcode, fields_size, vectors_size = HEADER.unpack(recv_exactly(sock, HEADER.size))
+    fields, vectors = decode_body(recv_exactly(sock, fields_size), recv_exactly(sock, vectors_size))
+    return opcode, fields, vectors
+
+
+async def aread_message(reader):
+    """(opcode, fields, vectors) of the next message on an asyncio stream"""
+    opcode, fields_size, vectors_size = HEADER.unpack(await reader.readexactly(HEADER.size))
+    fields_bytes = await reader.readexactly(fields_size)
+    vectors_bytes = await reader.readexactly(vectors_size)
+    fields, vectors = decode_body(fields_bytes, vectors_bytes)
+    return opcode, fields, vectors
@@ -1,11 +1,24 @@
-from .providers import QdrantDBProvider
+from .providers import QdrantDBProvider, NumpyDBProvider, SocketDBProvider
 from .VectorDBEnums import VectorDBEnums
 from controllers import BaseController
+import os
 
 class VectorDBProviderFactory:
     def __init__(self, config):
         self.config = config
         self.base_controller = BaseController()
+
+    def get_socket_path(self):
+        if os.path.isabs(self.config.VECTOR_DB_SOCKET_PATH):
+            return self.config.VECTOR_DB_SOCKET_PATH
+
+        os.makedirs(self.base_controller.database_dir, exist_ok=True)
+        return os.path.join(self.base_controller.database_dir, self.config.VECTOR_DB_SOCKET_PATH)
+
+    def create_socket_client(self):
+        """client of the vector db owner process, see stores.vectordb.VectorDBServer"""
+        return SocketDBProvider(socket_path=self.get_socket_path())
+
     def create(self,  provider: str):
         if provider == VectorDBEnums.QDRANT.value:
             
@@ -14,6 +27,44 @@ class VectorDBProviderFactory:
             return QdrantDBProvider(
                 db_path=db_path,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                collection_info_ttl=self.config.VECTOR_DB_COLLECTION_INFO_TTL,
+                collection_config={
+                    "quantization": self.config.VECTOR_DB_QUANTIZATION,
+                    "on_disk": self.config.VECTOR_DB_ON_DISK,
+                    "hnsw_m": self.config.VECTOR_DB_HNSW_M,
+                    "hnsw_ef_construct": self.config.VECTOR_DB_HNSW_EF_CONSTRUCT,
+                },
+                collection_overrides=self.config.VECTOR_DB_COLLECTION_OVERRIDES,
+                search_oversampling=self.config.VECTOR_DB_SEARCH_OVERSAMPLING,
+                search_rescore=self.config.VECTOR_DB_SEARCH_RESCORE,
+                url=self.config.VECTOR_DB_URL,
+                upload_parallelism=self.config.VECTOR_DB_UPLOAD_PARALLELISM,
+            )
+
+        if provider == VectorDBEnums.NUMPY.value:
+
+            db_path = self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_PATH)
+
+            return NumpyDBProvider(
+                db_path=db_path,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                dtype=self.config.VECTOR_DB_NUMPY_DTYPE,
+            )
+
+        if provider == VectorDBEnums.HNSW.value:
+            # hnswlib is a compiled dependency, only imported by the deployments using it
+            from .providers.HnswDBProvider import HnswDBProvider
+
+            db_path = self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_PATH)
+
+            return HnswDBProvider(
+                db_path=db_path,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                m=self.config.VECTOR_DB_HNSW_M or 16,
+                ef_construction=self.config.VECTOR_DB_HNSW_EF_CONSTRUCT or 200,
+                ef_search=self.config.VECTOR_DB_HNSW_EF_SEARCH,
+                save_every=self.config.VECTOR_DB_HNSW_SAVE_EVERY,
+                compact_ratio=self.config.VECTOR_DB_HNSW_COMPACT_RATIO,
             )
         
         return None
\ No newline at end of file
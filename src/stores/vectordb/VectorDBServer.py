@@ -0,0 +1,216 @@
+"""
+Vector db owner process. The local vector dbs (Qdrant local mode, the HNSW snapshots) can only
+be opened by one process, this one opens the configured VECTOR_DB_BACKEND and serves it on a
+unix socket to the API workers running with VECTOR_DB_ACCESS_MODE=socket.
+
+run from src/, before the workers:
+    python -m stores.vectordb.VectorDBServer
+    uvicorn main:app --workers 4 --host 0.0.0.0 --port 5000
+"""
+import os
+import socket
+import signal
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from helper.config import get_settings
+from .VectorDBEnums import VectorDBOpEnums
+from .VectorDBProtocol import encode_message, aread_message
+from .VectorDBProviderFactory import VectorDBProviderFactory
+
+logger = logging.getLogger(__name__)
+
+class VectorDBServer:
+
+    def __init__(self, vectordb_client, socket_path: str):
+        self.vectordb_client = vectordb_client
+        self.socket_path = socket_path
+        # the providers aren't thread safe, every call runs on this one thread and
+        # the event loop is left to move the bytes of all the connections
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vectordb")
+        self.server = None
+        self.stopping = False
+        # the workers keep their connection open, stop() has to close them itself
+        self.connections = {}
+        self.busy_connections = set()
+
+        self.handlers = {
+            VectorDBOpEnums.IS_COLLECTION_EXISTED.value: self.is_collection_existed,
+            VectorDBOpEnums.LIST_ALL_COLLECTION.value: self.list_all_collection,
+            VectorDBOpEnums.GET_COLLECTION_INFO.value: self.get_collection_info,
+            VectorDBOpEnums.DELETE_COLLECTION.value: self.delete_collection,
+            VectorDBOpEnums.CREATE_COLLECTION.value: self.create_collection,
+            VectorDBOpEnums.INSERT_MANY.value: self.insert_many,
+            VectorDBOpEnums.LIST_RECORD_IDS.value: self.list_record_ids,
+            VectorDBOpEnums.DELETE_MANY.value: self.delete_many,
+            VectorDBOpEnums.SEARCH_BY_VECTOR.value: self.search_by_vector,
+            VectorDBOpEnums.SEARCH_BY_VECTORS.value: self.search_by_vectors,
+        }
+
+    def remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            # left by a server that didn't shut down cleanly
+            os.remove(self.socket_path)
+            return
+        finally:
+            probe.close()
+
+        raise RuntimeError(f"Another vector db server is already listening on {self.socket_path}")
+
+    async def start(self):
+        self.remove_stale_socket()
+        self.server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path)
+        logger.info(f"Vector db server listening on {self.socket_path}")
+
+    async def stop(self):
+        self.stopping = True
+        if self.server:
+            self.server.close()
+
+        # the idle connections are closed, the ones running a request send its reply and stop
+        for task, writer in self.connections.items():
+            if task not in self.busy_connections:
+                writer.close()
+        await asyncio.gather(*self.connections.keys(), return_exceptions=True)
+
+        if self.server:
+            await self.server.wait_closed()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        # the providers may still flush their files here
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.vectordb_client.disconnect)
+        self.executor.shutdown()
+
+    async def handle_connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        self.connections[task] = writer
+        try:
+            while True:
+                try:
+                    opcode, fields, vectors = await aread_message(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                if self.stopping:
+                    break
+
+                self.busy_connections.add(task)
+                try:
+                    handler = self.handlers[opcode]
+                    result = await loop.run_in_executor(self.executor, handler, fields, vectors)
+                    writer.write(encode_message(VectorDBOpEnums.OK.value, {"result": result}))
+                except Exception as e:
+                    logger.error(f"Error while serving the vector db request {opcode}: {e}")
+                    writer.write(encode_message(VectorDBOpEnums.ERROR.value, {"error": str(e)}))
+
+                await writer.drain()
+                self.busy_connections.discard(task)
+
+                if self.stopping:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.pop(task, None)
+            self.busy_connections.discard(task)
+            writer.close()
+
+    def is_collection_existed(self, fields: dict, vectors):
+        return self.vectordb_client.is_collection_existed(collection_name=fields["collection_name"])
+
+    def list_all_collection(self, fields: dict, vectors):
+        return self.vectordb_client.list_all_collection()
+
+    def get_collection_info(self, fields: dict, vectors):
+        return self.vectordb_client.get_collection_info(collection_name=fields["collection_name"])
+
+    def delete_collection(self, fields: dict, vectors):
+        return self.vectordb_client.delete_collection(collection_name=fields["collection_name"])
+
+    def create_collection(self, fields: dict, vectors):
+        return self.vectordb_client.create_collection(
+            collection_name=fields["collection_name"],
+            embedding_size=fields["embedding_size"],
+            do_reset=fields["do_reset"],
+        )
+
+    def insert_many(self, fields: dict, vectors):
+        return self.vectordb_client.insert_many(
+            collection_name=fields["collection_name"],
+            texts=fields["texts"],
+            vectors=vectors.tolist(),
+            metadata=fields["metadata"],
+            record_ids=fields["record_ids"],
+            batch_size=fields["batch_size"],
+        )
+
+    def list_record_ids(self, fields: dict, vectors):
+        record_ids = []
+        for batch in self.vectordb_client.list_record_ids(collection_name=fields["collection_name"]):
+            record_ids.extend(batch)
+        return record_ids
+
+    def delete_many(self, fields: dict, vectors):
+        return self.vectordb_client.delete_many(
+            collection_name=fields["collection_name"],
+            record_ids=fields["record_ids"],
+        )
+
+    def search_by_vector(self, fields: dict, vectors):
+        results = self.vectordb_client.search_by_vector(
+            collection_name=fields["collection_name"],
+            vector=vectors[0].tolist(),
+            limit=fields["limit"],
+            oversampling=fields["oversampling"],
+            rescore=fields["rescore"],
+        )
+        if not results:
+            return None
+        return [result.model_dump() for result in results]
+
+    def search_by_vectors(self, fields: dict, vectors):
+        batch_results = self.vectordb_client.search_by_vectors(
+            collection_name=fields["collection_name"],
+            vectors=vectors.tolist(),
+            limit=fields["limit"],
+            oversampling=fields["oversampling"],
+            rescore=fields["rescore"],
+        )
+        return [
+            [result.model_dump() for result in results]
+            for results in batch_results
+        ]
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    settings = get_settings()
+
+    vectordb_provider_factory = VectorDBProviderFactory(settings)
+    vectordb_client = vectordb_provider_factory.create(provider=settings.VECTOR_DB_BACKEND)
+    vectordb_client.connect()
+
+    server = VectorDBServer(
+        vectordb_client=vectordb_client,
+        socket_path=vectordb_provider_factory.get_socket_path(),
+    )
+    await server.start()
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stop_event.set)
+
+    await stop_event.wait()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
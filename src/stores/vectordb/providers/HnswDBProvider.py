@@ -0,0 +1,518 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums
+from contextlib import contextmanager
+import os
+import json
+import fcntl
+import shutil
+import logging
+import hnswlib
+import numpy as np
+from typing import List
+from models.db_schemes import RetrievedDocument
+
+class HnswDBProvider(VectorDBInterface):
+    """
+    Approximate search with an in-process hnswlib index per collection:
+        <db_path>/<collection>/meta.json             sizes, hnsw settings and the current file names
+        <db_path>/<collection>/index.<n>.bin         hnswlib snapshot
+        <db_path>/<collection>/vectors.<n>.f32       raw float32 vectors added since the snapshot
+        <db_path>/<collection>/records.<n>.jsonl     {"label", "id", "payload"} or {"label", "deleted"} per change
+    hnswlib only knows integer labels, the sidecar maps them to the record ids and payloads.
+    Adds go to the in-memory index, the vectors log and the sidecar, the snapshot is only
+    rewritten every save_every added vectors (and on disconnect), loading replays the log on top of it.
+    Deletes are tombstones (mark_deleted) until they reach compact_ratio of the collection,
+    then the index is rebuilt from the live vectors.
+    Other processes can search a collection while one of them writes to it, they pick up the
+    changes from the log on their next search. Writers serialize on an flock.
+    """
+
+    META_FILE = "meta.json"
+    LOCK_FILE = ".lock"
+
+    def __init__(self, db_path: str, distance_method: str, m: int = 16, ef_construction: int = 200,
+                        ef_search: int = 64, initial_capacity: int = 1024,
+                        save_every: int = 10000, compact_ratio: float = 0.2):
+
+        self.db_path = db_path
+        self.distance_method = distance_method
+        self.space = "ip" if distance_method == DistanceMethodEnums.DOT.value else "cosine"
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.initial_capacity = initial_capacity
+        self.save_every = save_every
+        self.compact_ratio = compact_ratio
+
+        # collection_name -> what this process has loaded of it (index, ids, payloads)
+        self.collections = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+
+    def disconnect(self):
+        # the vectors still only in the log are written to the snapshots, loading them is faster
+        for collection_name in list(self.collections.keys()):
+            try:
+                if self.collections[collection_name]["meta"]["log_rows"]:
+                    with self.write_lock(collection_name):
+                        state = self.load_collection(collection_name)
+                        if state is not None and state["meta"]["log_rows"]:
+                            self.save_snapshot(collection_name, state)
+            except Exception as e:
+                self.logger.error(f"Error while saving the index of {collection_name}: {e}")
+        self.collections.clear()
+
+    def get_collection_path(self, collection_name: str, file_name: str = None):
+        if file_name is None:
+            return os.path.join(self.db_path, collection_name)
+        return os.path.join(self.db_path, collection_name, file_name)
+
+    @contextmanager
+    def write_lock(self, collection_name: str):
+        with open(self.get_collection_path(collection_name, self.LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def write_meta(self, collection_name: str, state: dict, meta: dict):
+        meta_path = self.get_collection_path(collection_name, self.META_FILE)
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+        # this process already applied the change, no need to read it back
+        meta_stat = os.stat(meta_path)
+        state["meta"] = meta
+        state["meta_version"] = (meta_stat.st_ino, meta_stat.st_mtime_ns)
+        state["records_size"] = meta["records_size"]
+        state["log_rows"] = meta["log_rows"]
+
+    def remove_stale_files(self, collection_name: str, meta: dict):
+        current_files = (meta["index_file"], meta["vectors_file"], meta["records_file"])
+        for file_name in os.listdir(self.get_collection_path(collection_name)):
+            if file_name.startswith(("index.", "vectors.", "records.")) and file_name not in current_files:
+                os.remove(self.get_collection_path(collection_name, file_name))
+
+    def new_index(self, meta: dict, capacity: int):
+        index = hnswlib.Index(space=meta["space"], dim=meta["vector_size"])
+        index.init_index(max_elements=capacity, ef_construction=meta["ef_construction"], M=meta["m"])
+        return index
+
+    def read_log_vectors(self, collection_name: str, meta: dict):
+        if not meta["log_rows"]:
+            return np.empty((0, meta["vector_size"]), dtype=np.float32)
+        return np.memmap(
+            self.get_collection_path(collection_name, meta["vectors_file"]),
+            dtype=np.float32,
+            mode="r",
+            shape=(meta["log_rows"], meta["vector_size"]),
+        )
+
+    def load_collection(self, collection_name: str):
+        """the up to date state of the collection, or None when it doesn't exist.
+        Only the changes since the last call are read and replayed"""
+        meta_path = self.get_collection_path(collection_name, self.META_FILE)
+        try:
+            meta_stat = os.stat(meta_path)
+        except FileNotFoundError:
+            self.collections.pop(collection_name, None)
+            return None
+
+        state = self.collections.get(collection_name)
+        meta_version = (meta_stat.st_ino, meta_stat.st_mtime_ns)
+        if state and state["meta_version"] == meta_version:
+            return state
+
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+
+        if not state or state["meta"]["index_file"] != meta["index_file"]:
+            index = hnswlib.Index(space=meta["space"], dim=meta["vector_size"])
+            index.load_index(
+                self.get_collection_path(collection_name, meta["index_file"]),
+                max_elements=max(meta["capacity"], meta["next_label"]),
+            )
+            state = {
+                "index": index,
+                "ids": {},
+                "payloads": {},
+                "id_labels": {},
+                "records_size": 0,
+                "log_rows": 0,
+                # the records before this offset are already in the snapshot
+                "snapshot_records_size": meta["snapshot_records_size"],
+            }
+
+        if meta["records_size"] > state["records_size"]:
+            with open(self.get_collection_path(collection_name, meta["records_file"]), "rb") as f:
+                f.seek(state["records_size"])
+                data = f.read(meta["records_size"] - state["records_size"])
+
+            log_vectors = self.read_log_vectors(collection_name, meta)
+            index = state["index"]
+            offset = state["records_size"]
+            for line in data.splitlines(keepends=True):
+                record = json.loads(line)
+                replay = offset >= state["snapshot_records_size"]
+                offset += len(line)
+
+                label = record["label"]
+                if record.get("deleted"):
+                    state["id_labels"].pop(state["ids"].pop(label, None), None)
+                    state["payloads"].pop(label, None)
+                    if replay:
+                        index.mark_deleted(label)
+                    continue
+
+                state["ids"][label] = record["id"]
+                state["payloads"][label] = record["payload"]
+                state["id_labels"][record["id"]] = label
+                if replay:
+                    if index.get_current_count() >= index.get_max_elements():
+                        index.resize_index(max(index.get_max_elements() * 2, self.initial_capacity))
+                    index.add_items(log_vectors[record["log_row"]: record["log_row"] + 1], [label])
+
+        state["meta"] = meta
+        state["meta_version"] = meta_version
+        state["records_size"] = meta["records_size"]
+        state["log_rows"] = meta["log_rows"]
+        self.collections[collection_name] = state
+
+        return state
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(self.get_collection_path(collection_name, self.META_FILE))
+
+    def list_all_collection(self) -> List:
+        if not os.path.isdir(self.db_path):
+            return []
+        return [
+            collection_name
+            for collection_name in sorted(os.listdir(self.db_path))
+            if self.is_collection_existed(collection_name)
+        ]
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        state = self.load_collection(collection_name)
+        if state is None:
+            return None
+
+        meta = state["meta"]
+        return {
+            "points_count": len(state["ids"]),
+            "deleted_count": meta["deleted_count"],
+            "vector_size": meta["vector_size"],
+            "distance": meta["distance"],
+            "m": meta["m"],
+            "ef_construction": meta["ef_construction"],
+            "ef_search": self.ef_search,
+            "capacity": state["index"].get_max_elements(),
+            "unsaved_vectors": meta["log_rows"],
+        }
+
+    def delete_collection(self, collection_name: str) -> List:
+        self.collections.pop(collection_name, None)
+        if self.is_collection_existed(collection_name):
+            shutil.rmtree(self.get_collection_path(collection_name), ignore_errors=True)
+            return True
+
+    def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False):
+        if do_reset:
+            _ = self.delete_collection(collection_name=collection_name)
+
+        state = self.load_collection(collection_name)
+        if state is not None:
+            if state["meta"]["vector_size"] != embedding_size:
+                self.logger.warning(f"Collection {collection_name} has vectors of size {state['meta']['vector_size']}, "
+                                    f"not {embedding_size}, reset it after changing the embedding model")
+            return False
+
+        os.makedirs(self.get_collection_path(collection_name), exist_ok=True)
+        with self.write_lock(collection_name):
+            if self.is_collection_existed(collection_name):
+                return False
+
+            meta = {
+                "vector_size": embedding_size,
+                "distance": self.distance_method,
+                "space": self.space,
+                "m": self.m,
+                "ef_construction": self.ef_construction,
+                "capacity": self.initial_capacity,
+                "next_label": 0,
+                "deleted_count": 0,
+                "generation": 0,
+                "index_file": "index.0.bin",
+                "vectors_file": "vectors.0.f32",
+                "records_file": "records.0.jsonl",
+                "records_size": 0,
+                "snapshot_records_size": 0,
+                "log_rows": 0,
+            }
+
+            index = self.new_index(meta, capacity=meta["capacity"])
+            index.save_index(self.get_collection_path(collection_name, meta["index_file"]))
+            open(self.get_collection_path(collection_name, meta["vectors_file"]), "wb").close()
+            open(self.get_collection_path(collection_name, meta["records_file"]), "wb").close()
+
+            meta_path = self.get_collection_path(collection_name, self.META_FILE)
+            with open(f"{meta_path}.{os.getpid()}.tmp", "w") as f:
+                json.dump(meta, f)
+            os.replace(f"{meta_path}.{os.getpid()}.tmp", meta_path)
+
+        return True
+
+    def append_changes(self, collection_name: str, meta: dict, records: list, vectors: np.ndarray = None):
+        """write the records (and the vectors they point to) after the published ones,
+        dropping whatever an interrupted write left behind"""
+        if vectors is not None and len(vectors):
+            row_size = meta["vector_size"] * 4
+            with open(self.get_collection_path(collection_name, meta["vectors_file"]), "r+b") as f:
+                f.seek(meta["log_rows"] * row_size)
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+                f.truncate()
+            meta["log_rows"] += len(vectors)
+
+        data = b"".join(
+            json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+            for record in records
+        )
+        with open(self.get_collection_path(collection_name, meta["records_file"]), "r+b") as f:
+            f.seek(meta["records_size"])
+            f.write(data)
+            f.truncate()
+        meta["records_size"] += len(data)
+
+    def save_snapshot(self, collection_name: str, state: dict):
+        """write the whole index to a new snapshot and start an empty vectors log"""
+        meta = dict(state["meta"])
+        meta["generation"] += 1
+        meta["index_file"] = f"index.{meta['generation']}.bin"
+        meta["vectors_file"] = f"vectors.{meta['generation']}.f32"
+        meta["capacity"] = state["index"].get_max_elements()
+        meta["snapshot_records_size"] = meta["records_size"]
+        meta["log_rows"] = 0
+
+        state["index"].save_index(self.get_collection_path(collection_name, meta["index_file"]))
+        open(self.get_collection_path(collection_name, meta["vectors_file"]), "wb").close()
+
+        state["snapshot_records_size"] = meta["snapshot_records_size"]
+        self.write_meta(collection_name, state, meta)
+        self.remove_stale_files(collection_name, meta)
+
+    def compact(self, collection_name: str, state: dict):
+        """rebuild the index and the sidecar from the live records only, the labels start over at 0"""
+        meta = dict(state["meta"])
+        old_labels = sorted(state["ids"].keys())
+
+        index = self.new_index(meta, capacity=max(len(old_labels), self.initial_capacity))
+        if old_labels:
+            vectors = np.asarray(state["index"].get_items(old_labels), dtype=np.float32)
+            index.add_items(vectors, list(range(len(old_labels))))
+
+        ids, payloads, id_labels = {}, {}, {}
+        for label, old_label in enumerate(old_labels):
+            ids[label] = state["ids"][old_label]
+            payloads[label] = state["payloads"][old_label]
+            id_labels[ids[label]] = label
+
+        meta["generation"] += 1
+        meta["records_file"] = f"records.{meta['generation']}.jsonl"
+        meta["records_size"] = 0
+        meta["next_label"] = len(old_labels)
+        meta["deleted_count"] = 0
+        open(self.get_collection_path(collection_name, meta["records_file"]), "wb").close()
+        self.append_changes(collection_name, meta, records=[
+            {"label": label, "id": ids[label], "payload": payloads[label]}
+            for label in range(len(old_labels))
+        ])
+
+        state.update({
+            "index": index,
+            "ids": ids,
+            "payloads": payloads,
+            "id_labels": id_labels,
+            "meta": meta,
+        })
+        self.save_snapshot(collection_name, state)
+
+    def insert_one(self, collection_name: str, text: str, vector: list,
+                        metadata: dict = None,
+                        record_id: str = None):
+        return self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id] if record_id is not None else None,
+        )
+
+    def insert_many(self, collection_name: str, texts: list,
+                                    vectors: list, metadata: list = None,
+                                    record_ids: list = None, batch_size: int = 50):
+        """one write per call, batch_size is only there for the interface.
+        Existing record ids are updated in place like a qdrant upsert"""
+
+        if not self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not insert new record to non-existed collection: {collection_name}")
+            return False
+
+        if texts is None:
+            texts = [None] * len(vectors)
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        try:
+            with self.write_lock(collection_name):
+                # another process may have written since the last load
+                state = self.load_collection(collection_name)
+                meta = dict(state["meta"])
+                vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), meta["vector_size"])
+
+                labels = []
+                new_labels = {}
+                for record_id in record_ids:
+                    label = state["id_labels"].get(record_id, new_labels.get(record_id))
+                    if label is None:
+                        label = new_labels[record_id] = meta["next_label"]
+                        meta["next_label"] += 1
+                    labels.append(label)
+
+                index = state["index"]
+                if meta["next_label"] > index.get_max_elements():
+                    index.resize_index(max(meta["next_label"], index.get_max_elements() * 2))
+
+                records = []
+                for x, (label, record_id) in enumerate(zip(labels, record_ids)):
+                    records.append({
+                        "label": label,
+                        "id": record_id,
+                        "payload": self.get_payload(text=texts[x], metadata=metadata[x]),
+                        "log_row": meta["log_rows"] + x,
+                    })
+                self.append_changes(collection_name, meta, records=records, vectors=vectors)
+
+                index.add_items(vectors, labels)
+                for record in records:
+                    state["ids"][record["label"]] = record["id"]
+                    state["payloads"][record["label"]] = record["payload"]
+                    state["id_labels"][record["id"]] = record["label"]
+
+                self.write_meta(collection_name, state, meta)
+                if meta["log_rows"] >= self.save_every:
+                    self.save_snapshot(collection_name, state)
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            # the in-memory index may be ahead of the files now, read them again
+            self.collections.pop(collection_name, None)
+            return False
+
+        return True
+
+    def get_payload(self, text: str, metadata: dict):
+        if text is None:
+            return {"metadata": metadata}
+        return {"text": text, "metadata": metadata}
+
+    def list_record_ids(self, collection_name: str, batch_size: int = 1000):
+        state = self.load_collection(collection_name)
+        if state is None:
+            return
+
+        ids = list(state["ids"].values())
+        for i in range(0, len(ids), batch_size):
+            yield ids[i: i + batch_size]
+
+    def delete_many(self, collection_name: str, record_ids: list):
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return False
+
+        try:
+            with self.write_lock(collection_name):
+                state = self.load_collection(collection_name)
+                meta = dict(state["meta"])
+
+                labels = [
+                    state["id_labels"][record_id]
+                    for record_id in set(record_ids)
+                    if record_id in state["id_labels"]
+                ]
+                if not labels:
+                    return True
+
+                self.append_changes(collection_name, meta, records=[
+                    {"label": label, "deleted": True}
+                    for label in labels
+                ])
+                for label in labels:
+                    state["index"].mark_deleted(label)
+                    state["id_labels"].pop(state["ids"].pop(label), None)
+                    state["payloads"].pop(label, None)
+
+                meta["deleted_count"] += len(labels)
+                self.write_meta(collection_name, state, meta)
+
+                if meta["deleted_count"] > self.compact_ratio * (len(state["ids"]) + meta["deleted_count"]):
+                    self.compact(collection_name, state)
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            self.collections.pop(collection_name, None)
+            return False
+
+        return True
+
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
+        state = self.load_collection(collection_name)
+        if state is None or not state["ids"]:
+            return [[] for _ in vectors]
+
+        limit = min(limit, len(state["ids"]))
+        queries = np.asarray(vectors, dtype=np.float32).reshape(-1, state["meta"]["vector_size"])
+
+        index = state["index"]
+        index.set_ef(max(self.ef_search, limit))
+        try:
+            labels, distances = index.knn_query(queries, k=limit)
+        except RuntimeError as e:
+            # too many tombstones around the query for this ef
+            self.logger.error(f"Error while searching {collection_name}: {e}")
+            return [[] for _ in vectors]
+
+        # both the cosine and the ip spaces return 1 - similarity
+        return [
+            [
+                RetrievedDocument(**{
+                    "score": 1 - float(distance),
+                    "text": state["payloads"][label].get("text"),
+                    "id": str(state["ids"][label]),
+                })
+                for label, distance in zip(query_labels.tolist(), query_distances.tolist())
+            ]
+            for query_labels, query_distances in zip(labels, distances)
+        ]
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
+        results = self.search_by_vectors(
+            collection_name=collection_name,
+            vectors=[vector],
+            limit=limit,
+        )
+
+        if not results or len(results[0]) == 0:
+            return None
+
+        return results[0]
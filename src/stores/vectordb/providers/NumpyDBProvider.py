@@ -0,0 +1,474 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums, FlatVectorDTypeEnums
+from contextlib import contextmanager
+import os
+import json
+import fcntl
+import shutil
+import logging
+import numpy as np
+from typing import List
+from models.db_schemes import RetrievedDocument
+
+class NumpyDBProvider(VectorDBInterface):
+    """
+    Exact search over collections kept as plain files, for projects small enough that a
+    matrix multiply beats an index:
+        <db_path>/<collection>/meta.json             sizes, dtype and the current file names
+        <db_path>/<collection>/vectors.<n>.npy       (capacity, vector_size) matrix, memory mapped
+        <db_path>/<collection>/records.<n>.jsonl     one {"row", "id", "payload"} line per write,
+                                                     a later line of the same row wins
+    Rows and records are written first and meta.json is replaced last, so any number of
+    processes can search a collection while one of them writes to it, they only ever see
+    complete rows. Writers serialize on an flock of the collection directory.
+    """
+
+    META_FILE = "meta.json"
+    LOCK_FILE = ".lock"
+    SEARCH_BLOCK_SIZE = 65536 # rows scored at once, bounds the float32 copies of float16 / int8 rows
+    INT8_SCALE = 127
+
+    def __init__(self, db_path: str, distance_method: str, dtype: str = "float32",
+                        initial_capacity: int = 1024):
+
+        self.db_path = db_path
+        self.distance_method = distance_method
+        self.dtype = dtype
+        self.initial_capacity = initial_capacity
+
+        # collection_name -> what this process has loaded of it (memory map, ids, payloads)
+        self.collections = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+
+    def disconnect(self):
+        self.collections.clear()
+
+    def get_collection_path(self, collection_name: str, file_name: str = None):
+        if file_name is None:
+            return os.path.join(self.db_path, collection_name)
+        return os.path.join(self.db_path, collection_name, file_name)
+
+    @contextmanager
+    def write_lock(self, collection_name: str):
+        with open(self.get_collection_path(collection_name, self.LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def write_meta(self, collection_name: str, meta: dict):
+        meta_path = self.get_collection_path(collection_name, self.META_FILE)
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def load_collection(self, collection_name: str):
+        """the up to date state of the collection, or None when it doesn't exist.
+        Only what changed since the last call is read again"""
+        meta_path = self.get_collection_path(collection_name, self.META_FILE)
+        try:
+            meta_stat = os.stat(meta_path)
+        except FileNotFoundError:
+            self.collections.pop(collection_name, None)
+            return None
+
+        state = self.collections.get(collection_name)
+        meta_version = (meta_stat.st_ino, meta_stat.st_mtime_ns)
+        if state and state["meta_version"] == meta_version:
+            return state
+
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+
+        if not state or state["meta"]["records_file"] != meta["records_file"]:
+            state = {
+                "ids": [],
+                "payloads": [],
+                "id_rows": {},
+                "records_size": 0,
+                "vectors": None,
+            }
+
+        if state["vectors"] is None or state["meta"]["vectors_file"] != meta["vectors_file"]:
+            state["vectors"] = np.load(
+                self.get_collection_path(collection_name, meta["vectors_file"]),
+                mmap_mode="r",
+            )
+
+        if meta["records_size"] > state["records_size"]:
+            with open(self.get_collection_path(collection_name, meta["records_file"]), "rb") as f:
+                f.seek(state["records_size"])
+                data = f.read(meta["records_size"] - state["records_size"])
+
+            ids, payloads, id_rows = state["ids"], state["payloads"], state["id_rows"]
+            for line in data.splitlines():
+                record = json.loads(line)
+                row = record["row"]
+                if row >= len(ids):
+                    ids.extend([None] * (row + 1 - len(ids)))
+                    payloads.extend([None] * (row + 1 - len(payloads)))
+                ids[row] = record["id"]
+                payloads[row] = record["payload"]
+                id_rows[record["id"]] = row
+
+            state["records_size"] = meta["records_size"]
+
+        state["meta"] = meta
+        state["meta_version"] = meta_version
+        self.collections[collection_name] = state
+
+        return state
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(self.get_collection_path(collection_name, self.META_FILE))
+
+    def list_all_collection(self) -> List:
+        if not os.path.isdir(self.db_path):
+            return []
+        return [
+            collection_name
+            for collection_name in sorted(os.listdir(self.db_path))
+            if self.is_collection_existed(collection_name)
+        ]
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        state = self.load_collection(collection_name)
+        if state is None:
+            return None
+
+        meta = state["meta"]
+        return {
+            "points_count": meta["count"],
+            "vector_size": meta["vector_size"],
+            "distance": meta["distance"],
+            "dtype": meta["dtype"],
+            "capacity": meta["capacity"],
+            "vectors_bytes": state["vectors"].nbytes,
+        }
+
+    def delete_collection(self, collection_name: str) -> List:
+        self.collections.pop(collection_name, None)
+        if self.is_collection_existed(collection_name):
+            # processes searching it keep their memory maps until they notice
+            shutil.rmtree(self.get_collection_path(collection_name), ignore_errors=True)
+            return True
+
+    def get_collection_dtype(self):
+        if self.dtype == FlatVectorDTypeEnums.INT8.value and self.distance_method != DistanceMethodEnums.COSINE.value:
+            # int8 rows are scaled unit vectors, raw dot products have no fixed range to scale to
+            self.logger.warning("int8 vectors need the cosine distance, using float16")
+            return FlatVectorDTypeEnums.FLOAT16.value
+
+        if self.dtype not in [e.value for e in FlatVectorDTypeEnums]:
+            self.logger.warning(f"Unsupported vectors dtype {self.dtype}, using float32")
+            return FlatVectorDTypeEnums.FLOAT32.value
+
+        return self.dtype
+
+    def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False):
+        if do_reset:
+            _ = self.delete_collection(collection_name=collection_name)
+
+        state = self.load_collection(collection_name)
+        if state is not None:
+            if state["meta"]["vector_size"] != embedding_size:
+                self.logger.warning(f"Collection {collection_name} has vectors of size {state['meta']['vector_size']}, "
+                                    f"not {embedding_size}, reset it after changing the embedding model")
+            return False
+
+        os.makedirs(self.get_collection_path(collection_name), exist_ok=True)
+        with self.write_lock(collection_name):
+            if self.is_collection_existed(collection_name):
+                return False
+
+            meta = {
+                "vector_size": embedding_size,
+                "distance": self.distance_method,
+                "dtype": self.get_collection_dtype(),
+                "count": 0,
+                "capacity": self.initial_capacity,
+                "generation": 0,
+                "vectors_file": "vectors.0.npy",
+                "records_file": "records.0.jsonl",
+                "records_size": 0,
+            }
+
+            vectors = np.lib.format.open_memmap(
+                self.get_collection_path(collection_name, meta["vectors_file"]),
+                mode="w+",
+                dtype=meta["dtype"],
+                shape=(meta["capacity"], embedding_size),
+            )
+            vectors.flush()
+            del vectors
+            open(self.get_collection_path(collection_name, meta["records_file"]), "wb").close()
+
+            self.write_meta(collection_name, meta)
+
+        return True
+
+    def prepare_vectors(self, vectors, meta: dict):
+        """float32 queries / rows in the collection space: unit length for cosine, scaled for int8"""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+
+        if matrix.shape[1] != meta["vector_size"]:
+            raise ValueError(f"expected vectors of size {meta['vector_size']}, got {matrix.shape[1]}")
+
+        if meta["distance"] == DistanceMethodEnums.COSINE.value:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.maximum(norms, 1e-12)
+
+        return matrix
+
+    def to_storage_dtype(self, matrix: np.ndarray, meta: dict):
+        if meta["dtype"] == FlatVectorDTypeEnums.INT8.value:
+            return np.clip(np.rint(matrix * self.INT8_SCALE), -self.INT8_SCALE, self.INT8_SCALE).astype(np.int8)
+        return matrix.astype(meta["dtype"])
+
+    def rewrite_vectors(self, collection_name: str, meta: dict, vectors, rows, capacity: int):
+        """copy the given rows to a new, bigger or compacted, vectors file and point meta at it"""
+        meta["generation"] += 1
+        meta["vectors_file"] = f"vectors.{meta['generation']}.npy"
+        meta["capacity"] = capacity
+
+        new_vectors = np.lib.format.open_memmap(
+            self.get_collection_path(collection_name, meta["vectors_file"]),
+            mode="w+",
+            dtype=vectors.dtype,
+            shape=(capacity, vectors.shape[1]),
+        )
+        for start in range(0, len(rows), self.SEARCH_BLOCK_SIZE):
+            block_rows = rows[start: start + self.SEARCH_BLOCK_SIZE]
+            new_vectors[start: start + len(block_rows)] = vectors[block_rows]
+        new_vectors.flush()
+
+        return new_vectors
+
+    def remove_stale_files(self, collection_name: str, meta: dict):
+        for file_name in os.listdir(self.get_collection_path(collection_name)):
+            if file_name.startswith(("vectors.", "records.")) and file_name not in (meta["vectors_file"], meta["records_file"]):
+                os.remove(self.get_collection_path(collection_name, file_name))
+
+    def insert_one(self, collection_name: str, text: str, vector: list,
+                        metadata: dict = None,
+                        record_id: str = None):
+        return self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id] if record_id is not None else None,
+        )
+
+    def insert_many(self, collection_name: str, texts: list,
+                                    vectors: list, metadata: list = None,
+                                    record_ids: list = None, batch_size: int = 50):
+        """one write per call, batch_size is only there for the interface.
+        Existing record ids are overwritten in place like a qdrant upsert"""
+
+        if not self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not insert new record to non-existed collection: {collection_name}")
+            return False
+
+        if texts is None:
+            texts = [None] * len(vectors)
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        try:
+            with self.write_lock(collection_name):
+                # another process may have written since the last load
+                state = self.load_collection(collection_name)
+                meta = dict(state["meta"])
+                matrix = self.to_storage_dtype(self.prepare_vectors(vectors, meta), meta)
+
+                rows = []
+                new_rows = {}
+                count = meta["count"]
+                for record_id in record_ids:
+                    row = state["id_rows"].get(record_id, new_rows.get(record_id))
+                    if row is None:
+                        row = new_rows[record_id] = count
+                        count += 1
+                    rows.append(row)
+
+                if count > meta["capacity"]:
+                    collection_vectors = self.rewrite_vectors(
+                        collection_name, meta, state["vectors"],
+                        rows=np.arange(meta["count"]),
+                        capacity=max(count, meta["capacity"] * 2),
+                    )
+                else:
+                    collection_vectors = np.load(
+                        self.get_collection_path(collection_name, meta["vectors_file"]),
+                        mmap_mode="r+",
+                    )
+
+                collection_vectors[rows] = matrix
+                collection_vectors.flush()
+                del collection_vectors
+
+                records = b"".join(
+                    json.dumps({
+                        "row": row,
+                        "id": record_id,
+                        "payload": self.get_payload(text=text, metadata=record_metadata),
+                    }, ensure_ascii=False).encode("utf-8") + b"\n"
+                    for row, record_id, text, record_metadata in zip(rows, record_ids, texts, metadata)
+                )
+                with open(self.get_collection_path(collection_name, meta["records_file"]), "r+b") as f:
+                    # drop whatever an interrupted write left after the published records
+                    f.seek(meta["records_size"])
+                    f.write(records)
+                    f.truncate()
+
+                meta["records_size"] += len(records)
+                meta["count"] = count
+                self.write_meta(collection_name, meta)
+                self.remove_stale_files(collection_name, meta)
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    def get_payload(self, text: str, metadata: dict):
+        if text is None:
+            return {"metadata": metadata}
+        return {"text": text, "metadata": metadata}
+
+    def list_record_ids(self, collection_name: str, batch_size: int = 1000):
+        state = self.load_collection(collection_name)
+        if state is None:
+            return
+
+        ids = state["ids"][:state["meta"]["count"]]
+        for i in range(0, len(ids), batch_size):
+            yield ids[i: i + batch_size]
+
+    def delete_many(self, collection_name: str, record_ids: list):
+        """rows are removed by compacting the collection into new files, deletes are rare (sync)"""
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return False
+
+        try:
+            with self.write_lock(collection_name):
+                state = self.load_collection(collection_name)
+                meta = dict(state["meta"])
+
+                deleted_rows = {
+                    state["id_rows"][record_id]
+                    for record_id in record_ids
+                    if record_id in state["id_rows"]
+                }
+                if not deleted_rows:
+                    return True
+
+                kept_rows = np.array([
+                    row for row in range(meta["count"])
+                    if row not in deleted_rows
+                ], dtype=np.int64)
+
+                new_vectors = self.rewrite_vectors(
+                    collection_name, meta, state["vectors"],
+                    rows=kept_rows,
+                    capacity=max(len(kept_rows), self.initial_capacity),
+                )
+                del new_vectors
+
+                meta["records_file"] = f"records.{meta['generation']}.jsonl"
+                records = b"".join(
+                    json.dumps({
+                        "row": new_row,
+                        "id": state["ids"][row],
+                        "payload": state["payloads"][row],
+                    }, ensure_ascii=False).encode("utf-8") + b"\n"
+                    for new_row, row in enumerate(kept_rows.tolist())
+                )
+                with open(self.get_collection_path(collection_name, meta["records_file"]), "wb") as f:
+                    f.write(records)
+
+                meta["records_size"] = len(records)
+                meta["count"] = len(kept_rows)
+                self.write_meta(collection_name, meta)
+                self.remove_stale_files(collection_name, meta)
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            return False
+
+        return True
+
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
+        """exact top-k of every query, one (queries x rows) matmul per block of rows"""
+        state = self.load_collection(collection_name)
+        if state is None or not state["meta"]["count"]:
+            return [[] for _ in vectors]
+
+        meta = state["meta"]
+        count = meta["count"]
+        queries = self.prepare_vectors(vectors, meta)
+        limit = min(limit, count)
+        score_scale = 1 / self.INT8_SCALE if meta["dtype"] == FlatVectorDTypeEnums.INT8.value else 1
+
+        best_scores, best_rows = [], []
+        for start in range(0, count, self.SEARCH_BLOCK_SIZE):
+            block = state["vectors"][start: min(start + self.SEARCH_BLOCK_SIZE, count)]
+            if block.dtype != np.float32:
+                block = block.astype(np.float32)
+
+            scores = queries @ block.T
+            if scores.shape[1] > limit:
+                rows = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+                scores = np.take_along_axis(scores, rows, axis=1)
+            else:
+                rows = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+
+            best_scores.append(scores)
+            best_rows.append(rows + start)
+
+        best_scores = np.concatenate(best_scores, axis=1)
+        best_rows = np.concatenate(best_rows, axis=1)
+        order = np.argsort(-best_scores, axis=1)[:, :limit]
+        best_scores = np.take_along_axis(best_scores, order, axis=1) * score_scale
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+
+        return [
+            [
+                RetrievedDocument(**{
+                    "score": float(score),
+                    "text": state["payloads"][row].get("text"),
+                    "id": str(state["ids"][row]),
+                })
+                for score, row in zip(query_scores.tolist(), query_rows.tolist())
+            ]
+            for query_scores, query_rows in zip(best_scores, best_rows)
+        ]
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
+        # the search is exact, oversampling / rescore have nothing to do here
+        results = self.search_by_vectors(
+            collection_name=collection_name,
+            vectors=[vector],
+            limit=limit,
+        )
+
+        if not results or len(results[0]) == 0:
+            return None
+
+        return results[0]
@@ -1,60 +1,208 @@
-from qdrant_client import models, QdrantClient
+from qdrant_client import models, QdrantClient, AsyncQdrantClient
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums
+from ..VectorDBEnums import DistanceMethodEnums, QuantizationEnums
+import asyncio
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocument
+from helper.ttl_cache import TTLCache
 
 class QdrantDBProvider(VectorDBInterface):
 
-    def __init__(self, db_path: str, distance_method: str):
+    def __init__(self, db_path: str, distance_method: str, collection_info_ttl: float = 5,
+                        collection_config: dict = None, collection_overrides: dict = None,
+                        search_oversampling: float = None, search_rescore: bool = True,
+                        url: str = None, upload_parallelism: int = 4):
         
         self.client = None
+        # only with a qdrant server (url), the local mode has no real async client
+        self.async_client = None
         self.db_path = db_path
+        self.url = url
+        self.upload_parallelism = upload_parallelism
         self.distance_method = None
         
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
         elif distance_method == DistanceMethodEnums.DOT.value:
             self.distance_method = models.Distance.DOT
+
+        # quantization / on_disk / hnsw settings of the new collections
+        self.collection_config = collection_config or {}
+        self.collection_overrides = collection_overrides or {}
+        self.search_oversampling = search_oversampling
+        self.search_rescore = search_rescore
             
         self.logger = logging.getLogger(__name__)
 
+        # collection_name -> {"vector_size", "distance", "quantized"}, or None when the collection doesn't exist.
+        # the local storage is locked by one process, so only this provider creates / deletes
+        # collections and the registry stays exact. A qdrant server (url) is shared by all the
+        # API workers, there the entries expire like the collection info and create_collection
+        # always asks the server
+        self.collections = TTLCache(
+            max_size=4096,
+            ttl_seconds=collection_info_ttl if url else float("inf"),
+        )
+        # point counts change on every insert, the full info is only kept for a few seconds
+        self.collection_info_cache = TTLCache(max_size=256, ttl_seconds=collection_info_ttl)
+
     def connect(self):
-        self.client = QdrantClient(path=self.db_path)
+        if self.url:
+            self.client = QdrantClient(url=self.url)
+            self.async_client = AsyncQdrantClient(url=self.url)
+        else:
+            # the async methods call the local client from their executor thread
+            self.client = QdrantClient(path=self.db_path, force_disable_check_same_thread=True)
+        self.clear_collections_registry()
 
     def disconnect(self):
         self.client = None # or raise NotImplementedError
+        self.async_client = None
+        self.clear_collections_registry()
+
+    def clear_collections_registry(self):
+        self.collections.clear()
+        self.collection_info_cache.clear()
+
+    def invalidate_collection(self, collection_name: str):
+        self.collections.invalidate(collection_name)
+        self.collection_info_cache.invalidate(collection_name)
+
+    def get_collection_entry(self, collection_name: str):
+        """the registry entry of the collection, asking qdrant only when it isn't known (or expired)"""
+        entry = self.collections.get(collection_name, default=False)
+        if entry is not False:
+            return entry
+
+        collection_info = None
+        if self.client.collection_exists(collection_name=collection_name):
+            collection_info = self.client.get_collection(collection_name=collection_name)
+
+        return self.register_collection(collection_name, collection_info)
+
+    async def aget_collection_entry(self, collection_name: str):
+        """get_collection_entry through the async client, the lookups of the expired
+        entries don't block the event loop"""
+        entry = self.collections.get(collection_name, default=False)
+        if entry is not False:
+            return entry
+
+        collection_info = None
+        if await self.async_client.collection_exists(collection_name=collection_name):
+            collection_info = await self.async_client.get_collection(collection_name=collection_name)
+
+        return self.register_collection(collection_name, collection_info)
+
+    def register_collection(self, collection_name: str, collection_info):
+        entry = None
+        if collection_info is not None:
+            self.collection_info_cache.set(collection_name, collection_info)
+            vectors_config = collection_info.config.params.vectors
+            entry = {
+                "vector_size": vectors_config.size,
+                "distance": vectors_config.distance,
+                "quantized": collection_info.config.quantization_config is not None,
+            }
+
+        self.collections.set(collection_name, entry)
+        return entry
 
     def is_collection_existed(self, collection_name:str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
+        return self.get_collection_entry(collection_name) is not None
 
     def list_all_collection(self) -> List:
         return self.client.get_collection()
 
     def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name=collection_name)
+        collection_info = self.collection_info_cache.get(collection_name)
+        if collection_info is None:
+            collection_info = self.client.get_collection(collection_name=collection_name)
+            self.collection_info_cache.set(collection_name, collection_info)
+        return collection_info
 
     def delete_collection(self, collection_name: str) -> List:
         if self.is_collection_existed(collection_name):
-            return self.client.delete_collection(collection_name=collection_name)
+            result = self.client.delete_collection(collection_name=collection_name)
+            self.invalidate_collection(collection_name)
+            self.collections.set(collection_name, None)
+            return result
+
+    def get_collection_config(self, collection_name: str) -> dict:
+        return {
+            **self.collection_config,
+            **self.collection_overrides.get(collection_name, {}),
+        }
+
+    def get_quantization_config(self, quantization: str):
+        if quantization == QuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                )
+            )
+
+        if quantization == QuantizationEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+
+        return None
 
     def create_collection(self, collection_name: str,
                                 embedding_size: int,
                                 do_reset: bool = False):
+        if self.url:
+            # another worker may have created or deleted it since it was registered here
+            self.invalidate_collection(collection_name)
+
         if do_reset:
             _ = self.delete_collection(collection_name=collection_name)
 
-        if not self.is_collection_existed(collection_name):
-            _ = self.client.create_collection(
-                collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                            size=embedding_size, 
-                            distance=self.distance_method
+        entry = self.get_collection_entry(collection_name)
+        if entry is None:
+            collection_config = self.get_collection_config(collection_name)
+            quantization_config = self.get_quantization_config(collection_config.get("quantization"))
+
+            hnsw_config = None
+            if collection_config.get("hnsw_m") or collection_config.get("hnsw_ef_construct"):
+                hnsw_config = models.HnswConfigDiff(
+                    m=collection_config.get("hnsw_m"),
+                    ef_construct=collection_config.get("hnsw_ef_construct"),
+                )
+
+            try:
+                _ = self.client.create_collection(
+                    collection_name=collection_name,
+                    vectors_config=models.VectorParams(
+                                size=embedding_size, 
+                                distance=self.distance_method,
+                                on_disk=bool(collection_config.get("on_disk")),
+                                    ),
+                    quantization_config=quantization_config,
+                    hnsw_config=hnsw_config,
                                 )
-                            )
+            except Exception:
+                # lost the race with another worker creating the same collection
+                self.invalidate_collection(collection_name)
+                if not self.url or self.get_collection_entry(collection_name) is None:
+                    raise
+                return False
+
+            self.invalidate_collection(collection_name)
+            self.collections.set(collection_name, {
+                "vector_size": embedding_size,
+                "distance": self.distance_method,
+                "quantized": quantization_config is not None,
+            })
             
             return True
+
+        if entry["vector_size"] != embedding_size:
+            self.logger.warning(f"Collection {collection_name} has vectors of size {entry['vector_size']}, "
+                                f"not {embedding_size}, reset it after changing the embedding model")
         
         return False
 
@@ -88,6 +236,9 @@ class QdrantDBProvider(VectorDBInterface):
                                     vectors: list, metadata: list = None,
                                     record_ids: list = None, batch_size: int = 50):
 
+        if texts is None:
+            texts = [None] * len(vectors)
+
         if metadata is None:
             metadata = [None] * len(texts)
         
@@ -107,9 +258,7 @@ class QdrantDBProvider(VectorDBInterface):
                 models.Record(
                     id=batch_records_ids[x],
                     vector=batch_vectors[x],
-                    payload={
-                        "text": batch_texts[x],"metadata": batch_metadata[x],
-                    }
+                    payload=self.get_payload(text=batch_texts[x], metadata=batch_metadata[x]),
                 )
                 for x in range(len(batch_texts))
             ]
@@ -124,12 +273,200 @@ class QdrantDBProvider(VectorDBInterface):
                 return False
         return True
     
-    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+    async def ainsert_many(self, collection_name: str, texts: list,
+                                    vectors: list, metadata: list = None,
+                                    record_ids: list = None, batch_size: int = 50):
+        """the batches are uploaded upload_parallelism at a time"""
+        if self.async_client is None:
+            return await super().ainsert_many(collection_name=collection_name, texts=texts, vectors=vectors,
+                                              metadata=metadata, record_ids=record_ids, batch_size=batch_size)
+
+        if texts is None:
+            texts = [None] * len(vectors)
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        semaphore = asyncio.Semaphore(self.upload_parallelism)
+
+        async def upload_batch(i: int):
+            batch_end = i + batch_size
+            points = [
+                models.PointStruct(
+                    id=record_id,
+                    vector=vector,
+                    payload=self.get_payload(text=text, metadata=record_metadata),
+                )
+                for record_id, vector, text, record_metadata in zip(
+                    record_ids[i:batch_end], vectors[i:batch_end], texts[i:batch_end], metadata[i:batch_end]
+                )
+            ]
+            async with semaphore:
+                await self.async_client.upsert(collection_name=collection_name, points=points, wait=True)
+
+        try:
+            await asyncio.gather(*[
+                upload_batch(i)
+                for i in range(0, len(texts), batch_size)
+            ])
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+        return True
+
+    def get_payload(self, text: str, metadata: dict):
+        # slim records have no text key at all, local mode keeps every payload in RAM
+        if text is None:
+            return {"metadata": metadata}
+        return {"text": text, "metadata": metadata}
+
+    def list_record_ids(self, collection_name: str, batch_size: int = 1000):
+        if not self.is_collection_existed(collection_name):
+            return
+
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            if points:
+                yield [point.id for point in points]
+            if offset is None:
+                break
+
+    def delete_many(self, collection_name: str, record_ids: list):
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return False
+        try:
+            _ = self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=record_ids),
+            )
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            return False
+        return True
+    
+    def get_search_params(self, entry: dict, oversampling: float = None, rescore: bool = None):
+        """quantized collections are searched on the compressed vectors, then the
+        limit * oversampling best candidates are rescored with the original ones"""
+        if not entry or not entry.get("quantized"):
+            return None
+
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                ignore=False,
+                rescore=self.search_rescore if rescore is None else rescore,
+                oversampling=oversampling or self.search_oversampling,
+            )
+        )
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
 
         results = self.client.search(
             collection_name=collection_name,
             query_vector=vector,
-            limit=limit
+            limit=limit,
+            search_params=self.get_search_params(
+                entry=self.get_collection_entry(collection_name),
+                oversampling=oversampling,
+                rescore=rescore,
+            ),
+        )
+
+        if not results or len(results) == 0:
+            return None
+        
+        return [
+            RetrievedDocument(**{
+                "score": result.score,
+                "text": result.payload.get("text"),
+                "id": str(result.id),
+            })
+            for result in results
+        ]
+
+    def get_search_requests(self, entry: dict, vectors: list, limit: int,
+                                oversampling: float = None, rescore: bool = None):
+        search_params = self.get_search_params(
+            entry=entry,
+            oversampling=oversampling,
+            rescore=rescore,
+        )
+        return [
+            models.SearchRequest(
+                vector=list(vector),
+                limit=limit,
+                params=search_params,
+                with_payload=True,
+            )
+            for vector in vectors
+        ]
+
+    def to_retrieved_documents(self, results: list):
+        return [
+            RetrievedDocument(**{
+                "score": result.score,
+                "text": result.payload.get("text"),
+                "id": str(result.id),
+            })
+            for result in results
+        ]
+
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
+
+        batch_results = self.client.search_batch(
+            collection_name=collection_name,
+            requests=self.get_search_requests(self.get_collection_entry(collection_name), vectors, limit,
+                                              oversampling=oversampling, rescore=rescore),
+        )
+
+        return [
+            self.to_retrieved_documents(results)
+            for results in batch_results
+        ]
+
+    async def asearch_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
+        if self.async_client is None:
+            return await super().asearch_by_vectors(collection_name=collection_name, vectors=vectors, limit=limit,
+                                                    oversampling=oversampling, rescore=rescore)
+
+        batch_results = await self.async_client.search_batch(
+            collection_name=collection_name,
+            requests=self.get_search_requests(await self.aget_collection_entry(collection_name), vectors, limit,
+                                              oversampling=oversampling, rescore=rescore),
+        )
+
+        return [
+            self.to_retrieved_documents(results)
+            for results in batch_results
+        ]
+
+    async def asearch_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
+        if self.async_client is None:
+            return await super().asearch_by_vector(collection_name=collection_name, vector=vector, limit=limit,
+                                                   oversampling=oversampling, rescore=rescore)
+
+        results = await self.async_client.search(
+            collection_name=collection_name,
+            query_vector=vector,
+            limit=limit,
+            search_params=self.get_search_params(
+                entry=await self.aget_collection_entry(collection_name),
+                oversampling=oversampling,
+                rescore=rescore,
+            ),
         )
 
         if not results or len(results) == 0:
@@ -138,7 +475,8 @@ class QdrantDBProvider(VectorDBInterface):
         return [
             RetrievedDocument(**{
                 "score": result.score,
-                "text": result.payload["text"],
+                "text": result.payload.get("text"),
+                "id": str(result.id),
             })
             for result in results
         ]
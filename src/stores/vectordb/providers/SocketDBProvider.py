@@ -0,0 +1,190 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import VectorDBOpEnums
+from ..VectorDBProtocol import encode_message, read_message
+import socket
+import logging
+import threading
+from typing import List
+from models.db_schemes import RetrievedDocument
+
+class SocketDBProvider(VectorDBInterface):
+    """
+    Client of the vector db owner process (stores.vectordb.VectorDBServer), so any number
+    of API workers can share a vector db that only one process may open.
+    Failures are logged and returned as the same False / None as the other providers.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 60):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.sock = None
+        # one request at a time on the connection, the answers come back in order
+        self.lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        try:
+            with self.lock:
+                self.open_socket()
+        except OSError as e:
+            # the owner may start after the workers, every request tries again
+            self.logger.warning(f"Vector db server not reachable on {self.socket_path} yet: {e}")
+
+    def disconnect(self):
+        with self.lock:
+            self.close_socket()
+
+    def open_socket(self):
+        if self.sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self.sock = sock
+
+    def close_socket(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            finally:
+                self.sock = None
+
+    def request(self, opcode: VectorDBOpEnums, fields: dict = None, vectors=None):
+        """the result fields of the request, None when it failed"""
+        message = encode_message(opcode.value, fields, vectors)
+
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    self.open_socket()
+                    self.sock.sendall(message)
+                except (ConnectionRefusedError, FileNotFoundError, BrokenPipeError, ConnectionResetError) as e:
+                    # the server restarted and never got the request, retry once on a new connection
+                    self.close_socket()
+                    if attempt:
+                        self.logger.error(f"Vector db server request {opcode.name} failed: {e}")
+                        return None
+                    continue
+                except OSError as e:
+                    self.close_socket()
+                    self.logger.error(f"Vector db server request {opcode.name} failed: {e}")
+                    return None
+
+                try:
+                    status, result, _ = read_message(self.sock)
+                except OSError as e:
+                    # the server may have run it (a timeout on a slow upsert or reset), so it's never
+                    # sent twice. A late reply must not be read as the answer to the next request,
+                    # the connection is dropped
+                    self.close_socket()
+                    self.logger.error(f"Vector db server request {opcode.name} got no reply: {e}")
+                    return None
+                break
+
+        if status != VectorDBOpEnums.OK.value:
+            self.logger.error(f"Vector db server error on {opcode.name}: {result.get('error')}")
+            return None
+
+        return result
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        result = self.request(VectorDBOpEnums.IS_COLLECTION_EXISTED, {"collection_name": collection_name})
+        return bool(result and result["result"])
+
+    def list_all_collection(self) -> List:
+        result = self.request(VectorDBOpEnums.LIST_ALL_COLLECTION)
+        return result["result"] if result else []
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        result = self.request(VectorDBOpEnums.GET_COLLECTION_INFO, {"collection_name": collection_name})
+        return result["result"] if result else None
+
+    def delete_collection(self, collection_name: str) -> List:
+        result = self.request(VectorDBOpEnums.DELETE_COLLECTION, {"collection_name": collection_name})
+        return result["result"] if result else None
+
+    def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False):
+        result = self.request(VectorDBOpEnums.CREATE_COLLECTION, {
+            "collection_name": collection_name,
+            "embedding_size": embedding_size,
+            "do_reset": bool(do_reset),
+        })
+        return bool(result and result["result"])
+
+    def insert_one(self, collection_name: str, text: str, vector: list,
+                        metadata: dict = None,
+                        record_id: str = None):
+        return self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id] if record_id is not None else None,
+        )
+
+    def insert_many(self, collection_name: str, texts: list,
+                                    vectors: list, metadata: list = None,
+                                    record_ids: list = None, batch_size: int = 50):
+        result = self.request(VectorDBOpEnums.INSERT_MANY, {
+            "collection_name": collection_name,
+            "texts": texts,
+            "metadata": metadata,
+            "record_ids": record_ids,
+            "batch_size": batch_size,
+        }, vectors=vectors)
+        return bool(result and result["result"])
+
+    def list_record_ids(self, collection_name: str, batch_size: int = 1000):
+        result = self.request(VectorDBOpEnums.LIST_RECORD_IDS, {"collection_name": collection_name})
+        if not result:
+            return
+
+        record_ids = result["result"]
+        for i in range(0, len(record_ids), batch_size):
+            yield record_ids[i: i + batch_size]
+
+    def delete_many(self, collection_name: str, record_ids: list):
+        if not record_ids:
+            return False
+
+        result = self.request(VectorDBOpEnums.DELETE_MANY, {
+            "collection_name": collection_name,
+            "record_ids": record_ids,
+        })
+        return bool(result and result["result"])
+
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
+        result = self.request(VectorDBOpEnums.SEARCH_BY_VECTORS, {
+            "collection_name": collection_name,
+            "limit": limit,
+            "oversampling": oversampling,
+            "rescore": rescore,
+        }, vectors=vectors)
+
+        if not result:
+            return [[] for _ in vectors]
+
+        return [
+            [RetrievedDocument(**document) for document in documents]
+            for documents in result["result"]
+        ]
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                                oversampling: float = None, rescore: bool = None):
+        result = self.request(VectorDBOpEnums.SEARCH_BY_VECTOR, {
+            "collection_name": collection_name,
+            "limit": limit,
+            "oversampling": oversampling,
+            "rescore": rescore,
+        }, vectors=[vector])
+
+        if not result or not result["result"]:
+            return None
+
+        return [
+            RetrievedDocument(**document)
+            for document in result["result"]
+        ]